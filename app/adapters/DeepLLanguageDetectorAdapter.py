@@ -1,6 +1,5 @@
 from app.interfaces.language_detector import LanguageDetectorInterface
-from deepl import Translator
-import os
+from app.infrastructure.provider_sessions import get_deepl_translator
 
 # Custom exception to handle unsupported languages
 class UnsupportedLanguageError(Exception):
@@ -16,9 +15,9 @@ class DeepLLanguageDetectorAdapter(LanguageDetectorInterface):
 
     def __init__(self):
         """
-        Initializes the DeepL Translator with the API key from environment variables.
+        Binds the shared, pooled DeepL translator.
         """
-        self.translator = Translator(auth_key=os.getenv("DEEPL_API_KEY"))
+        self.translator = get_deepl_translator()
 
     def detect(self, text: str) -> str:
         """
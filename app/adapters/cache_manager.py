@@ -1,14 +1,32 @@
+from app.infrastructure.cache.blob_store import BlobStore, get_blob_store
 from app.infrastructure.cache.json_cache import JsonCache
-from typing import Optional
+from app.infrastructure.metrics import CACHE_LOOKUPS
+from app.infrastructure.logger import get_logger
+from typing import Dict, Optional, Any
+
+logger = get_logger("cache_manager")
+
+# Namespaces whose values embed retrieved chunks and instruction blocks shared by
+# many questions; their large segments are stored once in the blob store
+BLOB_NAMESPACES = ("translated_contexts", "prompts")
 
 class CacheManager:
-    def __init__(self, cache: JsonCache):
+    def __init__(self, cache: JsonCache, generations: Optional[Dict[str, str]] = None, blobs: Optional[BlobStore] = None):
         """
         Initializes the CacheManager with a JsonCache instance
         and sets up a mapping for various cache file types.
+
+        Args:
+            cache (JsonCache): The underlying storage.
+            generations (Dict[str, str], optional): Generation stamp per namespace;
+                entries of other generations are ignored (see cache_generations).
+            blobs (BlobStore, optional): Storage of shared bodies, the 'blobs'
+                subdirectory of the cache by default.
         """
         try:
             self.cache = cache
+            self.generations = generations or {}
+            self.blobs = blobs or get_blob_store(cache.cache_dir)
             self.files = {
                 "translated_questions": "translated_questions.json",
                 "translated_contexts": "translated_contexts.json",
@@ -16,64 +34,78 @@ class CacheManager:
                 "responses": "responses.json"
             }
         except Exception as e:
-            print(f"[ERROR] CacheManager.__init__: {e}")
+            logger.error("CacheManager.__init__: %s", e)
+
+    def _lookup(self, namespace: str, question_id: str) -> Optional[Any]:
+        """Reads a cache entry and records the hit or miss for its namespace."""
+        value = self.cache.get(self.files[namespace], question_id, generation=self.generations.get(namespace))
+        if namespace in BLOB_NAMESPACES:
+            value = self.blobs.decode(value)
+        CACHE_LOOKUPS.inc(namespace=namespace, result="hit" if value else "miss")
+        return value
+
+    def _store(self, namespace: str, question_id: str, value: Any) -> None:
+        """Writes a cache entry stamped with the generation of its namespace."""
+        if namespace in BLOB_NAMESPACES:
+            value = self.blobs.encode(value)
+        self.cache.set(self.files[namespace], question_id, value, generation=self.generations.get(namespace))
 
     def get_translated_question(self, question_id: str) -> Optional[str]:
         """Retrieves a translated question from the cache."""
         try:
-            return self.cache.get(self.files["translated_questions"], question_id)
+            return self._lookup("translated_questions", question_id)
         except Exception as e:
-            print(f"[ERROR] CacheManager.get_translated_question: {e}")
+            logger.error("CacheManager.get_translated_question: %s", e)
             return None
 
     def store_translated_question(self, question_id: str, translated: str) -> None:
         """Stores a translated question in the cache."""
         try:
-            self.cache.set(self.files["translated_questions"], question_id, translated)
+            self._store("translated_questions", question_id, translated)
         except Exception as e:
-            print(f"[ERROR] CacheManager.store_translated_question: {e}")
+            logger.error("CacheManager.store_translated_question: %s", e)
 
     def get_translated_context(self, question_id: str) -> Optional[str]:
         """Retrieves a translated context from the cache."""
         try:
-            return self.cache.get(self.files["translated_contexts"], question_id)
+            return self._lookup("translated_contexts", question_id)
         except Exception as e:
-            print(f"[ERROR] CacheManager.get_translated_context: {e}")
+            logger.error("CacheManager.get_translated_context: %s", e)
             return None
 
     def store_translated_context(self, question_id: str, translated: str) -> None:
         """Stores a translated context in the cache."""
         try:
-            self.cache.set(self.files["translated_contexts"], question_id, translated)
+            self._store("translated_contexts", question_id, translated)
         except Exception as e:
-            print(f"[ERROR] CacheManager.store_translated_context: {e}")
+            logger.error("CacheManager.store_translated_context: %s", e)
 
     def get_prompt(self, question_id: str) -> Optional[str]:
         """Retrieves a prompt from the cache."""
         try:
-            return self.cache.get(self.files["prompts"], question_id)
+            return self._lookup("prompts", question_id)
         except Exception as e:
-            print(f"[ERROR] CacheManager.get_prompt: {e}")
+            logger.error("CacheManager.get_prompt: %s", e)
             return None
 
     def store_prompt(self, question_id: str, prompt: str) -> None:
         """Stores a prompt in the cache."""
         try:
-            self.cache.set(self.files["prompts"], question_id, prompt)
+            self._store("prompts", question_id, prompt)
         except Exception as e:
-            print(f"[ERROR] CacheManager.store_prompt: {e}")
+            logger.error("CacheManager.store_prompt: %s", e)
 
     def get_response(self, question_id: str) -> Optional[str]:
         """Retrieves a generated response from the cache."""
         try:
-            return self.cache.get(self.files["responses"], question_id)
+            return self._lookup("responses", question_id)
         except Exception as e:
-            print(f"[ERROR] CacheManager.get_response: {e}")
+            logger.error("CacheManager.get_response: %s", e)
             return None
 
     def store_response(self, question_id: str, response: str) -> None:
         """Stores a generated response in the cache."""
         try:
-            self.cache.set(self.files["responses"], question_id, response)
+            self._store("responses", question_id, response)
         except Exception as e:
-            print(f"[ERROR] CacheManager.store_response: {e}")
+            logger.error("CacheManager.store_response: %s", e)
@@ -1,5 +1,11 @@
+from typing import Optional
 from app.interfaces.prompt_interface import PromptBuilder
-from app.adapters.langdetect_adapter import LangDetectAdapter
+from app.infrastructure.prompt_catalog import PromptCatalog, get_prompt_catalog
+from app.infrastructure.context_assembler import CHUNK_SEPARATOR, estimate_tokens, pack_chunks
+from app.infrastructure.logger import get_logger
+from app.infrastructure.settings import get_env
+
+logger = get_logger("prompt_builder")
 
 class DefaultPromptBuilder(PromptBuilder):
     """
@@ -7,16 +13,21 @@ class DefaultPromptBuilder(PromptBuilder):
 
     This class is responsible for building a multilingual prompt based on the context,
     the user's question, the target language, and optional extra instructions.
-    It uses a language detector to verify the context and instruction languages.
+    Instruction blocks come precompiled from the shared PromptCatalog.
+
+    The prompt is kept within a token budget (PROMPT_TOKEN_BUDGET, 800 by default,
+    0 for unlimited): the instructions and the question always go in whole, and
+    the context gets the remaining tokens, keeping its best ranked chunks first.
     """
-    
-    def __init__(self):
-        # Initialize the language detector adapter
-        self.detector = LangDetectAdapter()
+
+    def __init__(self, catalog: Optional[PromptCatalog] = None, budget: Optional[int] = None):
+        # Shared catalog, loaded once per process
+        self.catalog = catalog or get_prompt_catalog()
+        self.budget = int(get_env("PROMPT_TOKEN_BUDGET", "800")) if budget is None else budget
 
     async def build_prompt(self, context: str, question: str, language: str, extra_instructions: str = "") -> str:
         """
-        Builds a prompt using the provided context, question, and language, enriched with 
+        Builds a prompt using the provided context, question, and language, enriched with
         predefined instructions and optional extra instructions.
 
         Args:
@@ -28,53 +39,15 @@ class DefaultPromptBuilder(PromptBuilder):
         Returns:
             str: The fully constructed prompt.
         """
-        print('build_prompt.. language received', language)
-
-        # Detect language of the provided context
-        context_lang = await self.detector.detect(context)
-        print('build_prompt.. context language received', context_lang)
-
-        # Language-specific base instructions
-        instructions = {
-            "es": (
-                "Respondé en una sola oración, en tercera persona, con emojis y en español.\n"
-                "El idioma de la respuesta debe ser español.\n"
-                "Debe responder siempre exactamente lo mismo si la pregunta es la misma.\n"
-                "No agregues contenido aleatorio, ni emojis aleatorios.\n"
-                "Usá solo emojis relevantes al contenido.\n"
-            ),
-            "en": (
-                "Respond in one sentence, third person, with emojis, in English.\n"
-                "The response must be in English.\n"
-                "It must always be exactly the same for the same question.\n"
-                "Do not include randomness or random emojis.\n"
-                "Only use emojis relevant to the content.\n"
-            ),
-            "pt": (
-                "Responda em uma única frase, na terceira pessoa, com emojis e em português.\n"
-                "A resposta deve estar em português.\n"
-                "Deve responder sempre exatamente o mesmo para a mesma pergunta.\n"
-                "Não inclua elementos aleatórios ou emojis aleatórios.\n"
-                "Use apenas emojis relevantes ao conteúdo.\n"
-            )
-        }
-
-        # Fallback to English if language is not recognized
-        instruction = instructions.get(language, instructions["en"])
-
-        # Detect language of the instruction block
-        instruction_lang = await self.detector.detect(instruction)
-        print(f"build_prompt.. instruction language received {instruction_lang}")
-
-        # Append any extra instructions provided by the user
-        if extra_instructions:
-            instruction = f"{instruction}\n{extra_instructions.strip()}"
-
-        # Final prompt composition
-        return f"""
-{instruction}
-
-Contexto: {context}
-
-Pregunta: {question}
-"""
\ No newline at end of file
+        logger.debug("build_prompt.. language received %s", language)
+
+        if self.budget > 0:
+            # Tokens left for the context once everything else is in the prompt
+            fixed = estimate_tokens(self.catalog.render(language, context="", question=question, extra_instructions=extra_instructions))
+            packed = CHUNK_SEPARATOR.join(pack_chunks(context.split(CHUNK_SEPARATOR), max(self.budget - fixed, 1)))
+            if packed != context:
+                logger.debug("✂️ Context trimmed to the prompt budget", extra={"budget": self.budget, "fixed_tokens": fixed})
+            context = packed
+
+        # Falls back to English if language is not recognized
+        return self.catalog.render(language, context=context, question=question, extra_instructions=extra_instructions)
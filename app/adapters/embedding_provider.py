@@ -1,10 +1,10 @@
-import cohere
-import os
-from dotenv import load_dotenv
 from app.interfaces.embedding_interface import EmbeddingProvider
+from app.infrastructure.metrics import PROVIDER_CALLS, PROVIDER_ERRORS
+from app.infrastructure.provider_sessions import get_cohere_client
+from app.infrastructure.rate_limiter import get_limiter
+from app.infrastructure.settings import get_env
 
-# Load environment variables from .env file
-load_dotenv()
+EMBED_MODEL = "embed-multilingual-v3.0"
 
 class CohereEmbedder(EmbeddingProvider):
     """
@@ -15,16 +15,16 @@ class CohereEmbedder(EmbeddingProvider):
 
     def __init__(self):
         """
-        Initializes the Cohere client using the COHERE_API_KEY from environment variables.
+        Binds the shared, pooled Cohere client after checking COHERE_API_KEY is configured.
 
         Raises:
             ValueError: If the API key is not found in the environment.
         """
-        api_key = os.getenv("COHERE_API_KEY")
+        api_key = get_env("COHERE_API_KEY")
         if not api_key:
             raise ValueError("❌ Cohere API key (COHERE_API_KEY) not found in environment variables")
         
-        self.client = cohere.Client(api_key)
+        self.client = get_cohere_client()
 
     def get_embeddings(self, texts: list[str]) -> list[list[float]]:
         """
@@ -39,14 +39,18 @@ class CohereEmbedder(EmbeddingProvider):
         Raises:
             RuntimeError: If the embedding request to Cohere fails.
         """
+        PROVIDER_CALLS.inc(provider="cohere", operation="embed")
         try:
-            response = self.client.embed(
+            response = get_limiter("cohere").call(
+                "embed",
+                self.client.embed,
                 texts=texts,
-                model="embed-multilingual-v3.0",
+                model=EMBED_MODEL,
                 input_type="search_document"
             )
             return response.embeddings
         
         except Exception as e:
+            PROVIDER_ERRORS.inc(provider="cohere", operation="embed")
             # Raise a RuntimeError to indicate the failure, with original exception details
             raise RuntimeError(f"❌ Failed to generate embeddings with Cohere: {e}")
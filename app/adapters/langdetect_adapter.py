@@ -1,7 +1,8 @@
 from app.interfaces.language_detector import LanguageDetectorInterface
-from deepl import Translator as DeepLTranslator
-import asyncio
-import os
+from app.infrastructure.metrics import DEEPL_BILLED_CHARACTERS, PROVIDER_CALLS, PROVIDER_ERRORS
+from app.infrastructure.provider_sessions import get_deepl_translator
+from app.infrastructure.rate_limiter import get_limiter, run_provider_call
+from app.infrastructure.settings import get_env
 
 # Custom exception for unsupported or undetectable languages
 class UnsupportedLanguageError(Exception):
@@ -17,16 +18,16 @@ class LangDetectAdapter(LanguageDetectorInterface):
 
     def __init__(self):
         """
-        Initializes the DeepL translator with the API key from environment variables.
+        Binds the shared, pooled DeepL translator after checking DEEPL_API_KEY is configured.
 
         Raises:
             ValueError: If the DEEPL_API_KEY is not found in the environment.
         """
-        api_key = os.getenv("DEEPL_API_KEY")
+        api_key = get_env("DEEPL_API_KEY")
         if not api_key:
             raise ValueError("❌ Environment variable DEEPL_API_KEY not found.")
         
-        self.translator = DeepLTranslator(api_key)
+        self.translator = get_deepl_translator()
 
     async def detect(self, text: str) -> str:
         """
@@ -41,17 +42,18 @@ class LangDetectAdapter(LanguageDetectorInterface):
         Raises:
             UnsupportedLanguageError: If the detected language is not supported.
         """
-        loop = asyncio.get_event_loop()
-
         def detect_language():
             # Use DeepL's translate_text to detect source language
-            result = self.translator.translate_text(text, target_lang="ES")
+            result = get_limiter("deepl").call("detect", self.translator.translate_text, text, target_lang="ES")
+            DEEPL_BILLED_CHARACTERS.inc(result.billed_characters or 0, operation="detect")
             return result.detected_source_lang.lower()
 
+        PROVIDER_CALLS.inc(provider="deepl", operation="detect")
         try:
-            # Run the detection function in a separate thread (non-blocking)
-            lang = await loop.run_in_executor(None, detect_language)
+            # Run the detection in a DeepL worker thread, charged to the current request
+            lang = await run_provider_call("deepl", detect_language)
         except Exception as e:
+            PROVIDER_ERRORS.inc(provider="deepl", operation="detect")
             raise UnsupportedLanguageError(f"❌ Language detection failed: {e}")
 
         # Normalize and map detected language to supported codes
@@ -1,10 +1,17 @@
-import os
-import cohere
-from dotenv import load_dotenv
+import functools
+import threading
+from typing import Callable, Optional
 from app.adapters.langdetect_adapter import LangDetectAdapter
+from app.infrastructure.metrics import PROVIDER_CALLS, PROVIDER_ERRORS
+from app.infrastructure.logger import get_logger
+from app.infrastructure.provider_sessions import get_cohere_client
+from app.infrastructure.rate_limiter import get_limiter, run_provider_call
+from app.infrastructure.hedging import AttemptCancelled, cancellable, get_hedging_policy, hedged_call
+from app.infrastructure.settings import get_env
 
-# Load environment variables from .env file (override existing ones if needed)
-load_dotenv(override=True)
+logger = get_logger("llm_client")
+
+CHAT_MODEL = "command-r-plus"
 
 class CohereChatClient:
     """
@@ -12,26 +19,36 @@ class CohereChatClient:
     automatic language detection for both input prompts and model responses.
     """
 
+    # The tokenize health check runs once per process, not on every instantiation
+    _connection_checked = False
+
     def __init__(self) -> None:
         """
-        Initializes the Cohere client and the language detector.
+        Binds the shared Cohere client and the language detector, checking the API
+        connection the first time a client is created in the process.
 
         Raises:
             ValueError: If the COHERE_API_KEY is not set in environment variables.
             ConnectionError: If the API health check fails.
         """
-        api_key = os.getenv("COHERE_API_KEY")
+        api_key = get_env("COHERE_API_KEY")
         if not api_key:
             raise ValueError("❌ Environment variable COHERE_API_KEY not found.")
 
-        self.client = cohere.Client(api_key)
+        self.client = get_cohere_client()
         self.detector = LangDetectAdapter()
 
+        if CohereChatClient._connection_checked:
+            return
+
         # API connection check using a lightweight tokenize call
+        PROVIDER_CALLS.inc(provider="cohere", operation="tokenize")
         try:
-            self.client.tokenize(text="ping", model="embed-multilingual-v3.0")
+            get_limiter("cohere").call("tokenize", self.client.tokenize, text="ping", model="embed-multilingual-v3.0")
         except Exception as e:
+            PROVIDER_ERRORS.inc(provider="cohere", operation="tokenize")
             raise ConnectionError(f"❌ Failed to connect to Cohere API: {e}")
+        CohereChatClient._connection_checked = True
 
     async def generate(self, prompt: str) -> dict:
         """
@@ -49,17 +66,30 @@ class CohereChatClient:
         """
         # Detect the language of the prompt (input)
         prompt_lang = await self.detector.detect(prompt)
-        print("📥 detected language in CohereChat PROMPT:", prompt_lang)
+        logger.debug("📥 detected language in CohereChat PROMPT: %s", prompt_lang)
 
-        try:
-            # Call the Cohere text generation endpoint
-            response = self.client.generate(
-                model="command-r-plus",
+        def generate(cancel: threading.Event):
+            # Checked again after the limiter wait, which may outlast the other attempt
+            if cancel.is_set():
+                raise AttemptCancelled()
+            return self.client.generate(
+                model=CHAT_MODEL,
                 prompt=prompt,
                 max_tokens=80,
                 temperature=0.0
             )
+
+        def attempt(cancel: threading.Event):
+            # Call the Cohere text generation endpoint; a hedged duplicate is just discarded
+            if cancel.is_set():
+                raise AttemptCancelled()
+            PROVIDER_CALLS.inc(provider="cohere", operation="generate")
+            return get_limiter("cohere").call("generate", generate, cancel)
+
+        try:
+            response = await hedged_call(attempt, get_hedging_policy(), run=functools.partial(run_provider_call, "cohere"))
         except Exception as e:
+            PROVIDER_ERRORS.inc(provider="cohere", operation="generate")
             raise RuntimeError(f"❌ Failed to generate response with Cohere: {e}")
 
         # Clean the output and get the result
@@ -67,7 +97,94 @@ class CohereChatClient:
 
         # Detect the language of the response (output)
         response_lang = await self.detector.detect(text)
-        print("📤 detected language in CohereChat RESPONSE:", response_lang, "\n")
+        logger.debug("📤 detected language in CohereChat RESPONSE: %s", response_lang)
+
+        return {
+            "text": text,
+            "lang": response_lang
+        }
+
+    async def generate_streaming(self, prompt: str, abort_check: Optional[Callable[[str], Optional[str]]] = None) -> dict:
+        """
+        Generates a response by streaming tokens from Cohere, checking the partial
+        output as it arrives and cancelling the stream as soon as a rule is violated.
+        With LLM_HEDGING=1, a stream slower than the usual latency is raced by a
+        duplicate request and the first complete answer wins.
+
+        Args:
+            prompt (str): The input prompt to send to the language model.
+            abort_check (Callable[[str], Optional[str]], optional): Receives the text
+                accumulated so far and returns an error message to abort, or None.
+
+        Returns:
+            dict: The response text and its detected language. Aborted responses also
+                carry "aborted": True and the "abort_reason" returned by abort_check,
+                and their language is not detected.
+
+        Raises:
+            RuntimeError: If the call to the Cohere generate API fails.
+        """
+        # Detect the language of the prompt (input)
+        prompt_lang = await self.detector.detect(prompt)
+        logger.debug("📥 detected language in CohereChat PROMPT: %s", prompt_lang)
+
+        def consume_stream(cancel: threading.Event) -> tuple:
+            # The limiter slot is held for the whole stream; a retry starts from scratch
+            text, abort_reason = "", None
+            if cancel.is_set():
+                raise AttemptCancelled()
+            stream = self.client.generate_stream(
+                model=CHAT_MODEL,
+                prompt=prompt,
+                max_tokens=80,
+                temperature=0.0
+            )
+            # Returns as soon as the hedged twin answers, even if this stream is stalled
+            for event in cancellable(stream, cancel):
+                if event.event_type == "stream-error":
+                    raise RuntimeError(getattr(event, "err", "stream error"))
+                if event.event_type != "text-generation":
+                    continue
+
+                text += event.text
+                if abort_check:
+                    abort_reason = abort_check(text)
+                    if abort_reason:
+                        break
+            return text, abort_reason
+
+        def attempt(cancel: threading.Event) -> tuple:
+            if cancel.is_set():
+                raise AttemptCancelled()
+            PROVIDER_CALLS.inc(provider="cohere", operation="generate")
+            return get_limiter("cohere").call("generate", consume_stream, cancel)
+
+        try:
+            # Runs off the event loop; slow streams may be raced by a hedged duplicate
+            text, abort_reason = await hedged_call(
+                attempt,
+                get_hedging_policy(),
+                run=functools.partial(run_provider_call, "cohere"),
+                completed=lambda result: result[1] is None,
+            )
+        except Exception as e:
+            PROVIDER_ERRORS.inc(provider="cohere", operation="generate")
+            raise RuntimeError(f"❌ Failed to generate response with Cohere: {e}")
+
+        text = text.strip()
+
+        if abort_reason:
+            logger.info("✂️ Stream aborted: %s", abort_reason, extra={"chars_received": len(text)})
+            return {
+                "text": text,
+                "lang": None,
+                "aborted": True,
+                "abort_reason": abort_reason
+            }
+
+        # Detect the language of the response (output)
+        response_lang = await self.detector.detect(text)
+        logger.debug("📤 detected language in CohereChat RESPONSE: %s", response_lang)
 
         return {
             "text": text,
@@ -1,5 +1,15 @@
-import chromadb
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
 from app.interfaces.vector_store_interface import VectorStore
+from app.infrastructure.logger import get_logger
+from app.infrastructure.settings import get_env
+
+if TYPE_CHECKING:
+    from app.infrastructure.lexical_index import LexicalMatch
+
+logger = get_logger("vector_store")
 
 class ChromaVectorStore(VectorStore):
     """
@@ -9,31 +19,57 @@ class ChromaVectorStore(VectorStore):
     and provides an interface to count stored vectors.
     """
 
-    def __init__(self):
+    def __init__(self, path: str = "data/chroma_db", collection_name: str = "documentos"):
         """
         Initializes the ChromaDB client and loads (or creates) the collection named 'documentos'.
         The data is persisted in the 'data/chroma_db' directory.
 
+        Args:
+            path (str): Directory where ChromaDB persists its data.
+            collection_name (str): Name of the collection to load or create.
+
         Raises:
             Exception: If ChromaDB fails to initialize or access the collection.
         """
         try:
-            self.client = chromadb.PersistentClient(path="data/chroma_db")
-            self.collection = self.client.get_or_create_collection(name="documentos")
+            # Imported here so only processes that actually search pay for chromadb
+            import chromadb
+
+            self.client = chromadb.PersistentClient(path=path)
+            self.collection = self.client.get_or_create_collection(name=collection_name)
         except Exception as e:
             raise RuntimeError(f"❌ Failed to initialize ChromaDB: {e}")
 
-    def save(self, chunks: list[str], embeddings: list[list[float]]) -> None:
+    def save(self, chunks: list[str], embeddings: list[list[float]], source_version: Optional[str] = None) -> None:
         """
-        Saves a list of text chunks and their corresponding embeddings to the Chroma collection.
+        Replaces the Chroma collection with these text chunks and their embeddings.
+
+        The collection is recreated, with the same distance space, so no chunk of a
+        previous document survives; the document version goes to its metadata.
 
         Args:
             chunks (list[str]): List of text chunks to store.
             embeddings (list[list[float]]): Corresponding list of embedding vectors.
+            source_version (str, optional): Version of the document they come from.
+
+        Raises:
+            RuntimeError: If the collection cannot be recreated.
 
         Logs:
             Prints an error message for each failed chunk insertion.
         """
+        from app.infrastructure.index_snapshot import collection_space
+
+        metadata = {"hnsw:space": collection_space(self.collection)}
+        if source_version:
+            metadata["source_version"] = source_version
+        try:
+            name = self.collection.name
+            self.client.delete_collection(name)
+            self.collection = self.client.create_collection(name=name, metadata=metadata)
+        except Exception as e:
+            raise RuntimeError(f"❌ Failed to reset Chroma collection: {e}")
+
         for i, (chunk, vector) in enumerate(zip(chunks, embeddings)):
             try:
                 self.collection.add(
@@ -42,7 +78,7 @@ class ChromaVectorStore(VectorStore):
                     ids=[f"doc_{i}"]
                 )
             except Exception as e:
-                print(f"❌ Failed to store chunk {i}: {e}")
+                logger.error("❌ Failed to store chunk %s: %s", i, e)
 
     def search(self, query_vector: list[float], top_k: int) -> dict:
         """
@@ -61,9 +97,18 @@ class ChromaVectorStore(VectorStore):
                 n_results=top_k
             )
         except Exception as e:
-            print(f"❌ Failed to perform vector search: {e}")
+            logger.error("❌ Failed to perform vector search: %s", e)
             return {}
 
+    def source_version(self) -> Optional[str]:
+        """
+        Returns the document version recorded in the collection metadata by save().
+
+        Returns:
+            Optional[str]: The version, None for collections built before versions were recorded.
+        """
+        return (self.collection.metadata or {}).get("source_version")
+
     def count(self) -> int:
         """
         Returns the number of documents stored in the Chroma collection.
@@ -78,3 +123,257 @@ class ChromaVectorStore(VectorStore):
             return self.collection.count()
         except Exception as e:
             raise RuntimeError(f"❌ Failed to count documents in Chroma collection: {e}")
+
+
+class SnapshotVectorStore(VectorStore):
+    """
+    Read-mostly vector store served from a binary index snapshot.
+
+    The snapshot is memory-mapped, so opening it costs milliseconds and worker
+    processes share its pages. Search is an exact scan over the float32 block and
+    returns the same dict shape and distances as ChromaVectorStore.
+    """
+
+    def __init__(self, path: str = "data/index.snapshot"):
+        """
+        Opens the snapshot if it exists; a missing file behaves as an empty store.
+
+        Args:
+            path (str): Snapshot file written by app.infrastructure.index_snapshot.
+
+        Raises:
+            RuntimeError: If the file exists but is not a valid snapshot.
+        """
+        from app.infrastructure.index_snapshot import Snapshot, SnapshotError
+
+        self.path = path
+        self.snapshot = None
+        if os.path.exists(path):
+            try:
+                self.snapshot = Snapshot(path)
+            except SnapshotError as e:
+                raise RuntimeError(str(e))
+
+    def save(self, chunks: list[str], embeddings: list[list[float]], source_version: Optional[str] = None) -> None:
+        """
+        Replaces the snapshot with these chunks (ids doc_0..doc_n, as ChromaVectorStore) and reopens it.
+
+        Args:
+            chunks (list[str]): List of text chunks to store.
+            embeddings (list[list[float]]): Corresponding list of embedding vectors.
+            source_version (str, optional): Version of the document they come from, kept in the manifest.
+        """
+        from app.infrastructure.index_snapshot import Snapshot, write_snapshot
+
+        write_snapshot(self.path, [f"doc_{i}" for i in range(len(chunks))], chunks, embeddings, source_version=source_version)
+        self.snapshot = Snapshot(self.path)
+
+    def source_version(self) -> Optional[str]:
+        """
+        Returns the document version recorded in the snapshot manifest.
+
+        Returns:
+            Optional[str]: The version, None without a snapshot or for one written before versions were recorded.
+        """
+        return self.snapshot.source_version if self.snapshot is not None else None
+
+    def search(self, query_vector: list[float], top_k: int) -> dict:
+        """
+        Returns the top_k closest chunks, in Chroma's query result format.
+
+        Args:
+            query_vector (list[float]): The embedding vector to query with.
+            top_k (int): The number of top results to return.
+
+        Returns:
+            dict: ids, documents, metadatas and distances (one list per query), or {} on failure.
+        """
+        if self.snapshot is None or self.snapshot.count == 0:
+            return {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+        try:
+            import numpy as np
+
+            distances = self.snapshot.distances(query_vector)
+            k = min(top_k, self.snapshot.count)
+            nearest = np.argpartition(distances, k - 1)[:k]
+            nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+            return {
+                "ids": [[self.snapshot.ids[i] for i in nearest]],
+                "documents": [[self.snapshot.document(i) for i in nearest]],
+                "metadatas": [[self.snapshot.metadatas[i] for i in nearest]],
+                "distances": [[float(distances[i]) for i in nearest]],
+            }
+        except Exception as e:
+            logger.error("❌ Failed to perform vector search: %s", e)
+            return {}
+
+    def count(self) -> int:
+        """
+        Returns the number of chunks in the snapshot (0 if there is none yet).
+
+        Returns:
+            int: The number of stored vectors.
+        """
+        return self.snapshot.count if self.snapshot is not None else 0
+
+
+class HybridVectorStore(VectorStore):
+    """
+    Wraps a vector store with a BM25 index built over the same chunks.
+
+    The lexical side answers name-heavy questions on its own when it is confident
+    (see lexical_search) and otherwise adds its candidates to the vector ones,
+    fused by reciprocal rank so BM25 and distance scores need no calibration.
+    """
+
+    def __init__(self, vector_store: VectorStore, lexical_path: Optional[str] = None, candidates: int = 10, rrf_k: int = 60):
+        """
+        Args:
+            vector_store (VectorStore): The store doing the semantic search.
+            lexical_path (str, optional): Where the BM25 index is persisted; None disables the lexical side.
+            candidates (int): Hits taken from each side before fusion.
+            rrf_k (int): Reciprocal rank fusion constant; larger values flatten the rank weights.
+        """
+        from app.infrastructure.lexical_index import get_lexical_index
+
+        self.vector_store = vector_store
+        self.lexical_path = lexical_path
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.lexical = get_lexical_index(lexical_path) if lexical_path else None
+
+    @property
+    def needs_lexical_index(self) -> bool:
+        # Missing, or built from another document than the vectors
+        if self.lexical_path is None:
+            return False
+        return self.lexical is None or self.lexical.source_version != self.vector_store.source_version()
+
+    def build_lexical_index(self, chunks: list[str], source_version: Optional[str] = None) -> None:
+        """
+        Builds and persists the BM25 index (ids doc_0..doc_n, as the vector stores).
+
+        Args:
+            chunks (list[str]): The indexed chunks.
+            source_version (str, optional): Version of the document they come from.
+        """
+        from app.infrastructure.lexical_index import BM25Index
+
+        if not self.lexical_path:
+            return
+        self.lexical = BM25Index([f"doc_{i}" for i in range(len(chunks))], chunks, source_version=source_version)
+        self.lexical.save(self.lexical_path)
+        logger.info("🔤 Lexical index built", extra={"chunks": len(chunks), "path": self.lexical_path})
+
+    def save(self, chunks: list[str], embeddings: list[list[float]], source_version: Optional[str] = None) -> None:
+        """
+        Saves the chunks to the vector store and builds the lexical index over them.
+
+        Args:
+            chunks (list[str]): List of text chunks to store.
+            embeddings (list[list[float]]): Corresponding list of embedding vectors.
+            source_version (str, optional): Version of the document they come from, stored on both sides.
+        """
+        self.vector_store.save(chunks, embeddings, source_version)
+        self.build_lexical_index(chunks, source_version)
+
+    def source_version(self) -> Optional[str]:
+        """
+        Returns the document version of the wrapped store; the lexical side is rebuilt to match it.
+
+        Returns:
+            Optional[str]: The version, None if unknown.
+        """
+        return self.vector_store.source_version()
+
+    def lexical_search(self, query_text: str, top_k: int = 1) -> Optional["LexicalMatch"]:
+        """
+        Runs the BM25 query alone, without any embedding.
+
+        Args:
+            query_text (str): The question, in any language.
+            top_k (int): Hits to return.
+
+        Returns:
+            Optional[LexicalMatch]: Hits and confidence, or None without a lexical index.
+        """
+        if self.lexical is None:
+            return None
+        return self.lexical.search(query_text, top_k)
+
+    def search(self, query_vector: list[float], top_k: int, query_text: Optional[str] = None) -> dict:
+        """
+        Vector search, fused with BM25 candidates when query_text is given.
+
+        Args:
+            query_vector (list[float]): The embedding vector to query with.
+            top_k (int): The number of top results to return.
+            query_text (str, optional): Text for the lexical side (the Spanish question).
+
+        Returns:
+            dict: Chroma's result shape; distances are None for lexical-only hits and
+            'scores' holds the fused scores.
+        """
+        if self.lexical is None or not query_text:
+            return self.vector_store.search(query_vector, top_k)
+
+        vector_result = self.vector_store.search(query_vector, max(top_k, self.candidates))
+        lexical_hits = self.lexical.search(query_text, self.candidates).hits
+
+        fused, entries = {}, {}
+        vector_ids = vector_result.get("ids") or [[]]
+        for rank, doc_id in enumerate(vector_ids[0]):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            entries[doc_id] = (
+                vector_result["documents"][0][rank],
+                (vector_result.get("metadatas") or [[None] * len(vector_ids[0])])[0][rank],
+                vector_result["distances"][0][rank],
+            )
+        for rank, (position, _) in enumerate(lexical_hits):
+            doc_id = self.lexical.ids[position]
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            entries.setdefault(doc_id, (self.lexical.documents[position], None, None))
+
+        ranked = sorted(fused, key=lambda doc_id: -fused[doc_id])[:top_k]
+        return {
+            "ids": [ranked],
+            "documents": [[entries[doc_id][0] for doc_id in ranked]],
+            "metadatas": [[entries[doc_id][1] for doc_id in ranked]],
+            "distances": [[entries[doc_id][2] for doc_id in ranked]],
+            "scores": [[fused[doc_id] for doc_id in ranked]],
+        }
+
+    def count(self) -> int:
+        """
+        Returns the number of vectors in the wrapped store.
+
+        Returns:
+            int: The number of stored vectors.
+        """
+        return self.vector_store.count()
+
+
+_snapshot_store: Optional[SnapshotVectorStore] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_vector_store() -> HybridVectorStore:
+    """
+    Returns the store to search: the process-wide SnapshotVectorStore when
+    INDEX_SNAPSHOT_PATH is set, a ChromaVectorStore otherwise, wrapped with the
+    BM25 index at LEXICAL_INDEX_PATH unless LEXICAL_SEARCH is 0.
+
+    Returns:
+        HybridVectorStore: The configured store.
+    """
+    global _snapshot_store
+    lexical_path = get_env("LEXICAL_INDEX_PATH", "data/lexical_index.json") if get_env("LEXICAL_SEARCH", "1") == "1" else None
+    candidates = int(get_env("LEXICAL_CANDIDATES", "10"))
+
+    snapshot_path = get_env("INDEX_SNAPSHOT_PATH")
+    if not snapshot_path:
+        return HybridVectorStore(ChromaVectorStore(), lexical_path, candidates)
+    with _snapshot_lock:
+        if _snapshot_store is None or _snapshot_store.path != snapshot_path:
+            _snapshot_store = SnapshotVectorStore(snapshot_path)
+        return HybridVectorStore(_snapshot_store, lexical_path, candidates)
@@ -1,6 +1,57 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from app.presentation.routes import router
+from app.infrastructure.prompt_catalog import get_prompt_catalog
+from app.infrastructure.logger import configure_logging, set_request_id
+from app.infrastructure.provider_sessions import close_sessions
+from app.infrastructure.settings import get_env, load_environment
+from app.domain.indexing import INDEX_STATE, start_indexing
+from app.domain.cache_generations import cache_generations
+from app.domain.rag_pipeline import CACHE_DIR
+from app.infrastructure.cache.lifecycle import get_cache_compactor
+from app.infrastructure.loop_monitor import get_loop_monitor
+
+load_environment()
+configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the precompiled prompt and feedback tables once, before serving traffic
+    get_prompt_catalog()
+    # Build the vector index in the background so the first user does not pay for it
+    if get_env("INDEX_ON_STARTUP", "1") == "1":
+        start_indexing()
+    # Enforce the cache size caps and TTLs, and drop stale generations, in the background
+    compactor = get_cache_compactor(CACHE_DIR, cache_generations)
+    compactor.start()
+    # Opt-in: measure how long callbacks hold the event loop
+    loop_monitor = get_loop_monitor()
+    if loop_monitor is not None:
+        loop_monitor.start()
+    yield
+    if loop_monitor is not None:
+        await loop_monitor.stop()
+    await compactor.stop()
+    task = INDEX_STATE._task
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    # Release the shared provider connection pools
+    close_sessions()
+
+
+app = FastAPI(title='RAG API', lifespan=lifespan)
+
 
-app = FastAPI(title='RAG API')
+@app.middleware("http")
+async def bind_request_id(request: Request, call_next):
+    # Every log line emitted while serving this request carries the same id
+    request_id = set_request_id(request.headers.get("X-Request-ID"))
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
 
-app.include_router(router)
\ No newline at end of file
+app.include_router(router)
@@ -0,0 +1,71 @@
+import hashlib
+from typing import Dict, Optional, Tuple
+
+from app.domain.indexing import DOCUMENT_PATH, INDEX_STATE, IndexState, document_version
+# What each cached namespace was derived from; an entry is only valid for the
+# same versions of these inputs
+NAMESPACE_INPUTS: Dict[str, Tuple[str, ...]] = {
+    "translated_questions": ("translator",),
+    "translated_contexts": ("index", "context", "translator"),
+    "prompts": ("index", "context", "translator", "prompts"),
+    "responses": ("index", "context", "translator", "prompts", "llm"),
+}
+
+def index_version(document_path: Optional[str] = None, state: Optional[IndexState] = None) -> str:
+    """
+    Identifies the served index: the document version stored with it when it was built.
+
+    Once the index is ready this is the version build_index read back from (or
+    wrote to) the store, so an index that was not rebuilt after a document edit
+    keeps stamping entries with the content it actually serves. Before that it is
+    the version of the current document, which build_index makes the index match.
+
+    Args:
+        document_path (str, optional): The indexed document, DOCUMENT_PATH by default.
+        state (IndexState, optional): Build state of the served index, INDEX_STATE by default.
+
+    Returns:
+        str: Version string (see document_version).
+    """
+    return (state or INDEX_STATE).version or document_version(document_path or DOCUMENT_PATH)
+
+
+def component_versions() -> Dict[str, str]:
+    """
+    Current version of every input a cached value can depend on.
+
+    Returns:
+        Dict[str, str]: 'index', 'context', 'translator', 'prompts' and 'llm' versions.
+    """
+    from app.adapters.llm_client import CHAT_MODEL
+    from app.infrastructure.context_assembler import get_context_assembler
+    from app.infrastructure.prompt_catalog import get_prompt_catalog
+    from app.infrastructure.settings import get_env
+
+    return {
+        "index": index_version(),
+        "context": f"{get_context_assembler().version()}-prompt{get_env('PROMPT_TOKEN_BUDGET', '800')}",
+        "translator": "deepl",
+        "prompts": f"prompt-tables-v{get_prompt_catalog().version}",
+        "llm": CHAT_MODEL,
+    }
+
+
+def cache_generations() -> Dict[str, str]:
+    """
+    Generation stamp of each cache namespace, derived from the versions of its inputs.
+
+    Changing the document (and re-indexing), the prompt tables or a model changes
+    the generation of the namespaces that depend on it, so their older entries
+    stop being served and are dropped by the next compaction. Namespaces that do
+    not depend on it (e.g. translated questions after a document change) keep
+    their entries.
+
+    Returns:
+        Dict[str, str]: Namespace -> generation.
+    """
+    versions = component_versions()
+    return {
+        namespace: hashlib.sha256("|".join(f"{name}={versions[name]}" for name in inputs).encode("utf-8")).hexdigest()[:12]
+        for namespace, inputs in NAMESPACE_INPUTS.items()
+    }
@@ -0,0 +1,234 @@
+"""
+Cache warm-up: runs the RAG pipeline ahead of traffic for a list of questions.
+
+After a deploy or a cache flush, running the most common questions once fills the
+response, prompt and translation caches with exactly what /ask would produce,
+because every question goes through run_rag_pipeline. Usage:
+
+    # Questions of the Postman collection, 4 at a time
+    python -m app.domain.cache_warmup
+
+    # A JSONL file ({"question": ...} or a bare string per line), resuming an interrupted run
+    python -m app.domain.cache_warmup questions.jsonl --concurrency 8 --resume
+
+    # What would run, without any provider call
+    python -m app.domain.cache_warmup --dry-run
+
+Each question gets one line in the report (JSONL): its status ('warmed', 'cached'
+or 'error'), latency and the provider calls and DeepL characters it cost.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import track_costs
+
+logger = get_logger("cache_warmup")
+
+COLLECTION_PATH = "rag_questions_duplicated_postman_collection.json"
+REPORT_PATH = os.path.join("cache", "warmup_report.jsonl")
+USER_NAME = "warmup"
+
+
+def load_questions(path: str = COLLECTION_PATH) -> List[str]:
+    """
+    Reads the questions to warm, without duplicates.
+
+    Args:
+        path (str): A Postman collection (.json) or a JSONL file where each line is
+            {"question": ...} or a JSON string.
+
+    Returns:
+        List[str]: Unique questions, in file order.
+    """
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    questions.append(item["question"] if isinstance(item, dict) else item)
+        else:
+            for item in json.load(f)["item"]:
+                questions.append(json.loads(item["request"]["body"]["raw"])["question"])
+    return list(dict.fromkeys(q.strip() for q in questions if q and q.strip()))
+
+
+def completed_questions(report_path: str) -> Set[str]:
+    """
+    Questions a previous run already warmed (or found cached), for --resume.
+
+    Args:
+        report_path (str): The JSONL report of the previous run.
+
+    Returns:
+        Set[str]: Questions that do not need to run again.
+    """
+    done = set()
+    if not os.path.exists(report_path):
+        return done
+    with open(report_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # The last line of an interrupted run may be truncated
+                continue
+            if record.get("status") in ("warmed", "cached"):
+                done.add(record["question"])
+    return done
+
+
+def summarize_costs(ledger: Dict[str, float]) -> dict:
+    # 'rag_provider_calls_total.cohere.embed' -> provider_calls['cohere.embed']
+    costs: Dict[str, Dict[str, float]] = {"provider_calls": {}, "deepl_billed_characters": {}}
+    for key, value in sorted(ledger.items()):
+        name, _, labels = key.partition(".")
+        if name == "rag_provider_calls_total":
+            costs["provider_calls"][labels] = value
+        elif name == "rag_deepl_billed_characters_total":
+            costs["deepl_billed_characters"][labels] = value
+    return costs
+
+
+async def warm_question(question: str) -> dict:
+    """
+    Runs the pipeline for one question unless its response is already cached.
+
+    Args:
+        question (str): The question.
+
+    Returns:
+        dict: Report record with status, latency, costs and the error if any.
+    """
+    from app.domain.rag_pipeline import get_cached_answer, run_rag_pipeline
+
+    record = {"question": question}
+    start = time.perf_counter()
+    with track_costs() as ledger:
+        try:
+            if await asyncio.to_thread(get_cached_answer, question, USER_NAME) is not None:
+                record["status"] = "cached"
+            else:
+                await run_rag_pipeline(question, USER_NAME, skip_response_cache=True)
+                record["status"] = "warmed"
+        except Exception as e:
+            logger.error("❌ Warm-up failed: %s", e, extra={"question": question})
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+    record["latency_s"] = round(time.perf_counter() - start, 4)
+    record.update(summarize_costs(ledger))
+    return record
+
+
+async def warm_up(questions: List[str], concurrency: int = 4, report_path: str = REPORT_PATH, resume: bool = False, dry_run: bool = False) -> dict:
+    """
+    Warms the caches for a list of questions with bounded concurrency.
+
+    Records are appended to the report as each question finishes, so an
+    interrupted run can be resumed.
+
+    Args:
+        questions (List[str]): Questions to warm.
+        concurrency (int): Questions running at the same time.
+        report_path (str): JSONL report, one record per question.
+        resume (bool): Skip the questions the existing report marks as done
+            (otherwise the report is overwritten).
+        dry_run (bool): Only report which questions are cached or would run.
+
+    Returns:
+        dict: Totals per status, latency percentiles and total costs.
+    """
+    from app.domain.indexing import ensure_index
+    from app.domain.rag_pipeline import get_cached_answer
+    from app.infrastructure.settings import load_environment
+
+    load_environment()
+    skipped = completed_questions(report_path) if resume else set()
+    pending = [q for q in questions if q not in skipped]
+
+    if dry_run:
+        cached = [q for q in pending if get_cached_answer(q, USER_NAME) is not None]
+        return {"questions": len(questions), "skipped": len(questions) - len(pending), "cached": len(cached), "to_run": len(pending) - len(cached), "dry_run": True}
+
+    # Built once up front instead of making the first questions wait for it
+    await ensure_index("wait")
+
+    os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    records: List[dict] = []
+
+    with open(report_path, "a" if resume else "w", encoding="utf-8") as report:
+        async def one(question: str) -> None:
+            async with semaphore:
+                record = await warm_question(question)
+            report.write(json.dumps(record, ensure_ascii=False) + "\n")
+            report.flush()
+            records.append(record)
+            logger.info("🔥 Question warmed", extra={"status": record["status"], "latency_s": record["latency_s"]})
+
+        await asyncio.gather(*(one(q) for q in pending))
+
+    return summarize(records, skipped=len(questions) - len(pending))
+
+
+def summarize(records: List[dict], skipped: int = 0) -> dict:
+    """
+    Totals of a warm-up run.
+
+    Args:
+        records (List[dict]): Records returned by warm_question.
+        skipped (int): Questions skipped by --resume.
+
+    Returns:
+        dict: Count per status, latency percentiles and summed costs.
+    """
+    statuses: Dict[str, int] = {}
+    totals: Dict[str, Dict[str, float]] = {"provider_calls": {}, "deepl_billed_characters": {}}
+    for record in records:
+        statuses[record["status"]] = statuses.get(record["status"], 0) + 1
+        for kind, costs in totals.items():
+            for key, value in record.get(kind, {}).items():
+                costs[key] = costs.get(key, 0) + value
+
+    latencies = sorted(r["latency_s"] for r in records)
+
+    def percentile(pct: float) -> Optional[float]:
+        return latencies[min(len(latencies) - 1, int(pct / 100 * len(latencies)))] if latencies else None
+
+    return {
+        "questions": len(records) + skipped,
+        "skipped": skipped,
+        "statuses": statuses,
+        "latency_s": {"p50": percentile(50), "p95": percentile(95), "max": latencies[-1] if latencies else None},
+        **totals,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Warm the RAG caches by running the pipeline for a list of questions.")
+    parser.add_argument("questions", nargs="?", default=COLLECTION_PATH, help="Postman collection (.json) or JSONL question list")
+    parser.add_argument("--concurrency", type=int, default=4, help="Questions running at the same time")
+    parser.add_argument("--report", default=REPORT_PATH, help="JSONL report, one record per question")
+    parser.add_argument("--resume", action="store_true", help="Skip the questions already done in the report")
+    parser.add_argument("--dry-run", action="store_true", help="Only count cached questions and those that would run")
+    args = parser.parse_args(argv)
+
+    from app.infrastructure.logger import configure_logging
+    from app.infrastructure.provider_sessions import close_sessions
+
+    configure_logging()
+    questions = load_questions(args.questions)
+    try:
+        summary = asyncio.run(warm_up(questions, args.concurrency, args.report, args.resume, args.dry_run))
+    finally:
+        close_sessions()
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
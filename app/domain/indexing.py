@@ -0,0 +1,258 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.settings import get_env
+
+logger = get_logger("indexing")
+
+DOCUMENT_PATH = "data/documento.docx"
+
+# Cohere accepts at most 96 texts per embed call
+EMBED_BATCH_SIZE = 96
+
+INDEXING_POLICIES = ("wait", "cache_only", "reject")
+
+
+class IndexNotReadyError(Exception):
+    """
+    Raised when a request cannot be served because the index is still being built.
+    """
+    pass
+
+
+class IndexState:
+    """
+    Progress of the vector index build, shared by the startup task, /ready and /ask.
+
+    Attributes:
+        status (str): 'pending', 'indexing', 'ready' or 'failed'.
+        total_chunks (int): Chunks to embed (0 until the document is chunked).
+        embedded_chunks (int): Chunks embedded so far.
+        error (str, optional): Last failure message, when status is 'failed'.
+        version (str, optional): Document version the served index was built from
+            (see document_version), once it is ready.
+    """
+
+    def __init__(self):
+        self.status = "pending"
+        self.total_chunks = 0
+        self.embedded_chunks = 0
+        self.error: Optional[str] = None
+        self.version: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def as_dict(self) -> dict:
+        progress = self.embedded_chunks / self.total_chunks if self.total_chunks else (1.0 if self.ready else 0.0)
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "status": self.status,
+            "progress": round(progress, 4),
+            "embedded_chunks": self.embedded_chunks,
+            "total_chunks": self.total_chunks,
+            "elapsed_seconds": elapsed,
+            "error": self.error,
+            "version": self.version,
+        }
+
+
+INDEX_STATE = IndexState()
+
+_document_versions: Dict[Tuple[str, int, int], str] = {}
+_document_lock = threading.Lock()
+
+
+def document_version(document_path: str = DOCUMENT_PATH) -> str:
+    """
+    Identifies what an index built now would contain: a hash of the document and the embedding model.
+
+    The version is stored with the index when it is built, so a changed document
+    or model is detected on the next start. The document hash is recomputed only
+    when its modification time or size changes.
+
+    Args:
+        document_path (str): The indexed document.
+
+    Returns:
+        str: Short version string, 'missing:<model>' if the document does not exist.
+    """
+    from app.adapters.embedding_provider import EMBED_MODEL
+
+    try:
+        stat = os.stat(document_path)
+    except OSError:
+        return f"missing:{EMBED_MODEL}"
+
+    key = (document_path, stat.st_mtime_ns, stat.st_size)
+    with _document_lock:
+        digest = _document_versions.get(key)
+        if digest is None:
+            with open(document_path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:16]
+            _document_versions.clear()
+            _document_versions[key] = digest
+            logger.info("📄 Document version computed", extra={"document": document_path, "version": digest})
+    return f"{digest}:{EMBED_MODEL}"
+
+
+def _default_vector_store():
+    from app.adapters.vector_store import get_vector_store
+    return get_vector_store()
+
+
+def _default_embedder():
+    from app.adapters.embedding_provider import CohereEmbedder
+    return CohereEmbedder()
+
+
+async def build_index(
+    state: IndexState = INDEX_STATE,
+    document_path: str = DOCUMENT_PATH,
+    vector_store_factory: Callable = _default_vector_store,
+    embedder_factory: Callable = _default_embedder,
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> None:
+    """
+    Embeds and stores the document unless the vector store already holds this version of it.
+
+    An index recorded for another document version (an edited document, another
+    embedding model, or an index from before versions were recorded) is rebuilt
+    from scratch. Blocking SDK calls run in worker threads so the event loop keeps serving
+    /ready and cached answers while the index is built.
+
+    Args:
+        state (IndexState): Where progress is reported.
+        document_path (str): Document to index.
+        vector_store_factory (Callable): Returns the target VectorStore.
+        embedder_factory (Callable): Returns the EmbeddingProvider.
+        batch_size (int): Chunks embedded per provider call.
+
+    Raises:
+        RuntimeError: If loading, embedding or storing fails; the state is marked 'failed'.
+    """
+    from app.infrastructure.chunker import chunk_text
+    from app.infrastructure.file_loader import load_text_file
+    from app.infrastructure.rate_limiter import run_provider_call
+
+    state.status, state.error = "indexing", None
+    state.started_at, state.finished_at = time.time(), None
+    try:
+        vector_store = await asyncio.to_thread(vector_store_factory)
+        version = await asyncio.to_thread(document_version, document_path)
+        existing = await asyncio.to_thread(vector_store.count)
+        indexed_version = await asyncio.to_thread(vector_store.source_version) if existing > 0 else None
+
+        if existing > 0 and indexed_version == version:
+            logger.info("📦 Vector store already has embeddings. Skipping indexing.")
+            state.total_chunks = state.embedded_chunks = existing
+            if getattr(vector_store, "needs_lexical_index", False):
+                # The lexical side needs no provider call, only the chunks
+                text = await asyncio.to_thread(load_text_file, document_path)
+                await asyncio.to_thread(vector_store.build_lexical_index, chunk_text(text), version)
+        else:
+            if existing > 0:
+                logger.info("📄 Index built from another document version, re-indexing", extra={"indexed": indexed_version, "document": version})
+            logger.info("🧱 Indexing document...")
+            text = await asyncio.to_thread(load_text_file, document_path)
+            chunks = chunk_text(text)
+            state.total_chunks, state.embedded_chunks = len(chunks), 0
+
+            embedder = embedder_factory()
+            embeddings = []
+            for start in range(0, len(chunks), batch_size):
+                batch = chunks[start:start + batch_size]
+                embeddings.extend(await run_provider_call("cohere", embedder.get_embeddings, batch))
+                state.embedded_chunks += len(batch)
+
+            # Replaces whatever the store held, together with the version it was built from
+            await asyncio.to_thread(vector_store.save, chunks, embeddings, version)
+            logger.info("✅ Indexing complete.", extra={"chunks": len(chunks)})
+
+        state.version = version
+        state.status = "ready"
+    except Exception as e:
+        state.status, state.error = "failed", str(e)
+        logger.error("❌ Indexing failed: %s", e)
+        raise RuntimeError(f"❌ Failed to build the vector index: {e}")
+    finally:
+        state.finished_at = time.time()
+
+
+def start_indexing(state: IndexState = INDEX_STATE, **build_kwargs) -> asyncio.Task:
+    """
+    Starts the index build in the background, once; a failed build is started again.
+
+    Must be called from a running event loop (e.g. the app lifespan).
+
+    Args:
+        state (IndexState): Shared progress state.
+        **build_kwargs: Forwarded to build_index.
+
+    Returns:
+        asyncio.Task: The running (or finished) build task.
+    """
+    with state._lock:
+        if state._task is None or (state._task.done() and not state.ready):
+            state._task = asyncio.create_task(build_index(state, **build_kwargs))
+            # Failures are reported through the state; avoid "exception never retrieved" noise
+            state._task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return state._task
+
+
+def get_indexing_policy() -> str:
+    """
+    Reads INDEXING_POLICY, what /ask does while the index is being built:
+    'wait' (default) blocks until it is ready, 'cache_only' serves cached answers
+    and rejects the rest, 'reject' rejects every request.
+
+    Returns:
+        str: One of INDEXING_POLICIES.
+    """
+    policy = (get_env("INDEXING_POLICY") or "wait").strip().lower()
+    if policy not in INDEXING_POLICIES:
+        logger.warning("⚠️ Unknown INDEXING_POLICY '%s', using 'wait'", policy)
+        return "wait"
+    return policy
+
+
+async def ensure_index(policy: Optional[str] = None, state: IndexState = INDEX_STATE) -> bool:
+    """
+    Applies the indexing policy for one request.
+
+    Args:
+        policy (str, optional): Overrides INDEXING_POLICY.
+        state (IndexState): Shared progress state.
+
+    Returns:
+        bool: True when the index is ready, False when only cached answers may be served.
+
+    Raises:
+        IndexNotReadyError: Under the 'reject' policy while the index is not ready.
+        RuntimeError: Under the 'wait' policy, if the build fails.
+    """
+    if state.ready:
+        return True
+
+    policy = policy or get_indexing_policy()
+    task = start_indexing(state)
+
+    if policy == "wait":
+        # Shielded so a cancelled request does not cancel the shared build
+        await asyncio.shield(task)
+        return True
+    if policy == "cache_only":
+        return False
+    raise IndexNotReadyError("⏳ The document index is still being built, try again shortly.")
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.infrastructure.metrics import STAGE_LATENCY, Histogram
+
+# Stage whose coroutine is currently running, to attribute dependency waits to it
+_current_stage: ContextVar[Optional[str]] = ContextVar("current_stage", default=None)
+
+# Timings of the runs started by the current request, see collect_timings()
+_timings_sink: ContextVar[Optional[Dict[str, float]]] = ContextVar("timings_sink", default=None)
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, float]]:
+    """
+    Exposes the stage timings of the pipeline runs started in the enclosed block.
+
+    Yields:
+        Dict[str, float]: Seconds per stage, filled as the stages finish.
+    """
+    timings: Dict[str, float] = {}
+    token = _timings_sink.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings_sink.reset(token)
+
+
+class Stage:
+    """
+    One node of the pipeline DAG.
+
+    Attributes:
+        name (str): Unique stage name, also its latency label.
+        fn (Callable): Async function receiving the PipelineRun; it may await
+            run.get(other) for dependencies that are only needed conditionally.
+        deps (Tuple[str, ...]): Stages always needed; they are started concurrently
+            before fn runs and their results are available through run.get().
+    """
+
+    def __init__(self, name: str, fn: Callable[["PipelineRun"], Awaitable[Any]], deps: Iterable[str] = ()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+
+class PipelineRun:
+    """
+    Demand-driven execution of a stage DAG for one request.
+
+    Each stage runs at most once, as its own task, the first time it is requested.
+    Independent stages therefore overlap, while a stage that nothing asks for
+    (e.g. vector search when the prompt is cached) never runs.
+
+    Stage latency excludes the time spent waiting on other stages, so the
+    recorded timings show where the work happens, not the critical path.
+    """
+
+    def __init__(self, stages: Iterable[Stage], histogram: Optional[Histogram] = None):
+        """
+        Args:
+            stages (Iterable[Stage]): The DAG nodes.
+            histogram (Histogram, optional): Where timings go, STAGE_LATENCY by default.
+        """
+        self.stages: Dict[str, Stage] = {stage.name: stage for stage in stages}
+        sink = _timings_sink.get()
+        self.timings: Dict[str, float] = sink if sink is not None else {}
+        self._histogram = histogram or STAGE_LATENCY
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._waiting: Dict[str, Tuple[int, float]] = {}
+        self._waited: Dict[str, float] = {}
+
+    def start(self, *names: str) -> None:
+        """
+        Starts stages in the background without waiting for them (prefetch).
+
+        Args:
+            *names (str): Stages to start.
+        """
+        for name in names:
+            self._task(name)
+
+    async def get(self, name: str) -> Any:
+        """
+        Returns the result of a stage, running it first if needed.
+
+        Args:
+            name (str): Stage name.
+
+        Returns:
+            Any: What the stage function returned.
+
+        Raises:
+            Exception: Whatever the stage (or one of its dependencies) raised.
+        """
+        return (await self.gather(name))[0]
+
+    async def gather(self, *names: str) -> list:
+        """
+        Returns the results of several stages, running them concurrently.
+
+        Args:
+            *names (str): Stage names.
+
+        Returns:
+            list: Their results, in the same order.
+        """
+        tasks = [self._task(name) for name in names]
+        caller = _current_stage.get()
+        if caller is None:
+            return list(await asyncio.gather(*tasks))
+
+        # Only the outermost wait of a stage counts, so overlapping gathers are not double counted
+        depth, started = self._waiting.get(caller, (0, time.perf_counter()))
+        self._waiting[caller] = (depth + 1, started if depth else time.perf_counter())
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            depth, started = self._waiting[caller]
+            self._waiting[caller] = (depth - 1, started)
+            if depth == 1:
+                self._waited[caller] = self._waited.get(caller, 0.0) + time.perf_counter() - started
+
+    def cancel(self) -> None:
+        """
+        Cancels the stages still running (e.g. prefetches no longer needed).
+        """
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+            # Results of abandoned stages must not surface as "exception never retrieved"
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def _task(self, name: str) -> asyncio.Task:
+        if name not in self._tasks:
+            if name not in self.stages:
+                raise KeyError(f"❌ Unknown pipeline stage: {name}")
+            self._tasks[name] = asyncio.create_task(self._run(self.stages[name]))
+        return self._tasks[name]
+
+    async def _run(self, stage: Stage) -> Any:
+        _current_stage.set(stage.name)
+        if stage.deps:
+            await self.gather(*stage.deps)
+        self._waited[stage.name] = 0.0
+
+        start = time.perf_counter()
+        try:
+            return await stage.fn(self)
+        finally:
+            elapsed = time.perf_counter() - start - self._waited.get(stage.name, 0.0)
+            self.timings[stage.name] = elapsed
+            self._histogram.observe(max(elapsed, 0.0), stage=stage.name)
@@ -1,165 +1,250 @@
 # === Imports ===
-from app.infrastructure.file_loader import load_text_file
-from app.infrastructure.chunker import chunk_text
-from app.infrastructure.translator import DeepLTranslator 
+from app.infrastructure.batching_translator import get_batching_translator
 from app.infrastructure.cache.json_cache import JsonCache
 
 from app.adapters.embedding_provider import CohereEmbedder
-from app.adapters.vector_store import ChromaVectorStore
+from app.adapters.vector_store import get_vector_store
 from app.adapters.llm_client import CohereChatClient
 from app.adapters.default_prompt_builder import DefaultPromptBuilder
 from app.adapters.cache_manager import CacheManager
 from app.adapters.langdetect_adapter import LangDetectAdapter
 
 from app.interfaces.embedding_interface import EmbeddingProvider
-from app.interfaces.vector_store_interface import VectorStore
 from app.interfaces.prompt_interface import PromptBuilder
 
 from app.utils.hashing import stable_hash
+from app.infrastructure.metrics import span, LLM_RETRIES
+from app.infrastructure.rate_limiter import run_provider_call
+from app.infrastructure.lexical_index import RETRIEVALS
+from app.infrastructure.context_assembler import PROMPT_TOKENS, estimate_tokens, get_context_assembler
 
 from app.domain.validation_rules import ValidationRules
+from app.domain.response_repair import ResponseRepairer
+from app.domain.indexing import INDEX_STATE, IndexNotReadyError, ensure_index, get_indexing_policy
+from app.domain.pipeline_dag import PipelineRun, Stage
+from app.domain.cache_generations import cache_generations
 
-from dotenv import load_dotenv
-import os
+from app.infrastructure.logger import get_logger
+from app.infrastructure.settings import get_env, load_environment
 
-# === Globals ===
-_index_checked = False  # Prevent reindexing multiple times
+import asyncio
+import logging
+from typing import Optional
 
-# === Document Indexing ===
-def prepare_index_if_needed():
-    global _index_checked
-    if _index_checked:
-        return
-    _index_checked = True
+logger = get_logger("rag_pipeline")
 
-    vector_store = ChromaVectorStore()
+CACHE_DIR = "./cache"
 
-    if vector_store.count() > 0:
-        print("📦 Vector store already has embeddings. Skipping indexing.")
-        return
+def get_lexical_fast_path_confidence() -> float:
+    # LEXICAL_FAST_PATH_CONFIDENCE above 1 disables the fast path, keeping only the fusion
+    return float(get_env("LEXICAL_FAST_PATH_CONFIDENCE", "0.5"))
 
-    print("🧱 Indexing document...")
-    text = load_text_file("data/documento.docx")
-    chunks = chunk_text(text)
-    embedder = CohereEmbedder()
-    embeddings = embedder.get_embeddings(chunks)
-    vector_store.save(chunks, embeddings)
-    print("✅ Indexing complete.")
+def format_answer(user_name: str, question: str, response: str) -> str:
+    return f"{user_name} preguntó: '{question}' 🤖, respuesta: {response}"
+
+# === Cache fast path ===
+def get_cached_answer(question: str, user_name: str) -> Optional[str]:
+    """
+    Returns the final answer if the response for this question is already cached.
+
+    Needs no provider call, so /ask can serve it without entering the admission queue.
+
+    Args:
+        question (str): The user question.
+        user_name (str): Name echoed in the answer.
+
+    Returns:
+        Optional[str]: The formatted answer, or None on a cache miss.
+    """
+    cached_response = CacheManager(JsonCache(CACHE_DIR), cache_generations()).get_response(stable_hash(question))
+    if not cached_response:
+        return None
+    return format_answer(user_name, question, cached_response)
 
 # === RAG Pipeline ===
-async def run_rag_pipeline(question: str, user_name: str) -> str:
-    
-    load_dotenv()  # Carga las variables del .env
-
-    # api_key = os.getenv("COHERE_API_KEY")
-            
-    # print('apikey', api_key)
-    
-    prepare_index_if_needed()
-
-    # 1. Initialize dependencies
-    cache = CacheManager(JsonCache("./cache"))
-    translator = DeepLTranslator()
-    detector = LangDetectAdapter()
-    prompt_builder: PromptBuilder = DefaultPromptBuilder()
+async def run_rag_pipeline(question: str, user_name: str, skip_response_cache: bool = False) -> str:
+    # skip_response_cache: the caller already missed in get_cached_answer, so the lookup is not repeated
+    load_environment()  # Loads .env on the first call only
+
+    # 1. Initialize dependencies (cheap: the SDK clients are shared per process)
+    with span("init"):
+        # Entries produced from another document, prompt table or model version are ignored
+        cache = CacheManager(JsonCache(CACHE_DIR), cache_generations())
+        # Concurrent requests share DeepL list calls per language pair
+        translator = get_batching_translator()
+        detector = LangDetectAdapter()
+        prompt_builder: PromptBuilder = DefaultPromptBuilder()
 
     # 2. Generate stable ID for the question
     question_id = stable_hash(question)
 
-    # 3. Detect language
-    lang = await detector.detect(question)
-    print(f"🌐 Detected language: {lang}")
-
-    # 4. Check cached response
-    cached_response = cache.get_response(question_id)
+    # 3. Check cached response first: a hit needs no provider call at all
+    cached_response = None
+    if not skip_response_cache:
+        with span("response_cache"):
+            cached_response = cache.get_response(question_id)
     if cached_response:
-        print(f'cached_response: {cached_response}')
-        print(f'(🔁 from cache)...')
-        return f"{user_name} preguntó: '{question}' 🤖, respuesta: {cached_response}"
-
-    # 5. Translate question to Spanish for embedding
-    translated_question = cache.get_translated_question(question_id)
-    print(f'translated_question: {translated_question}')
-
-    if not translated_question:
-        print(f'No translated_question... translating')
-        translated_question = translator.translate_to_spanish(question, lang)
-        print(f'translated_question: {translated_question}')
-        cache.store_translated_question(question_id, translated_question)
-        print(f'store_translated_question correct.')
-
-    # 6. Embed translated question
-    embedder: EmbeddingProvider = CohereEmbedder()
-    question_vector = embedder.get_embeddings([translated_question])[0]
-
-    # 7. Semantic search in vector store
-    vector_store: VectorStore = ChromaVectorStore()
-    result = vector_store.search(question_vector, top_k=1)
-    context_es = result["documents"][0][0] if result["documents"] and result["documents"][0] else ""
-    print(f'context: {context_es}')
-
-    # 8. Translate context back to original language
-    translated_context = cache.get_translated_context(question_id)
-    print('translated_context cached: {translated_context}')
-
-    if not translated_context:
-        translated_context = translator.translate_from_spanish(context_es, lang)
-        print('translated_context translated: {translated_context}')
-        cache.store_translated_context(question_id, translated_context)
-        print(f'store_translated_context correct.')
-
-    # 9. Prompt generation
-    prompt = cache.get_prompt(question_id)
-    if not prompt:
-        print(f'No cached prompt..')
-        prompt = await prompt_builder.build_prompt(context=translated_context, question=question, language=lang)
-        print(f'Prompt: {prompt}')
-        cache.store_prompt(question_id, prompt)
-        print(f'store_prompt correct.')
-
-    # 10. Call to LLM
-    llm = CohereChatClient()
-    response = await llm.generate(prompt)
-    print(f"🔄 response: {response['text']}")
-
-    # 11. Validation loop with feedback
-    validator = ValidationRules(expected_lang=lang)
+        logger.debug("🔁 Response served from cache: %s", cached_response)
+        return format_answer(user_name, question, cached_response)
+
+    # The index is built by a startup task; INDEXING_POLICY decides what happens meanwhile
+    if not INDEX_STATE.ready and get_indexing_policy() != "wait":
+        with span("prepare_index"):
+            await ensure_index()
+        raise IndexNotReadyError("⏳ The document index is still being built and this question is not cached yet.")
+
+    # 4. Stage DAG: each stage reads its own cache entry first and only asks for the
+    #    stages it actually needs, so independent network calls overlap
+    async def prepare_index(run: PipelineRun) -> bool:
+        return await ensure_index("wait")
+
+    async def detect_language(run: PipelineRun) -> str:
+        lang = await detector.detect(question)
+        logger.debug("🌐 Detected language: %s", lang)
+        return lang
+
+    async def translate_question(run: PipelineRun) -> str:
+        # Translate question to Spanish for embedding
+        translated_question = cache.get_translated_question(question_id)
+        if not translated_question:
+            lang = await run.get("detect_language")
+            translated_question = await translator.translate_to_spanish(question, lang)
+            cache.store_translated_question(question_id, translated_question)
+        logger.debug("translated_question: %s", translated_question)
+        return translated_question
+
+    async def embed_question(run: PipelineRun) -> list:
+        translated_question = await run.get("translate_question")
+        embedder: EmbeddingProvider = CohereEmbedder()
+        return (await run_provider_call("cohere", embedder.get_embeddings, [translated_question]))[0]
+
+    async def vector_search(run: PipelineRun) -> str:
+        await run.get("prepare_index")
+        vector_store = await asyncio.to_thread(get_vector_store)
+
+        # Top-k candidates, deduplicated and packed into the context token budget
+        assembler = get_context_assembler()
+
+        # Lexical fast path: a question quoting a name of the document needs no translation or embedding
+        lexical = vector_store.lexical_search(question, assembler.top_k)
+        if lexical is not None and lexical.confidence >= get_lexical_fast_path_confidence():
+            RETRIEVALS.inc(path="lexical")
+            # Weaker hits only add tokens, keep those scoring at least half the best one
+            best_score = lexical.hits[0][1]
+            context_es = assembler.assemble([vector_store.lexical.documents[i] for i, score in lexical.hits if score >= best_score / 2])
+            logger.debug("🔤 Lexical fast path (confidence %.2f), context: %s", lexical.confidence, context_es)
+            return context_es
+
+        # Semantic search in vector store, fused with the BM25 candidates of the Spanish question
+        question_vector, translated_question = await run.gather("embed_question", "translate_question")
+        RETRIEVALS.inc(path="hybrid" if vector_store.lexical is not None else "vector")
+        result = await asyncio.to_thread(vector_store.search, question_vector, assembler.top_k, translated_question)
+        context_es = assembler.assemble(result["documents"][0] if result.get("documents") else [])
+        logger.debug("context: %s", context_es)
+        return context_es
+
+    async def translate_context(run: PipelineRun) -> str:
+        # Translate context back to original language
+        translated_context = cache.get_translated_context(question_id)
+        if not translated_context:
+            context_es, lang = await run.gather("vector_search", "detect_language")
+            translated_context = await translator.translate_from_spanish(context_es, lang)
+            cache.store_translated_context(question_id, translated_context)
+        logger.debug("translated_context: %s", translated_context)
+        return translated_context
+
+    async def build_prompt(run: PipelineRun) -> str:
+        prompt = cache.get_prompt(question_id)
+        if not prompt:
+            translated_context, lang = await run.gather("translate_context", "detect_language")
+            prompt = await prompt_builder.build_prompt(context=translated_context, question=question, language=lang)
+            cache.store_prompt(question_id, prompt)
+        logger.debug("Prompt: %s", prompt)
+        return prompt
+
+    async def llm_client(run: PipelineRun) -> CohereChatClient:
+        # The first client of the process runs a health check, keep it off the loop
+        return await run_provider_call("cohere", CohereChatClient)
+
+    run = PipelineRun([
+        Stage("prepare_index", prepare_index),
+        Stage("detect_language", detect_language),
+        Stage("translate_question", translate_question),
+        Stage("embed_question", embed_question),
+        Stage("vector_search", vector_search),
+        Stage("translate_context", translate_context),
+        Stage("build_prompt", build_prompt),
+        Stage("llm_client", llm_client),
+    ])
+    try:
+        lang, prompt, llm = await run.gather("detect_language", "build_prompt", "llm_client")
+    finally:
+        run.cancel()
+
+    # 5. Call to LLM, streaming so a definitely invalid answer is cut short
+    validator = ValidationRules(expected_lang=lang, feedback_lang=lang)
+    with span("generate"):
+        PROMPT_TOKENS.observe(estimate_tokens(prompt))
+        response = await llm.generate_streaming(prompt, abort_check=validator.check_partial)
+    logger.debug("🔄 response: %s", response["text"])
+
+    # 6. Validation loop with local repairs first, then LLM feedback
     MAX_RETRIES = 2
     attempts = 0
-    valid = validator.validate(response)
+    repairer = ResponseRepairer()
+    valid = not response.get("aborted") and validator.validate(response)
     invalid_responses = []
 
+    if not valid:
+        with span("repair"):
+            repaired = await repairer.repair(response, validator, detect=detector.detect)
+        if repaired:
+            response, valid = repaired, True
+
     while not valid and attempts <= MAX_RETRIES:
-        print(f"⚠️ Attempt {attempts+1}: invalid response. Retrying...")
+        logger.warning("⚠️ Attempt %d: invalid response. Retrying...", attempts + 1)
         invalid_responses.append(response)
-
-        _, feedback_messages = validator.validate_with_feedback(response)
-        feedback_block = "\n".join(translator.translate(text, "es", lang) for text in feedback_messages)
-
-        prompt = await prompt_builder.build_prompt(
-            context=translated_context,
-            question=question,
-            language=lang,
-            extra_instructions=feedback_block
-        )
-        response = await llm.generate(prompt)
-        valid = validator.validate(response)
-        attempts += 1
+        LLM_RETRIES.inc()
+
+        with span("retry"):
+            if response.get("aborted"):
+                feedback_messages = [response["abort_reason"]]
+            else:
+                _, feedback_messages = validator.validate_with_feedback(response)
+            # Feedback comes precompiled in the answer language, no translation needed
+            feedback_block = "\n".join(feedback_messages)
+            # Only runs now if the prompt was cached (the stage reads its own cache entry)
+            translated_context = await run.get("translate_context")
+
+            prompt = await prompt_builder.build_prompt(
+                context=translated_context,
+                question=question,
+                language=lang,
+                extra_instructions=feedback_block
+            )
+            PROMPT_TOKENS.observe(estimate_tokens(prompt))
+            response = await llm.generate_streaming(prompt, abort_check=validator.check_partial)
+            valid = not response.get("aborted") and validator.validate(response)
+            attempts += 1
+
+        if not valid:
+            with span("repair"):
+                repaired = await repairer.repair(
+                    response, validator, detect=detector.detect, retry_pending=attempts <= MAX_RETRIES
+                )
+            if repaired:
+                response, valid = repaired, True
 
     if not valid:
         invalid_responses.append(response)
-        print("❌ Max retries exceeded. Invalid responses:")
-        for idx, r in enumerate(invalid_responses):
-            print(f"\n🔁 Attempt {idx+1}:")
-            print(r)
+        logger.error("❌ Max retries exceeded.", extra={"attempts": len(invalid_responses)})
+        if logger.isEnabledFor(logging.DEBUG):
+            for idx, r in enumerate(invalid_responses):
+                logger.debug("🔁 Attempt %d: %s", idx + 1, r)
         return f"⚠️ No valid response generated for question: '{question}'"
 
-    # 12. Cache final response
+    # 7. Cache final response
     cache.store_response(question_id, response['text'])
 
-    # 13. Return final response
-    return f"{user_name} preguntó: '{question}' 🤖, respuesta: {response['text']}"
-
-
-
-
+    # 8. Return final response
+    return format_answer(user_name, question, response['text'])
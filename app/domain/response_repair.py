@@ -0,0 +1,174 @@
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Protocol
+
+from app.domain.validation_rules import EMOJI_REGEX, ValidationRules
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+
+logger = get_logger("response_repair")
+
+# Fallback emoji appended per language when the model forgot to add one.
+# All of them live above U+FFFF so EmojiValidator recognizes them.
+DEFAULT_EMOJIS = {
+    "es": "🌟",
+    "en": "📖",
+    "pt": "🌿",
+}
+
+# First sentence boundary: a period or a line break followed by more content
+SENTENCE_BOUNDARY_REGEX = re.compile(r"\.(?=\s*\S)|\n(?=\s*\S)")
+
+# Terminal punctuation kept after an appended emoji
+TRAILING_PUNCTUATION_REGEX = re.compile(r"[.!?…]+$")
+
+
+class RepairStep(Protocol):
+    """
+    Interface (protocol) for a single deterministic, local repair.
+
+    Implementations receive the response text and return a fixed version,
+    or None when the step does not apply to that response.
+    """
+
+    name: str
+
+    def apply(self, text: str, lang: str, aborted: bool) -> Optional[str]:
+        ...
+
+
+class CollapseLinesRepair:
+    # Joins a single sentence the model wrapped over several lines
+    name = "collapse_lines"
+
+    def apply(self, text: str, lang: str, aborted: bool) -> Optional[str]:
+        # The text after the break of an aborted stream is an unfinished fragment
+        if aborted or "\n" not in text:
+            return None
+        return " ".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+class FirstSentenceRepair:
+    # Keeps only the text up to the first sentence boundary
+    name = "first_sentence"
+
+    def apply(self, text: str, lang: str, aborted: bool) -> Optional[str]:
+        match = SENTENCE_BOUNDARY_REGEX.search(text)
+        if not match:
+            return None
+
+        end = match.start() + 1 if match.group() == "." else match.start()
+        first = text[:end].strip()
+        return first or None
+
+
+class AppendEmojiRepair:
+    # Adds a per-language emoji before the closing punctuation
+    name = "append_emoji"
+
+    def __init__(self, emojis: Optional[Dict[str, str]] = None):
+        self.emojis = emojis or DEFAULT_EMOJIS
+
+    def apply(self, text: str, lang: str, aborted: bool) -> Optional[str]:
+        if not text or EMOJI_REGEX.search(text):
+            return None
+
+        emoji = self.emojis.get(lang, self.emojis.get("en", "📖"))
+        body = TRAILING_PUNCTUATION_REGEX.sub("", text).rstrip()
+        punctuation = text[len(body):].strip()
+        return f"{body} {emoji}{punctuation}"
+
+
+REPAIRS_ATTEMPTED = REGISTRY.counter(
+    "rag_repair_attempted_total", "Invalid responses handed to the local repair stage."
+)
+REPAIRS_SUCCEEDED = REGISTRY.counter(
+    "rag_repair_repaired_total", "Responses made valid without calling the LLM again."
+)
+REPAIR_STEPS = REGISTRY.counter(
+    "rag_repair_steps_total", "Repair steps used by successful repairs (one repair may chain several).", ("step",)
+)
+LLM_RETRIES_SAVED = REGISTRY.counter(
+    "rag_repair_llm_retries_saved_total", "Local repairs that replaced a pending LLM retry."
+)
+
+
+class ResponseRepairer:
+    """
+    Cheap repair stage that sits between generation and validation.
+
+    Steps are applied cumulatively in order and the response is re-validated
+    after each one, so the first combination that passes the rules wins and
+    the LLM is only called again when no local fix is enough.
+    """
+
+    def __init__(self, steps: Optional[List[RepairStep]] = None):
+        self.steps = steps if steps is not None else [
+            CollapseLinesRepair(),
+            FirstSentenceRepair(),
+            AppendEmojiRepair(),
+        ]
+
+    async def repair(
+        self,
+        response: dict,
+        validator: ValidationRules,
+        detect: Optional[Callable[[str], Awaitable[str]]] = None,
+        retry_pending: bool = True,
+    ) -> Optional[dict]:
+        """
+        Tries to turn an invalid response into a valid one using local fixes only.
+
+        Args:
+            response (dict): The invalid response with 'text' and 'lang' keys.
+            validator (ValidationRules): Rules the repaired response must pass.
+            detect (Callable, optional): Async language detector, used once when the
+                response has no detected language (e.g. an aborted stream).
+            retry_pending (bool): Whether the caller would otherwise retry the LLM.
+
+        Returns:
+            Optional[dict]: The repaired response, or None if it could not be fixed.
+        """
+        REPAIRS_ATTEMPTED.inc()
+        expected_lang = validator.language_validator.expected_lang
+        aborted = bool(response.get("aborted"))
+        text = response.get("text", "")
+        lang = response.get("lang")
+        applied = []
+
+        # No local step can change the language of an answer
+        if lang and lang != expected_lang:
+            return None
+
+        try:
+            for step in self.steps:
+                fixed = step.apply(text, expected_lang, aborted)
+                if fixed is None or fixed == text:
+                    continue
+
+                text = fixed
+                applied.append(step.name)
+
+                # Language is not touched by any step, check the cheap rules first
+                if validator.check_partial(text) or not validator.emoji_validator.is_valid(text):
+                    continue
+
+                # Detect at most once, none of the steps changes the language
+                if not lang and detect:
+                    lang = await detect(text)
+
+                candidate = {"text": text, "lang": lang}
+                if validator.validate(candidate):
+                    self._record(applied, retry_pending)
+                    logger.info("🔧 Response repaired locally", extra={"repairs": applied})
+                    return candidate
+        except Exception as e:
+            logger.error("ResponseRepairer: %s", e)
+
+        return None
+
+    def _record(self, applied: List[str], retry_pending: bool) -> None:
+        REPAIRS_SUCCEEDED.inc()
+        for name in applied:
+            REPAIR_STEPS.inc(step=name)
+        if retry_pending:
+            LLM_RETRIES_SAVED.inc()
@@ -1,22 +1,30 @@
 import re
-from typing import List, Tuple, Dict, Union
+from typing import List, Tuple, Dict, Union, Optional
 from app.interfaces.language_detector import LanguageDetectorInterface
 from app.adapters.langdetect_adapter import LangDetectAdapter
+from app.infrastructure.prompt_catalog import get_prompt_catalog
+from app.infrastructure.logger import get_logger
 
 # Regex to detect any emoji character (covers most Unicode emojis)
 EMOJI_REGEX = re.compile("[\U00010000-\U0010FFFF]", flags=re.UNICODE)
 
+logger = get_logger("validation_rules")
+
 class EmojiValidator:
     # Checks if there's at least one emoji in the string
     def is_valid(self, text: str) -> bool:
         try:
             return bool(EMOJI_REGEX.search(text))
         except Exception as e:
-            print(f"[EmojiValidator ERROR] {e}")
+            logger.error("EmojiValidator: %s", e)
             return False
 
-    def error_message(self) -> str:
-        return "La respuesta debe contener al menos un emoji."
+    # An emoji can always arrive later in the stream, so a partial text never fails
+    def is_violated_partial(self, partial_text: str) -> bool:
+        return False
+
+    def error_message(self, lang: str = "es") -> str:
+        return get_prompt_catalog().feedback("emoji", lang)
 
 
 class SentenceValidator:
@@ -25,11 +33,21 @@ class SentenceValidator:
         try:
             return text.count(".") <= 1 and "\n" not in text
         except Exception as e:
-            print(f"[SentenceValidator ERROR] {e}")
+            logger.error("SentenceValidator: %s", e)
             return False
 
-    def error_message(self) -> str:
-        return "La respuesta debe estar redactada en una sola oración."
+    # Periods only accumulate and the final text is stripped, so an inner newline
+    # or a second period in the partial output can never be valid again
+    def is_violated_partial(self, partial_text: str) -> bool:
+        try:
+            stripped = partial_text.strip()
+            return stripped.count(".") > 1 or "\n" in stripped
+        except Exception as e:
+            logger.error("SentenceValidator: %s", e)
+            return False
+
+    def error_message(self, lang: str = "es") -> str:
+        return get_prompt_catalog().feedback("sentence", lang)
 
 
 class LanguageValidator:
@@ -39,22 +57,28 @@ class LanguageValidator:
 
     def is_valid(self, detected_lang: str) -> bool:
         try:
-            print(f"🧪 Detected lang: {detected_lang} | Expected: {self.expected_lang}")
+            logger.debug("🧪 Detected lang: %s | Expected: %s", detected_lang, self.expected_lang)
             return detected_lang == self.expected_lang
         except Exception as e:
-            print(f"[LanguageValidator ERROR] {e}")
+            logger.error("LanguageValidator: %s", e)
             return False
 
-    def error_message(self) -> str:
-        return f"La respuesta debe estar completamente en {self.expected_lang.upper()}."
+    # The language is only detected on the complete response
+    def is_violated_partial(self, partial_text: str) -> bool:
+        return False
+
+    def error_message(self, lang: str = "es") -> str:
+        return get_prompt_catalog().feedback("language", lang, lang=self.expected_lang.upper())
 
 
 class ValidationRules:
     """
     Applies multiple validation rules to a response dict.
     Each response is expected to contain 'text' and 'lang' keys.
+    Feedback messages are written in feedback_lang (Spanish by default).
     """
-    def __init__(self, expected_lang: str):
+    def __init__(self, expected_lang: str, feedback_lang: str = "es"):
+        self.feedback_lang = feedback_lang
         self.emoji_validator = EmojiValidator()
         self.sentence_validator = SentenceValidator()
         self.language_validator = LanguageValidator(expected_lang)
@@ -74,7 +98,7 @@ class ValidationRules:
                 and self.language_validator.is_valid(lang)
             )
         except Exception as e:
-            print(f"[ValidationRules.validate ERROR] {e}")
+            logger.error("ValidationRules.validate: %s", e)
             return False
 
     def validate_with_feedback(self, response: Union[Dict[str, str], str]) -> Tuple[bool, List[str]]:
@@ -87,16 +111,37 @@ class ValidationRules:
             lang = response.get("lang", "")
 
             if not self.emoji_validator.is_valid(text):
-                errors.append(self.emoji_validator.error_message())
+                errors.append(self.emoji_validator.error_message(self.feedback_lang))
 
             if not self.sentence_validator.is_valid(text):
-                errors.append(self.sentence_validator.error_message())
+                errors.append(self.sentence_validator.error_message(self.feedback_lang))
 
             if not self.language_validator.is_valid(lang):
-                errors.append(self.language_validator.error_message())
+                errors.append(self.language_validator.error_message(self.feedback_lang))
 
         except Exception as e:
-            print(f"[ValidationRules.validate_with_feedback ERROR] {e}")
+            logger.error("ValidationRules.validate_with_feedback: %s", e)
             errors.append(f"Error inesperado: {e}")
 
         return len(errors) == 0, errors
+
+    def check_partial(self, partial_text: str) -> Optional[str]:
+        """
+        Checks a partially generated response while tokens are still arriving.
+
+        Only rules that can be definitely violated by a prefix are reported, so a
+        None result means the stream should keep going, not that it is valid.
+
+        Args:
+            partial_text (str): The text accumulated so far from the stream.
+
+        Returns:
+            Optional[str]: The error message of the first violated rule, or None.
+        """
+        try:
+            for rule in (self.emoji_validator, self.sentence_validator, self.language_validator):
+                if rule.is_violated_partial(partial_text):
+                    return rule.error_message(self.feedback_lang)
+        except Exception as e:
+            logger.error("ValidationRules.check_partial: %s", e)
+        return None
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.settings import get_env
+
+logger = get_logger("admission")
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    "rag_admission_queue_depth", "Requests waiting for a pipeline slot."
+)
+ADMITTED_IN_FLIGHT = REGISTRY.gauge(
+    "rag_admission_in_flight", "Requests currently running the pipeline."
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "rag_admission_wait_seconds", "Time admitted requests waited in the admission queue."
+)
+REJECTED = REGISTRY.counter(
+    "rag_admission_rejected_total", "Requests shed by admission control.", ("reason",)
+)
+FAST_PATH = REGISTRY.counter(
+    "rag_admission_fast_path_total", "Requests answered from the response cache without queueing."
+)
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is shed instead of queued or run.
+
+    Attributes:
+        reason (str): 'queue_full' or 'queue_timeout'.
+        status_code (int): 429 when the queue is full, 503 when the wait timed out.
+        retry_after (int): Seconds the client should wait before retrying.
+    """
+
+    def __init__(self, reason: str, status_code: int, retry_after: int = 1):
+        super().__init__(f"⛔ Server overloaded ({reason}), try again shortly.")
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounds how many requests run the pipeline at once and how many may wait.
+
+    Requests beyond max_concurrency wait in a FIFO queue of at most max_queue
+    entries for up to queue_timeout seconds; anything else is rejected right away,
+    so overload costs a bounded amount of memory and sockets.
+
+    Waiters are plain futures, so the controller is not tied to one event loop.
+    """
+
+    def __init__(self, max_concurrency: int = 32, max_queue: int = 64, queue_timeout: float = 10.0):
+        """
+        Args:
+            max_concurrency (int): Requests allowed to run the pipeline concurrently.
+            max_queue (int): Requests allowed to wait for a slot.
+            queue_timeout (float): Seconds a request may wait before being rejected.
+        """
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_queue = max(max_queue, 0)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        QUEUE_DEPTH.set(len(self._waiters))
+        ADMITTED_IN_FLIGHT.set(self.in_flight)
+
+    def _reject(self, reason: str, status_code: int) -> AdmissionRejected:
+        REJECTED.inc(reason=reason)
+        logger.warning("⛔ Request rejected by admission control", extra={"reason": reason, "in_flight": self.in_flight})
+        return AdmissionRejected(reason, status_code, retry_after=max(int(self.queue_timeout), 1))
+
+    async def acquire(self) -> float:
+        """
+        Takes a pipeline slot, waiting in the queue if needed.
+
+        Returns:
+            float: Seconds spent in the queue.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait timed out.
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self._update_gauges()
+            QUEUE_WAIT.observe(0.0)
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full", 429)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up: pass it on
+                self.release()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self._update_gauges()
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("queue_timeout", 503)
+            raise
+
+        waited = time.perf_counter() - start
+        QUEUE_WAIT.observe(waited)
+        return waited
+
+    def release(self) -> None:
+        """
+        Frees a slot, handing it directly to the oldest waiter if there is one.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self.in_flight -= 1
+        self._update_gauges()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[float]:
+        """
+        Holds a pipeline slot for the duration of the block.
+
+        Yields:
+            float: Seconds spent in the queue.
+        """
+        waited = await self.acquire()
+        try:
+            yield waited
+        finally:
+            self.release()
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    Returns the process-wide controller for /ask, configured from the environment:
+    ADMISSION_MAX_CONCURRENCY (32), ADMISSION_MAX_QUEUE (64) and
+    ADMISSION_QUEUE_TIMEOUT in seconds (10).
+
+    Returns:
+        AdmissionController: The shared controller.
+    """
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController(
+                max_concurrency=int(get_env("ADMISSION_MAX_CONCURRENCY", "32")),
+                max_queue=int(get_env("ADMISSION_MAX_QUEUE", "64")),
+                queue_timeout=float(get_env("ADMISSION_QUEUE_TIMEOUT", "10")),
+            )
+        return _controller
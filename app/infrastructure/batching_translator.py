@@ -0,0 +1,141 @@
+import asyncio
+import threading
+from typing import Dict, List, Literal, Optional, Set, Tuple
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.rate_limiter import run_provider_call
+from app.infrastructure.settings import get_env
+from app.infrastructure.translator import DeepLTranslator
+from app.utils.language_normalizer import LanguageNormalizer
+
+logger = get_logger("batching_translator")
+
+# DeepL accepts at most 50 texts per translate request
+MAX_TEXTS_PER_CALL = 50
+
+BATCH_SIZE = REGISTRY.histogram(
+    "rag_translation_batch_size", "Distinct texts sent per batched DeepL call.", ("target",),
+    buckets=(1, 2, 4, 8, 16, 32, 50),
+)
+TEXTS_SUBMITTED = REGISTRY.counter(
+    "rag_translation_texts_total", "Texts submitted to the batching translator.", ("target",)
+)
+TEXTS_COALESCED = REGISTRY.counter(
+    "rag_translation_texts_coalesced_total", "Texts served by another identical text of the same batch.", ("target",)
+)
+
+PendingText = Tuple[str, asyncio.Future]
+
+
+class BatchingTranslator:
+    """
+    Async wrapper around DeepLTranslator that coalesces concurrent translations.
+
+    Texts for the same (source, target) pair arriving within a short window are
+    sent as one translate_text list call and the results are fanned back out to
+    each caller. Identical texts in a batch are translated (and billed) once.
+    """
+
+    def __init__(self, translator: Optional[DeepLTranslator] = None, window: float = 0.01, max_batch: int = MAX_TEXTS_PER_CALL):
+        """
+        Args:
+            translator (DeepLTranslator, optional): The translator doing the calls.
+            window (float): Seconds to wait for more texts after the first one of a batch.
+            max_batch (int): Distinct texts that flush a batch right away (at most 50).
+        """
+        self.translator = translator or DeepLTranslator()
+        self.window = window
+        self.max_batch = min(max(max_batch, 1), MAX_TEXTS_PER_CALL)
+        self._pending: Dict[Tuple[str, str], List[PendingText]] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        # The loop only keeps weak references to tasks, an in-flight batch must not be collected
+        self._sending: Set[asyncio.Task] = set()
+
+    async def translate_to_spanish(self, text: str, source_lang: str) -> str:
+        source_lang = LanguageNormalizer.normalize(source_lang)
+        if source_lang == "es":
+            return text
+        if source_lang not in DeepLTranslator.LANG_MAP:
+            raise ValueError(f"Unsupported source_lang: {source_lang}")
+        return await self._submit(source_lang, DeepLTranslator.LANG_MAP["es"], text)
+
+    async def translate_from_spanish(self, text: str, target_lang: Literal["es", "en", "pt"]) -> str:
+        target_lang = LanguageNormalizer.normalize(target_lang)
+        if target_lang == "es":
+            return text
+        return await self._submit("es", DeepLTranslator.LANG_MAP[target_lang], text)
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        source_lang = LanguageNormalizer.normalize(source_lang)
+        target_lang = LanguageNormalizer.normalize(target_lang)
+        if source_lang == target_lang:
+            return text
+        return await self._submit(source_lang, DeepLTranslator.LANG_MAP[target_lang], text)
+
+    async def _submit(self, source: str, target: str, text: str) -> str:
+        key = (source, target)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((text, future))
+        TEXTS_SUBMITTED.inc(target=target)
+
+        if len({t for t, _ in batch}) >= self.max_batch:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._send(key, batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, key: Tuple[str, str], batch: List[PendingText]) -> None:
+        target = key[1]
+        unique = list(dict.fromkeys(text for text, _ in batch))
+        BATCH_SIZE.observe(len(unique), target=target)
+        if len(batch) > len(unique):
+            TEXTS_COALESCED.inc(len(batch) - len(unique), target=target)
+
+        try:
+            translations = await run_provider_call("deepl", self.translator.translate_many, unique, target)
+        except Exception as e:
+            logger.error("❌ Batched translation failed: %s", e, extra={"texts": len(unique), "target": target})
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_text = dict(zip(unique, translations))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+
+
+_batcher: Optional[BatchingTranslator] = None
+_batcher_lock = threading.Lock()
+
+
+def get_batching_translator() -> BatchingTranslator:
+    """
+    Returns the process-wide batching translator, configured from the environment:
+    DEEPL_BATCH_WINDOW_MS (10) and DEEPL_BATCH_MAX (50).
+
+    Returns:
+        BatchingTranslator: The shared batcher.
+    """
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = BatchingTranslator(
+                window=float(get_env("DEEPL_BATCH_WINDOW_MS", "10")) / 1000,
+                max_batch=int(get_env("DEEPL_BATCH_MAX", str(MAX_TEXTS_PER_CALL))),
+            )
+        return _batcher
@@ -0,0 +1,261 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Set, Tuple, Union
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.settings import get_env
+
+logger = get_logger("blob_store")
+
+# Values are split on blank lines: prompts separate instructions, context and question that way
+SEGMENT_SEPARATOR = "\n\n"
+
+# Codecs by preference; zstandard ships with chromadb but stays optional
+CODECS = ("zst", "gz", "txt")
+
+Part = Union[str, dict]
+
+
+def _zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+class BlobStore:
+    """
+    Content-addressed storage for large cache bodies.
+
+    Each distinct text is written once, under the SHA-256 of its UTF-8 bytes, so
+    the same context chunk or instruction block referenced by many questions costs
+    its size only once. Bodies of at least compress_min_bytes are compressed with
+    zstd when available, gzip otherwise.
+    """
+
+    # Decoded blobs shared by every store of the process, most recently used last
+    _decoded: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+    _decoded_lock = threading.Lock()
+
+    def __init__(self, directory: str, min_bytes: int = 256, compression: str = "auto", compress_min_bytes: int = 1024, memory_entries: int = 256):
+        """
+        Args:
+            directory (str): Where blob files are written (sharded by hash prefix).
+            min_bytes (int): Segments shorter than this stay inline in the cache entry.
+            compression (str): 'auto', 'zstd', 'gzip' or 'none'.
+            compress_min_bytes (int): Bodies smaller than this are stored uncompressed.
+            memory_entries (int): Decoded blobs kept in memory.
+        """
+        self.directory = directory
+        self.min_bytes = min_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self.memory_entries = memory_entries
+        if compression == "auto":
+            compression = "zstd" if _zstd() else "gzip"
+        self.codec = {"zstd": "zst", "gzip": "gz"}.get(compression, "txt")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.{codec}")
+
+    def put(self, text: str) -> str:
+        """
+        Stores a body unless an identical one already exists, in which case the
+        existing blob is touched so collect() gives the new reference its grace period.
+
+        Args:
+            text (str): The body.
+
+        Returns:
+            str: Its reference (hex SHA-256).
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        for codec in CODECS:
+            try:
+                # A compaction may have read the references before this entry is written
+                os.utime(self._path(digest, codec))
+                return digest
+            except OSError:
+                continue
+
+        codec = self.codec if len(data) >= self.compress_min_bytes else "txt"
+        if codec == "zst":
+            payload = _zstd().ZstdCompressor(level=10).compress(data)
+        elif codec == "gz":
+            payload = gzip.compress(data, mtime=0)
+        else:
+            payload = data
+
+        path = self._path(digest, codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        """
+        Reads a body by reference.
+
+        Args:
+            digest (str): Reference returned by put().
+
+        Returns:
+            Optional[str]: The body, or None if the blob is missing or unreadable.
+        """
+        key = (self.directory, digest)
+        with self._decoded_lock:
+            if key in self._decoded:
+                self._decoded.move_to_end(key)
+                return self._decoded[key]
+
+        for codec in CODECS:
+            try:
+                with open(self._path(digest, codec), "rb") as f:
+                    payload = f.read()
+            except FileNotFoundError:
+                continue
+            try:
+                if codec == "zst":
+                    payload = _zstd().ZstdDecompressor().decompress(payload)
+                elif codec == "gz":
+                    payload = gzip.decompress(payload)
+                text = payload.decode("utf-8")
+            except Exception as e:
+                logger.error("❌ Unreadable cache blob %s: %s", digest, e)
+                return None
+
+            with self._decoded_lock:
+                self._decoded[key] = text
+                while len(self._decoded) > self.memory_entries:
+                    self._decoded.popitem(last=False)
+            return text
+        return None
+
+    def encode(self, value: Any) -> Any:
+        """
+        Moves the large segments of a string value into blobs.
+
+        Args:
+            value (Any): The value about to be cached.
+
+        Returns:
+            Any: {"parts": [...]} where each part is an inline string or {"ref": digest};
+            the value itself when it is not a string or has no large segment.
+        """
+        if not isinstance(value, str) or len(value) < self.min_bytes:
+            return value
+        segments = value.split(SEGMENT_SEPARATOR)
+        parts: List[Part] = [{"ref": self.put(segment)} if len(segment) >= self.min_bytes else segment for segment in segments]
+        return {"parts": parts}
+
+    def decode(self, value: Any) -> Any:
+        """
+        Rebuilds a value written by encode(); other values are returned unchanged.
+
+        Args:
+            value (Any): The cached value.
+
+        Returns:
+            Any: The original value, or None if one of its blobs is gone.
+        """
+        if not is_encoded(value):
+            return value
+        segments = []
+        for part in value["parts"]:
+            segment = self.get(part["ref"]) if isinstance(part, dict) else part
+            if segment is None:
+                return None
+            segments.append(segment)
+        return SEGMENT_SEPARATOR.join(segments)
+
+    def usage(self) -> dict:
+        """
+        Returns:
+            dict: Number of blob files and their total size in bytes.
+        """
+        files, size = 0, 0
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                try:
+                    size += os.path.getsize(os.path.join(root, name))
+                    files += 1
+                except OSError:
+                    pass
+        return {"files": files, "bytes": size}
+
+    def collect(self, referenced: Set[str], grace_seconds: float = 3600.0) -> int:
+        """
+        Deletes blobs no cache entry references any more.
+
+        Blobs younger than the grace period are kept: a writer stores the blob
+        before the entry that references it.
+
+        Args:
+            referenced (Set[str]): Digests still referenced.
+            grace_seconds (float): Minimum age of a deleted blob.
+
+        Returns:
+            int: Number of deleted blobs.
+        """
+        deleted, cutoff = 0, time.time() - grace_seconds
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                digest, _, codec = name.partition(".")
+                path = os.path.join(root, name)
+                if codec not in CODECS or digest in referenced:
+                    continue
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        deleted += 1
+                except OSError:
+                    pass
+        with self._decoded_lock:
+            for key in [k for k in self._decoded if k[0] == self.directory and k[1] not in referenced]:
+                del self._decoded[key]
+        return deleted
+
+
+def is_encoded(value: Any) -> bool:
+    return isinstance(value, dict) and set(value) == {"parts"} and isinstance(value["parts"], list)
+
+
+def referenced_blobs(values: Iterable[Any]) -> Set[str]:
+    """
+    Digests referenced by a sequence of cached values.
+
+    Args:
+        values (Iterable[Any]): Cached values, encoded or not.
+
+    Returns:
+        Set[str]: Referenced digests.
+    """
+    return {part["ref"] for value in values if is_encoded(value) for part in value["parts"] if isinstance(part, dict)}
+
+
+def get_blob_store(cache_dir: str) -> BlobStore:
+    """
+    Returns the blob store of a cache directory, configured from the environment:
+    CACHE_BLOB_MIN_BYTES (256), CACHE_BLOB_COMPRESSION (auto, zstd, gzip or none)
+    and CACHE_BLOB_COMPRESS_MIN_BYTES (1024).
+
+    Args:
+        cache_dir (str): The cache directory; blobs go to its 'blobs' subdirectory.
+
+    Returns:
+        BlobStore: The store.
+    """
+    return BlobStore(
+        os.path.join(cache_dir, "blobs"),
+        min_bytes=int(get_env("CACHE_BLOB_MIN_BYTES", "256")),
+        compression=get_env("CACHE_BLOB_COMPRESSION", "auto"),
+        compress_min_bytes=int(get_env("CACHE_BLOB_COMPRESS_MIN_BYTES", "1024")),
+    )
@@ -1,6 +1,60 @@
 import os
 import json
-from typing import Optional, Any
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple
+from app.infrastructure.cache.policy import CachePolicy, get_cache_policy, namespace_of
+from app.infrastructure.logger import get_logger
+
+logger = get_logger("json_cache")
+
+# Entries are stored as {"value": ..., "created": ts, "accessed": ts, "generation": str};
+# bare values and envelopes without a generation come from older versions
+ENVELOPE_KEYS = {"value", "created", "accessed"}
+
+# Writers of the same file (requests and the compaction job) must not interleave
+_file_locks: Dict[str, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+# Last access per file and key, kept in memory and folded into the file on compaction
+_accessed: Dict[str, Dict[str, float]] = {}
+_accessed_lock = threading.Lock()
+
+# Parsed files, reused while their modification time and size do not change
+_parsed: Dict[str, Tuple[int, int, dict]] = {}
+_parsed_lock = threading.Lock()
+
+
+def _file_lock(file_path: str) -> threading.Lock:
+    with _file_locks_guard:
+        return _file_locks.setdefault(os.path.abspath(file_path), threading.Lock())
+
+
+def _touch(file_path: str, key: str, now: float) -> None:
+    with _accessed_lock:
+        _accessed.setdefault(os.path.abspath(file_path), {})[key] = now
+
+
+def _load(file_path: str) -> dict:
+    # Raises FileNotFoundError and json.JSONDecodeError like json.load on the file
+    stat = os.stat(file_path)
+    path = os.path.abspath(file_path)
+    with _parsed_lock:
+        cached = _parsed.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    with _parsed_lock:
+        _parsed[path] = (stat.st_mtime_ns, stat.st_size, data)
+    return data
+
+
+def _unwrap(entry: Any) -> Tuple[Any, Optional[float], Optional[float], Optional[str]]:
+    # Returns (value, created, accessed, generation); bare values have none of the stamps
+    if isinstance(entry, dict) and ENVELOPE_KEYS <= set(entry) <= ENVELOPE_KEYS | {"generation"}:
+        return entry["value"], entry["created"], entry["accessed"], entry.get("generation")
+    return entry, None, None, None
 
 
 class JsonCache:
@@ -26,7 +80,7 @@ class JsonCache:
             self.cache_dir = cache_dir
             os.makedirs(self.cache_dir, exist_ok=True)
         except Exception as e:
-            print(f"[ERROR] JsonCache.__init__: {e}")
+            logger.error("JsonCache.__init__: %s", e)
 
     def _get_file_path(self, filename: str) -> str:
         """
@@ -41,18 +95,21 @@ class JsonCache:
         try:
             return os.path.join(self.cache_dir, filename)
         except Exception as e:
-            print(f"[ERROR] JsonCache._get_file_path: {e}")
+            logger.error("JsonCache._get_file_path: %s", e)
             return filename  # fallback mínimo para evitar fallos críticos
 
-    def get(self, filename: str, key: str) -> Optional[Any]:
+    def get(self, filename: str, key: str, generation: Optional[str] = None) -> Optional[Any]:
         """
         Retrieves a value from the specified cache file by key.
 
-        Prints a cache hit or miss message based on key availability.
+        Prints a cache hit or miss message based on key availability. Entries older
+        than the namespace TTL count as misses even before compaction removes them.
 
         Args:
             filename (str): Name of the cache file to read from.
             key (str): Key to retrieve from the cache.
+            generation (str, optional): When given, entries stamped with another
+                generation (or none) are stale and count as misses.
 
         Returns:
             Optional[Any]: The cached value if found; otherwise, None.
@@ -60,27 +117,36 @@ class JsonCache:
         try:
             file_path = self._get_file_path(filename)
             if not os.path.exists(file_path):
-                print(f"[CACHE MISS] File not found: {filename}")
+                logger.debug("Cache miss, file not found", extra={"cache_file": filename})
                 return None
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                try:
-                    data = json.load(f)
-                except json.JSONDecodeError:
-                    print(f"[ERROR] JsonCache.get: Corrupted cache file: {filename}")
-                    return None
+            try:
+                data = _load(file_path)
+            except json.JSONDecodeError:
+                logger.error("JsonCache.get: corrupted cache file", extra={"cache_file": filename})
+                return None
+
+            if key not in data:
+                logger.debug("Cache miss", extra={"cache_file": filename, "key": key})
+                return None
 
-            if key in data:
-                print(f"[CACHE HIT] {filename} => {key}")
-            else:
-                print(f"[CACHE MISS] {filename} => {key}")
+            now = time.time()
+            value, created, _, entry_generation = _unwrap(data[key])
+            if get_cache_policy(namespace_of(filename)).expired(created, now):
+                logger.debug("Cache miss, entry expired", extra={"cache_file": filename, "key": key})
+                return None
+            if generation is not None and entry_generation != generation:
+                logger.debug("Cache miss, stale generation", extra={"cache_file": filename, "key": key})
+                return None
 
-            return data.get(key)
+            logger.debug("Cache hit", extra={"cache_file": filename, "key": key})
+            _touch(file_path, key, now)
+            return value
         except Exception as e:
-            print(f"[ERROR] JsonCache.get: {e}")
+            logger.error("JsonCache.get: %s", e)
             return None
 
-    def set(self, filename: str, key: str, value: Any) -> None:
+    def set(self, filename: str, key: str, value: Any, generation: Optional[str] = None) -> None:
         """
         Stores a key-value pair in the specified cache file.
 
@@ -91,23 +157,143 @@ class JsonCache:
             filename (str): Name of the cache file to write to.
             key (str): The key under which the value will be stored.
             value (Any): The value to store.
+            generation (str, optional): Stamp of the inputs the value was derived from.
         """
         try:
             file_path = self._get_file_path(filename)
-            data = {}
-
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    try:
-                        data = json.load(f)
-                    except json.JSONDecodeError:
-                        print(f"[WARN] JsonCache.set: Corrupted file: {filename}. Overwriting.")
+            now = time.time()
 
-            data[key] = value
+            with _file_lock(file_path):
+                data = {}
+                try:
+                    # A copy of the parsed file: readers may be holding the shared one
+                    data = dict(_load(file_path))
+                except FileNotFoundError:
+                    pass
+                except json.JSONDecodeError:
+                    logger.warning("JsonCache.set: corrupted file, overwriting", extra={"cache_file": filename})
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                data[key] = {"value": value, "created": now, "accessed": now}
+                if generation is not None:
+                    data[key]["generation"] = generation
+                self._write(file_path, data)
 
-            print(f"[CACHE WRITE] {filename} => {key}")
+            logger.debug("Cache write", extra={"cache_file": filename, "key": key})
         except Exception as e:
-            print(f"[ERROR] JsonCache.set: {e}")
\ No newline at end of file
+            logger.error("JsonCache.set: %s", e)
+
+    def count(self, filename: str) -> int:
+        """
+        Returns the number of entries in a cache file (0 if it is missing or unreadable).
+
+        Args:
+            filename (str): Name of the cache file.
+
+        Returns:
+            int: Number of stored keys.
+        """
+        try:
+            return len(_load(self._get_file_path(filename)))
+        except Exception:
+            return 0
+
+    def values(self, filename: str) -> List[Any]:
+        """
+        Returns every stored value of a cache file, whatever its age or generation.
+
+        Args:
+            filename (str): Name of the cache file.
+
+        Returns:
+            List[Any]: The values, empty if the file is missing or unreadable.
+        """
+        try:
+            return [_unwrap(entry)[0] for entry in _load(self._get_file_path(filename)).values()]
+        except Exception:
+            return []
+
+    def _write(self, file_path: str, data: dict) -> None:
+        # Written to a temporary file and renamed, so readers never see a partial file
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            # The rename keeps the modification time, so the next _load reuses data as is
+            stat = os.fstat(f.fileno())
+        os.replace(tmp_path, file_path)
+        with _parsed_lock:
+            _parsed[os.path.abspath(file_path)] = (stat.st_mtime_ns, stat.st_size, data)
+
+    def compact(
+        self,
+        filename: str,
+        policy: Optional[CachePolicy] = None,
+        now: Optional[float] = None,
+        generation: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Applies the namespace lifecycle policy to one cache file.
+
+        Stale-generation and expired entries are dropped first, then the least
+        recently accessed ones until the entry and byte limits hold. Bare values of
+        older files get an envelope dated with the file modification time.
+
+        Args:
+            filename (str): Name of the cache file to compact.
+            policy (CachePolicy, optional): Limits to apply, the namespace policy by default.
+            now (float, optional): Current time, for tests.
+            generation (str, optional): Current generation; entries of any other are dropped.
+
+        Returns:
+            Dict[str, int]: Entries and bytes kept, and entries 'stale', 'expired' and 'evicted'.
+        """
+        file_path = self._get_file_path(filename)
+        policy = policy or get_cache_policy(namespace_of(filename))
+        now = time.time() if now is None else now
+        result = {"entries": 0, "bytes": 0, "stale": 0, "expired": 0, "evicted": 0}
+        if not os.path.exists(file_path):
+            return result
+
+        with _file_lock(file_path):
+            with open(file_path, "r", encoding="utf-8") as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    logger.warning("JsonCache.compact: corrupted file, dropping it", extra={"cache_file": filename})
+                    data = {}
+            with _accessed_lock:
+                accessed = _accessed.pop(os.path.abspath(file_path), {})
+            file_time = os.path.getmtime(file_path)
+
+            entries = {}
+            for key, entry in data.items():
+                value, created, last_access, entry_generation = _unwrap(entry)
+                created = created if created is not None else file_time
+                last_access = max(last_access or created, accessed.get(key, 0.0))
+                if generation is not None and entry_generation != generation:
+                    result["stale"] += 1
+                    continue
+                if policy.expired(created, now):
+                    result["expired"] += 1
+                    continue
+                entries[key] = {"value": value, "created": created, "accessed": last_access}
+                if entry_generation is not None:
+                    entries[key]["generation"] = entry_generation
+
+            # Least recently accessed first
+            sizes = {key: len(json.dumps({key: entry}, ensure_ascii=False, indent=2).encode("utf-8")) for key, entry in entries.items()}
+            total = sum(sizes.values())
+            for key in sorted(entries, key=lambda k: entries[k]["accessed"]):
+                if (not policy.max_entries or len(entries) <= policy.max_entries) and (not policy.max_bytes or total <= policy.max_bytes):
+                    break
+                total -= sizes[key]
+                del entries[key]
+                result["evicted"] += 1
+
+            self._write(file_path, entries)
+
+        result["entries"] = len(entries)
+        result["bytes"] = os.path.getsize(file_path)
+        if result["stale"] or result["expired"] or result["evicted"]:
+            logger.info("🧹 Cache compacted", extra={"cache_file": filename, **result})
+        return result
\ No newline at end of file
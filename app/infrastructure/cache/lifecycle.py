@@ -0,0 +1,184 @@
+import asyncio
+import glob
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from app.infrastructure.cache.blob_store import get_blob_store, referenced_blobs
+from app.infrastructure.cache.json_cache import JsonCache
+from app.infrastructure.cache.policy import get_cache_policy, namespace_of
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import CACHE_LOOKUPS, REGISTRY
+from app.infrastructure.settings import get_env
+
+logger = get_logger("cache_lifecycle")
+
+EVICTIONS = REGISTRY.counter(
+    "rag_cache_evictions_total", "Cache entries removed by compaction, per namespace and reason (stale, expired or capacity).", ("namespace", "reason")
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    "rag_cache_entries", "Entries per cache namespace after the last compaction.", ("namespace",)
+)
+CACHE_BYTES = REGISTRY.gauge(
+    "rag_cache_bytes", "Size on disk per cache namespace after the last compaction.", ("namespace",)
+)
+BLOBS_COLLECTED = REGISTRY.counter(
+    "rag_cache_blobs_collected_total", "Blobs deleted by compaction because no cache entry referenced them."
+)
+
+
+class CacheCompactor:
+    """
+    Background job enforcing the cache lifecycle policies.
+
+    Every interval it compacts each JSON file of the cache directory with the
+    policy of its namespace (see JsonCache.compact) and records the outcome.
+    Entries of an older generation are garbage-collected on the way, then the
+    blobs no remaining entry references.
+    """
+
+    def __init__(self, cache_dir: str = "./cache", interval: float = 300.0, generations: Optional[Callable[[], Dict[str, str]]] = None):
+        """
+        Args:
+            cache_dir (str): Directory of the cache files.
+            interval (float): Seconds between compactions; 0 disables the background job.
+            generations (Callable, optional): Returns the current generation per namespace.
+        """
+        self.cache = JsonCache(cache_dir)
+        self.blobs = get_blob_store(cache_dir)
+        self.interval = interval
+        self.generations = generations
+        self.last_run: Optional[float] = None
+        self.last_results: Dict[str, Dict[str, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def namespaces(self) -> Dict[str, str]:
+        # namespace -> filename, for every cache file on disk
+        files = glob.glob(os.path.join(self.cache.cache_dir, "*.json"))
+        return {namespace_of(os.path.basename(path)): os.path.basename(path) for path in sorted(files)}
+
+    def run_once(self) -> Dict[str, Dict[str, int]]:
+        """
+        Compacts every namespace once.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Compaction result per namespace.
+        """
+        results = {}
+        generations = self._current_generations()
+        for namespace, filename in self.namespaces().items():
+            try:
+                result = self.cache.compact(filename, get_cache_policy(namespace), generation=generations.get(namespace))
+            except Exception as e:
+                logger.error("❌ Cache compaction failed: %s", e, extra={"cache_file": filename})
+                continue
+            EVICTIONS.inc(result["stale"], namespace=namespace, reason="stale")
+            EVICTIONS.inc(result["expired"], namespace=namespace, reason="expired")
+            EVICTIONS.inc(result["evicted"], namespace=namespace, reason="capacity")
+            CACHE_ENTRIES.set(result["entries"], namespace=namespace)
+            CACHE_BYTES.set(result["bytes"], namespace=namespace)
+            results[namespace] = result
+
+        try:
+            referenced = referenced_blobs(value for filename in self.namespaces().values() for value in self.cache.values(filename))
+            collected = self.blobs.collect(referenced)
+            BLOBS_COLLECTED.inc(collected)
+            if collected:
+                logger.info("🧹 Cache blobs collected", extra={"blobs": collected})
+        except Exception as e:
+            logger.error("❌ Cache blob collection failed: %s", e)
+        self.last_run, self.last_results = time.time(), results
+        return results
+
+    def _current_generations(self) -> Dict[str, str]:
+        if self.generations is None:
+            return {}
+        try:
+            return self.generations()
+        except Exception as e:
+            # Without generations nothing is dropped as stale, the other limits still apply
+            logger.error("❌ Failed to compute cache generations: %s", e)
+            return {}
+
+    async def run_forever(self) -> None:
+        while True:
+            # File I/O stays off the event loop
+            await asyncio.to_thread(self.run_once)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> Optional[asyncio.Task]:
+        """
+        Starts the background job, once; must be called from a running event loop.
+
+        Returns:
+            Optional[asyncio.Task]: The job task, or None when the interval is 0.
+        """
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> dict:
+        """
+        Size, hit ratio and evictions per namespace, for the /cache/stats route.
+
+        Hits, misses and evictions count since the process started; entries and
+        bytes are read from disk.
+
+        Returns:
+            dict: Per-namespace stats, blob usage and the time of the last compaction.
+        """
+        namespaces = {}
+        generations = self._current_generations()
+        for namespace, filename in self.namespaces().items():
+            hits = CACHE_LOOKUPS.value(namespace=namespace, result="hit")
+            misses = CACHE_LOOKUPS.value(namespace=namespace, result="miss")
+            namespaces[namespace] = {
+                "entries": self.cache.count(filename),
+                "bytes": os.path.getsize(os.path.join(self.cache.cache_dir, filename)),
+                "hits": int(hits),
+                "misses": int(misses),
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+                "generation": generations.get(namespace),
+                "evictions": {
+                    "stale": int(EVICTIONS.value(namespace=namespace, reason="stale")),
+                    "expired": int(EVICTIONS.value(namespace=namespace, reason="expired")),
+                    "capacity": int(EVICTIONS.value(namespace=namespace, reason="capacity")),
+                },
+                "policy": get_cache_policy(namespace).as_dict(),
+            }
+        return {
+            "namespaces": namespaces,
+            "blobs": self.blobs.usage(),
+            "last_compaction": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.last_run)) if self.last_run else None,
+        }
+
+
+_compactor: Optional[CacheCompactor] = None
+_compactor_lock = threading.Lock()
+
+
+def get_cache_compactor(cache_dir: str = "./cache", generations: Optional[Callable[[], Dict[str, str]]] = None) -> CacheCompactor:
+    """
+    Returns the process-wide compactor; CACHE_COMPACTION_INTERVAL sets the seconds
+    between runs (300, 0 disables the background job).
+
+    Args:
+        cache_dir (str): Directory of the cache files.
+        generations (Callable, optional): Current generation per namespace, used
+            by the first call that creates the compactor.
+
+    Returns:
+        CacheCompactor: The shared compactor.
+    """
+    global _compactor
+    with _compactor_lock:
+        if _compactor is None:
+            _compactor = CacheCompactor(cache_dir, float(get_env("CACHE_COMPACTION_INTERVAL", "300")), generations)
+        return _compactor
@@ -0,0 +1,60 @@
+from functools import lru_cache
+from typing import Optional
+
+from app.infrastructure.settings import get_env
+
+
+class CachePolicy:
+    """
+    Lifecycle limits of one cache namespace (one JSON file).
+
+    A limit of 0 means unlimited.
+
+    Attributes:
+        max_entries (int): Entries kept; the least recently accessed are evicted first.
+        max_bytes (int): Serialized size kept, evicting in the same order.
+        ttl_seconds (float): Age after which an entry is no longer served and gets dropped.
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0, ttl_seconds: float = 0):
+        self.max_entries = max(max_entries, 0)
+        self.max_bytes = max(max_bytes, 0)
+        self.ttl_seconds = max(ttl_seconds, 0)
+
+    def expired(self, created: Optional[float], now: float) -> bool:
+        return bool(self.ttl_seconds) and created is not None and now - created > self.ttl_seconds
+
+    def as_dict(self) -> dict:
+        return {"max_entries": self.max_entries, "max_bytes": self.max_bytes, "ttl_seconds": self.ttl_seconds}
+
+
+def namespace_of(filename: str) -> str:
+    # 'translated_questions.json' -> 'translated_questions'
+    return filename[:-5] if filename.endswith(".json") else filename
+
+
+@lru_cache(maxsize=None)
+def get_cache_policy(namespace: str) -> CachePolicy:
+    """
+    Reads the policy of a namespace from the environment.
+
+    CACHE_<NAMESPACE>_MAX_ENTRIES, CACHE_<NAMESPACE>_MAX_BYTES and
+    CACHE_<NAMESPACE>_TTL_SECONDS override the defaults CACHE_MAX_ENTRIES (10000),
+    CACHE_MAX_BYTES (20 MB) and CACHE_TTL_SECONDS (0, never expire).
+
+    Args:
+        namespace (str): Cache namespace, e.g. 'responses'.
+
+    Returns:
+        CachePolicy: The namespace limits.
+    """
+    prefix = f"CACHE_{namespace.upper()}_"
+
+    def read(name: str, default: str) -> str:
+        return get_env(prefix + name) or get_env(f"CACHE_{name}", default)
+
+    return CachePolicy(
+        max_entries=int(read("MAX_ENTRIES", "10000")),
+        max_bytes=int(read("MAX_BYTES", "20000000")),
+        ttl_seconds=float(read("TTL_SECONDS", "0")),
+    )
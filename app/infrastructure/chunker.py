@@ -1,4 +1,7 @@
 from typing import List
+from app.infrastructure.logger import get_logger
+
+logger = get_logger("chunker")
 
 def chunk_text(text: str) -> List[str]:
     """
@@ -23,5 +26,5 @@ def chunk_text(text: str) -> List[str]:
         return paragraphs
 
     except Exception as e:
-        print(f"❌ Error while chunking text: {e}")
+        logger.error("❌ Error while chunking text: %s", e)
         return []
@@ -0,0 +1,188 @@
+import re
+import threading
+from typing import List, Optional, Set
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.settings import get_env
+
+logger = get_logger("context_assembler")
+
+PROMPT_TOKENS = REGISTRY.histogram(
+    "rag_prompt_tokens", "Estimated tokens of each prompt sent to the LLM, retries included.",
+    buckets=(64, 128, 256, 384, 512, 768, 1024, 1536, 2048, 4096),
+)
+CONTEXT_CHUNKS = REGISTRY.histogram(
+    "rag_context_chunks", "Chunks packed into the context of a request.",
+    buckets=(1, 2, 3, 4, 5, 8, 10),
+)
+NEAR_DUPLICATES = REGISTRY.counter(
+    "rag_context_near_duplicates_total", "Retrieved chunks dropped as near-duplicates of a better ranked one."
+)
+
+# Chunks are single paragraphs, so a blank line separates them unambiguously
+CHUNK_SEPARATOR = "\n\n"
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local estimate of the tokens a subword tokenizer produces for a text.
+
+    Every punctuation mark or symbol counts as one token and every word as one
+    token per started 6 characters, which slightly overestimates Cohere's
+    multilingual tokenizer on Spanish, English and Portuguese prose. No provider
+    call is needed.
+
+    Args:
+        text (str): Any text.
+
+    Returns:
+        int: Estimated token count.
+    """
+    return sum(1 + (len(piece) - 1) // 6 for piece in _TOKEN.findall(text))
+
+
+def _shingles(text: str, size: int = 3) -> Set[str]:
+    words = [w.lower() for w in re.findall(r"\w+", text)]
+    if len(words) < size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """
+    Cuts a text to fit a token budget, at a sentence boundary when one fits.
+
+    Args:
+        text (str): The text.
+        budget (int): Tokens available.
+
+    Returns:
+        str: The longest prefix of whole sentences that fits, or of whole words
+        when not even the first sentence does.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    kept, used = [], 0
+    for sentence in _SENTENCE_END.split(text):
+        tokens = estimate_tokens(sentence)
+        if used + tokens > budget:
+            break
+        kept.append(sentence)
+        used += tokens
+    if kept:
+        return " ".join(kept)
+
+    words, used = [], 0
+    for word in text.split():
+        used += estimate_tokens(word)
+        if used > budget:
+            break
+        words.append(word)
+    return " ".join(words)
+
+
+def pack_chunks(chunks: List[str], budget: int) -> List[str]:
+    """
+    Keeps the best ranked chunks that fit a token budget.
+
+    Chunks are taken in rank order, each one that still fits whole is kept; a first
+    chunk larger than the budget is truncated instead, so the prompt never loses
+    its context entirely.
+
+    Args:
+        chunks (List[str]): Chunks, best first.
+        budget (int): Tokens available for the context; 0 or less means unlimited.
+
+    Returns:
+        List[str]: The chunks to use, in the same order.
+    """
+    if budget <= 0:
+        return list(chunks)
+    packed, used = [], 0
+    for chunk in chunks:
+        tokens = estimate_tokens(chunk)
+        if used + tokens <= budget:
+            packed.append(chunk)
+            used += tokens
+        elif not packed:
+            packed.append(truncate_to_tokens(chunk, budget))
+            break
+    return packed
+
+
+class ContextAssembler:
+    """
+    Builds the context of a request from the retrieved candidates.
+
+    Candidates arrive best first. Near-duplicates of a better ranked candidate
+    (overlapping word trigrams above the similarity threshold) are dropped, then
+    the rest is packed into the context token budget and joined with blank lines.
+    The prompt builder enforces the overall prompt budget again, after translation.
+
+    Attributes:
+        top_k (int): Candidates to retrieve.
+        budget (int): Context token budget; 0 means unlimited.
+        similarity (float): Jaccard similarity from which two chunks are near-duplicates.
+    """
+
+    def __init__(self, top_k: int = 3, budget: int = 400, similarity: float = 0.8):
+        self.top_k = max(top_k, 1)
+        self.budget = budget
+        self.similarity = similarity
+
+    def deduplicate(self, candidates: List[str]) -> List[str]:
+        kept, kept_shingles = [], []
+        for candidate in candidates:
+            if not candidate or not candidate.strip():
+                continue
+            shingles = _shingles(candidate)
+            if any(len(shingles & other) / len(shingles | other) >= self.similarity for other in kept_shingles):
+                NEAR_DUPLICATES.inc()
+                continue
+            kept.append(candidate)
+            kept_shingles.append(shingles)
+        return kept
+
+    def assemble(self, candidates: List[str]) -> str:
+        """
+        Args:
+            candidates (List[str]): Retrieved chunks, best first.
+
+        Returns:
+            str: The context, empty when there is no candidate.
+        """
+        chunks = pack_chunks(self.deduplicate(candidates[: self.top_k]), self.budget)
+        CONTEXT_CHUNKS.observe(len(chunks))
+        logger.debug("🧩 Context assembled", extra={"candidates": len(candidates), "chunks": len(chunks)})
+        return CHUNK_SEPARATOR.join(chunks)
+
+    def version(self) -> str:
+        # Part of the cache generations: another configuration assembles other contexts
+        return f"top{self.top_k}-budget{self.budget}-sim{self.similarity}"
+
+
+_assembler: Optional[ContextAssembler] = None
+_assembler_lock = threading.Lock()
+
+
+def get_context_assembler() -> ContextAssembler:
+    """
+    Returns the process-wide assembler, configured from the environment:
+    CONTEXT_TOP_K (3), CONTEXT_TOKEN_BUDGET (400) and CONTEXT_DUPLICATE_SIMILARITY (0.8).
+
+    Returns:
+        ContextAssembler: The shared assembler.
+    """
+    global _assembler
+    with _assembler_lock:
+        if _assembler is None:
+            _assembler = ContextAssembler(
+                top_k=int(get_env("CONTEXT_TOP_K", "3")),
+                budget=int(get_env("CONTEXT_TOKEN_BUDGET", "400")),
+                similarity=float(get_env("CONTEXT_DUPLICATE_SIMILARITY", "0.8")),
+            )
+        return _assembler
@@ -1,5 +1,3 @@
-import docx
-
 def load_text_file(path: str) -> str:
     """
     Loads the content of a text or DOCX file from the given path.
@@ -17,6 +15,8 @@ def load_text_file(path: str) -> str:
     try:
         if path.endswith(".docx"):
             # Read DOCX file and extract non-empty paragraphs
+            import docx
+
             doc = docx.Document(path)
             return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
 
@@ -0,0 +1,266 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.settings import get_env
+
+logger = get_logger("hedging")
+
+HEDGES_SENT = REGISTRY.counter(
+    "rag_hedged_requests_total", "Duplicate provider calls sent because the first one was slow.", ("operation",)
+)
+HEDGE_WINS = REGISTRY.counter(
+    "rag_hedge_wins_total", "Which attempt answered first when a call was hedged.", ("operation", "winner")
+)
+
+# An attempt receives a cancel event it should poll, so the losing stream can be closed
+Attempt = Callable[[threading.Event], Any]
+
+
+class AttemptCancelled(Exception):
+    """
+    Raised by an attempt that sees its cancel event before calling the provider.
+    """
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent call durations, used to pick the hedge delay.
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+
+class HedgingPolicy:
+    """
+    When to send a duplicate call and how many duplicates traffic can afford.
+
+    A duplicate is sent once the first attempt has run longer than the given
+    percentile of recent latencies, only after enough samples were seen, and only
+    while duplicates stay under budget_pct of all calls.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 95.0,
+        budget_pct: float = 5.0,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        tracker: Optional[LatencyTracker] = None,
+    ):
+        """
+        Args:
+            enabled (bool): Whether hedging is active at all.
+            percentile (float): Latency percentile after which the duplicate is sent.
+            budget_pct (float): Maximum duplicates, as a percentage of calls.
+            min_samples (int): Latencies needed before the percentile is trusted.
+            min_delay (float): Lower bound of the hedge delay in seconds.
+            tracker (LatencyTracker, optional): Shared latency window.
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget_pct = budget_pct
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.tracker = tracker or LatencyTracker()
+        self.calls = 0
+        self.hedges = 0
+
+    def delay(self) -> Optional[float]:
+        """
+        Seconds to wait before hedging, or None when hedging should not happen.
+        """
+        if not self.enabled or len(self.tracker) < self.min_samples:
+            return None
+        return max(self.tracker.percentile(self.percentile), self.min_delay)
+
+    def try_spend(self) -> bool:
+        """
+        Reserves one duplicate call if the budget allows it.
+        """
+        if self.hedges + 1 > self.calls * self.budget_pct / 100:
+            return False
+        self.hedges += 1
+        return True
+
+
+class _StreamError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_STREAM_END = object()
+
+
+def cancellable(stream: Iterable, cancel: threading.Event, poll: float = 0.05) -> Iterator:
+    """
+    Iterates a blocking stream from a reader thread, so the attempt consuming it
+    returns within poll seconds of its cancel event being set, even while the
+    stream is stalled. The attempt then frees its worker thread and its limiter
+    slot; the reader closes the stream as soon as its pending read returns.
+
+    Args:
+        stream (Iterable): The provider stream; closed when done if it has close().
+        cancel (threading.Event): The attempt's cancel event.
+        poll (float): Seconds between cancel checks while no item arrives.
+
+    Yields:
+        Any: The items of the stream, until it ends or cancel is set.
+
+    Raises:
+        Exception: Whatever iterating the stream raised.
+    """
+    items: queue.Queue = queue.Queue()
+    stop = threading.Event()
+
+    def read() -> None:
+        try:
+            for item in stream:
+                if stop.is_set() or cancel.is_set():
+                    break
+                items.put(item)
+        except BaseException as e:
+            items.put(_StreamError(e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                try:
+                    # Closing the stream releases the HTTP connection, so no more tokens are billed
+                    close()
+                except Exception as e:
+                    logger.debug("Closing an abandoned stream failed: %s", e)
+            items.put(_STREAM_END)
+
+    threading.Thread(target=read, name="stream-reader", daemon=True).start()
+    try:
+        while not cancel.is_set():
+            try:
+                item = items.get(timeout=poll)
+            except queue.Empty:
+                continue
+            if item is _STREAM_END:
+                return
+            if isinstance(item, _StreamError):
+                raise item.error
+            yield item
+    finally:
+        # Also reached when the consumer stops early, e.g. on an aborted answer
+        stop.set()
+
+
+def _timed(attempt: Attempt, cancel: threading.Event) -> tuple:
+    start = time.perf_counter()
+    result = attempt(cancel)
+    return result, time.perf_counter() - start
+
+
+async def hedged_call(
+    attempt: Attempt,
+    policy: HedgingPolicy,
+    operation: str = "generate",
+    run: Optional[Callable[..., Awaitable[Any]]] = None,
+    completed: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """
+    Runs attempt in a worker thread and, if it is slower than the policy's delay,
+    races it against a duplicate. The first successful result wins and the other
+    attempt is told to stop through its cancel event.
+
+    Args:
+        attempt (Attempt): The blocking call; must be safe to run twice (e.g. temperature 0).
+        policy (HedgingPolicy): Delay and budget.
+        operation (str): Operation label for metrics.
+        run (Callable, optional): Runs a blocking call off the loop, asyncio.to_thread
+            by default (see run_provider_call).
+        completed (Callable, optional): Tells whether a result ran to the end; the latency
+            of a result it rejects (e.g. an aborted stream) is not recorded.
+
+    Returns:
+        Any: The result of the first attempt that succeeds.
+
+    Raises:
+        Exception: The error of the last attempt, when every attempt fails.
+    """
+    run = run or asyncio.to_thread
+    policy.calls += 1
+    cancels = [threading.Event()]
+    tasks = [asyncio.create_task(run(_timed, attempt, cancels[0]))]
+
+    delay = policy.delay()
+    if delay is not None:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done and policy.try_spend():
+            logger.info("🐢 %s slower than %.0f ms, sending a hedged request", operation, delay * 1000)
+            HEDGES_SENT.inc(operation=operation)
+            cancels.append(threading.Event())
+            tasks.append(asyncio.create_task(run(_timed, attempt, cancels[1])))
+
+    pending = set(tasks)
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                    continue
+                result, seconds = task.result()
+                # A stream cut short would drag the hedge delay down
+                if completed is None or completed(result):
+                    policy.tracker.observe(seconds)
+                if len(tasks) > 1:
+                    HEDGE_WINS.inc(operation=operation, winner="primary" if task is tasks[0] else "hedge")
+                return result
+        raise error
+    finally:
+        # Losers stop at their next cancel check (see cancellable); their threads finish in the background
+        for cancel in cancels:
+            cancel.set()
+        for task in tasks:
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+_policy: Optional[HedgingPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_hedging_policy() -> HedgingPolicy:
+    """
+    Returns the process-wide LLM hedging policy, configured from the environment:
+    LLM_HEDGING (1 to enable, off by default), LLM_HEDGE_PERCENTILE (95),
+    LLM_HEDGE_BUDGET_PCT (5), LLM_HEDGE_MIN_SAMPLES (20) and LLM_HEDGE_MIN_DELAY_MS (50).
+
+    Returns:
+        HedgingPolicy: The shared policy.
+    """
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = HedgingPolicy(
+                enabled=get_env("LLM_HEDGING", "0") == "1",
+                percentile=float(get_env("LLM_HEDGE_PERCENTILE", "95")),
+                budget_pct=float(get_env("LLM_HEDGE_BUDGET_PCT", "5")),
+                min_samples=int(get_env("LLM_HEDGE_MIN_SAMPLES", "20")),
+                min_delay=float(get_env("LLM_HEDGE_MIN_DELAY_MS", "50")) / 1000,
+            )
+        return _policy
@@ -0,0 +1,354 @@
+"""
+Compact binary snapshot of the vector index, for shipping it to new nodes.
+
+One file holds everything a search needs, 64-byte aligned sections after a fixed header:
+
+    header     magic, version, count, dim and the offset/length of each section
+    vectors    float32[count, dim], row-major, contiguous
+    norms      float32[count], L2 norm of each vector
+    offsets    uint64[count + 1], byte offsets of each chunk inside the text blob
+    text       UTF-8 chunks, concatenated
+    manifest   JSON: ids, metadatas, distance space, collection name and document version
+
+Opening a snapshot only maps the file, so it takes milliseconds and every worker
+process shares the same page-cache pages. Usage:
+
+    python -m app.infrastructure.index_snapshot export --output data/index.snapshot
+    python -m app.infrastructure.index_snapshot import data/index.snapshot --chroma-path data/chroma_db
+    python -m app.infrastructure.index_snapshot info data/index.snapshot
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from app.infrastructure.logger import get_logger
+
+# numpy comes with chromadb but is only needed once a snapshot is used
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = get_logger("index_snapshot")
+
+MAGIC = b"RAGSNAP\x00"
+VERSION = 1
+ALIGNMENT = 64
+# magic, version, count, dim, then (offset, length) of vectors, norms, offsets, text and manifest
+HEADER = struct.Struct("<8sIII" + "QQ" * 5)
+SPACES = ("l2", "cosine", "ip")
+
+
+class SnapshotError(Exception):
+    """
+    Raised when a snapshot file is missing, truncated or of an unknown format.
+    """
+    pass
+
+
+def _pad(f, alignment: int = ALIGNMENT) -> int:
+    # Pads the file to the next aligned offset and returns it
+    position = f.tell()
+    padding = -position % alignment
+    if padding:
+        f.write(b"\x00" * padding)
+    return position + padding
+
+
+def write_snapshot(
+    path: str,
+    ids: List[str],
+    documents: List[str],
+    embeddings: Iterable[Iterable[float]],
+    metadatas: Optional[List[Optional[dict]]] = None,
+    space: str = "l2",
+    collection_name: str = "documentos",
+    source_version: Optional[str] = None,
+) -> None:
+    """
+    Writes a snapshot atomically (to a temporary file renamed over the target).
+
+    Args:
+        path (str): Destination file.
+        ids (List[str]): Chunk ids, in vector order.
+        documents (List[str]): Chunk texts.
+        embeddings (Iterable[Iterable[float]]): One vector per chunk, all of the same dimension.
+        metadatas (List[dict], optional): Per-chunk metadata (None entries allowed).
+        space (str): Distance reported by searches: 'l2' (squared, as Chroma), 'cosine' or 'ip'.
+        collection_name (str): Name recorded in the manifest.
+        source_version (str, optional): Version of the document the chunks come from.
+
+    Raises:
+        ValueError: If the inputs do not line up or the space is unknown.
+    """
+    import numpy as np
+
+    if space not in SPACES:
+        raise ValueError(f"❌ Unknown distance space: {space}")
+    vectors = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+    if vectors.size == 0:
+        vectors = vectors.reshape(0, 0)
+    if vectors.ndim != 2 or not (len(ids) == len(documents) == vectors.shape[0]):
+        raise ValueError("❌ ids, documents and embeddings must have the same length")
+    metadatas = list(metadatas) if metadatas is not None else [None] * len(ids)
+
+    encoded = [document.encode("utf-8") for document in documents]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    offsets[1:] = np.cumsum([len(chunk) for chunk in encoded], dtype=np.uint64)
+    manifest = json.dumps({
+        "collection": collection_name,
+        "space": space,
+        "ids": list(ids),
+        "metadatas": metadatas,
+        "source_version": source_version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }, ensure_ascii=False).encode("utf-8")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"\x00" * HEADER.size)
+        sections = []
+        for payload in (vectors.tobytes(), np.linalg.norm(vectors, axis=1).astype(np.float32).tobytes(),
+                        offsets.tobytes(), b"".join(encoded), manifest):
+            sections.extend((_pad(f), len(payload)))
+            f.write(payload)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, vectors.shape[0], vectors.shape[1], *sections))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    logger.info("💾 Index snapshot written", extra={"path": path, "chunks": len(ids), "bytes": os.path.getsize(path)})
+
+
+class Snapshot:
+    """
+    Read-only view over a snapshot file, backed by a shared memory map.
+
+    Attributes:
+        count (int): Number of chunks.
+        dim (int): Embedding dimension.
+        vectors (np.ndarray): float32[count, dim] view into the mapped file.
+        norms (np.ndarray): float32[count] vector norms.
+        ids (List[str]): Chunk ids.
+        metadatas (List[Optional[dict]]): Per-chunk metadata.
+        space (str): Distance space of the searches.
+        collection_name (str): Collection the snapshot was exported from.
+        source_version (Optional[str]): Version of the document the chunks come from.
+    """
+
+    def __init__(self, path: str):
+        """
+        Maps the file; no vector or text is read until it is used.
+
+        Args:
+            path (str): Snapshot file.
+
+        Raises:
+            SnapshotError: If the file is missing or not a valid snapshot.
+        """
+        import numpy as np
+
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"❌ Cannot open index snapshot {path}: {e}")
+
+        if len(self._mmap) < HEADER.size:
+            raise SnapshotError(f"❌ Index snapshot {path} is truncated")
+        magic, version, self.count, self.dim, *sections = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"❌ {path} is not a version {VERSION} index snapshot")
+        (vec_off, _), (norm_off, _), (offs_off, _), (text_off, text_len), (man_off, man_len) = zip(sections[::2], sections[1::2])
+        if man_off + man_len > len(self._mmap):
+            raise SnapshotError(f"❌ Index snapshot {path} is truncated")
+
+        self.vectors = np.frombuffer(self._mmap, dtype=np.float32, count=self.count * self.dim, offset=vec_off).reshape(self.count, self.dim)
+        self.norms = np.frombuffer(self._mmap, dtype=np.float32, count=self.count, offset=norm_off)
+        self._offsets = np.frombuffer(self._mmap, dtype=np.uint64, count=self.count + 1, offset=offs_off)
+        self._text_offset = text_off
+
+        manifest = json.loads(self._mmap[man_off:man_off + man_len].decode("utf-8"))
+        self.ids: List[str] = manifest["ids"]
+        self.metadatas: List[Optional[dict]] = manifest["metadatas"]
+        self.space: str = manifest["space"]
+        self.collection_name: str = manifest["collection"]
+        self.source_version: Optional[str] = manifest.get("source_version")
+        self.created_at: Optional[str] = manifest.get("created_at")
+
+    def document(self, index: int) -> str:
+        """
+        Decodes one chunk from the text blob.
+
+        Args:
+            index (int): Chunk position.
+
+        Returns:
+            str: The chunk text.
+        """
+        start = self._text_offset + int(self._offsets[index])
+        end = self._text_offset + int(self._offsets[index + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def distances(self, query_vector: List[float]) -> "np.ndarray":
+        """
+        Distance of the query to every vector, in the snapshot's space.
+
+        Args:
+            query_vector (List[float]): Query embedding.
+
+        Returns:
+            np.ndarray: float32[count], smaller is closer.
+
+        Raises:
+            ValueError: If the query dimension does not match.
+        """
+        import numpy as np
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape != (self.dim,):
+            raise ValueError(f"❌ Query has dimension {query.size}, the snapshot has {self.dim}")
+
+        dots = self.vectors @ query
+        if self.space == "ip":
+            return 1.0 - dots
+        if self.space == "cosine":
+            denominator = self.norms * np.linalg.norm(query)
+            return 1.0 - dots / np.where(denominator == 0, 1.0, denominator)
+        # Squared L2 expanded so only one pass over the matrix is needed
+        return np.maximum(self.norms ** 2 - 2.0 * dots + float(query @ query), 0.0)
+
+    def close(self) -> None:
+        # Views handed out keep the map alive; it is released once they are gone
+        self.vectors = self.norms = self._offsets = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+
+def export_snapshot(output: str, chroma_path: str = "data/chroma_db", collection_name: str = "documentos", page_size: int = 1000) -> int:
+    """
+    Exports a Chroma collection to a snapshot file.
+
+    Args:
+        output (str): Destination snapshot.
+        chroma_path (str): Chroma persistence directory.
+        collection_name (str): Collection to export.
+        page_size (int): Entries read from Chroma per call.
+
+    Returns:
+        int: Number of exported chunks.
+    """
+    from app.adapters.vector_store import ChromaVectorStore
+
+    collection = ChromaVectorStore(path=chroma_path, collection_name=collection_name).collection
+    ids, documents, embeddings, metadatas = [], [], [], []
+    for offset in range(0, collection.count(), page_size):
+        page = collection.get(limit=page_size, offset=offset, include=["documents", "embeddings", "metadatas"])
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        embeddings.extend(page["embeddings"])
+        metadatas.extend(page["metadatas"])
+
+    write_snapshot(
+        output, ids, documents, embeddings, metadatas, space=collection_space(collection), collection_name=collection_name,
+        source_version=(collection.metadata or {}).get("source_version"),
+    )
+    return len(ids)
+
+
+def import_snapshot(path: str, chroma_path: str = "data/chroma_db", collection_name: Optional[str] = None) -> int:
+    """
+    Loads a snapshot into a Chroma collection, for nodes that still serve from Chroma.
+
+    The collection is replaced, so it holds exactly the snapshot's chunks and
+    carries its document version.
+
+    Args:
+        path (str): Snapshot file.
+        chroma_path (str): Chroma persistence directory.
+        collection_name (str, optional): Target collection, the exported one by default.
+
+    Returns:
+        int: Number of imported chunks.
+    """
+    import chromadb
+
+    snapshot = Snapshot(path)
+    client = chromadb.PersistentClient(path=chroma_path)
+    name = collection_name or snapshot.collection_name
+    if name in [c if isinstance(c, str) else c.name for c in client.list_collections()]:
+        client.delete_collection(name)
+    metadata = {"hnsw:space": snapshot.space}
+    if snapshot.source_version:
+        metadata["source_version"] = snapshot.source_version
+    collection = client.create_collection(name=name, metadata=metadata)
+    batch = client.get_max_batch_size()
+    for start in range(0, snapshot.count, batch):
+        end = min(start + batch, snapshot.count)
+        metadatas = snapshot.metadatas[start:end]
+        collection.upsert(
+            ids=snapshot.ids[start:end],
+            documents=[snapshot.document(i) for i in range(start, end)],
+            embeddings=snapshot.vectors[start:end],
+            # Chroma rejects empty metadata dicts, so only pass them when some exist
+            metadatas=metadatas if any(metadatas) else None,
+        )
+    snapshot.close()
+    logger.info("📥 Index snapshot imported", extra={"path": path, "chunks": snapshot.count})
+    return snapshot.count
+
+
+def collection_space(collection) -> str:
+    # Chroma 1.x keeps the space in the configuration, older versions in the metadata
+    try:
+        space = collection.configuration_json["hnsw"]["space"]
+    except Exception:
+        space = (collection.metadata or {}).get("hnsw:space", "l2")
+    return space if space in SPACES else "l2"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export, import or inspect vector index snapshots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Write a Chroma collection to a snapshot file")
+    export.add_argument("--output", default="data/index.snapshot", help="Snapshot file to write")
+    export.add_argument("--chroma-path", default="data/chroma_db", help="Chroma persistence directory")
+    export.add_argument("--collection", default="documentos", help="Collection to export")
+
+    load = commands.add_parser("import", help="Load a snapshot file into a Chroma collection")
+    load.add_argument("snapshot", help="Snapshot file to read")
+    load.add_argument("--chroma-path", default="data/chroma_db", help="Chroma persistence directory")
+    load.add_argument("--collection", help="Target collection (default: the exported one)")
+
+    info = commands.add_parser("info", help="Print the header of a snapshot file")
+    info.add_argument("snapshot", help="Snapshot file to read")
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        count = export_snapshot(args.output, args.chroma_path, args.collection)
+        print(f"✅ Exported {count} chunks to {args.output}")
+    elif args.command == "import":
+        count = import_snapshot(args.snapshot, args.chroma_path, args.collection)
+        print(f"✅ Imported {count} chunks into {args.chroma_path}")
+    else:
+        snapshot = Snapshot(args.snapshot)
+        print(json.dumps({
+            "collection": snapshot.collection_name,
+            "space": snapshot.space,
+            "chunks": snapshot.count,
+            "dim": snapshot.dim,
+            "bytes": os.path.getsize(args.snapshot),
+            "source_version": snapshot.source_version,
+            "created_at": snapshot.created_at,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter as TermCounter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+
+logger = get_logger("lexical_index")
+
+RETRIEVALS = REGISTRY.counter(
+    "rag_retrieval_total", "Context retrievals by path: lexical fast path, hybrid fusion or vector only.", ("path",)
+)
+
+TOKEN = re.compile(r"\w+")
+
+# Function words of the three supported languages; they carry no lexical signal
+STOPWORDS = frozenset("""
+    a al ante como con cual cuales cuando de del donde el en es esta este fue ha hace la las le lo los mas me
+    mi no nos o para pero por que quien quienes se ser si sin sobre su sus tiene un una uno y ya
+    an and are as at be by did do does for from has have he her his how in is it its of on or she
+    that the their they this to was what when where which who whom why with
+    ao as da das de do dos e em foi na nas no nos o os qual quais quando quem seu sua um uma
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercases, strips accents and splits into word tokens, dropping stopwords.
+
+    Accents are removed so "Mágica" matches "magica" and quotes or punctuation
+    around names ("Luz de Luna") do not matter.
+
+    Args:
+        text (str): Text in any of the supported languages.
+
+    Returns:
+        List[str]: Content tokens, in order.
+    """
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(char for char in normalized if not unicodedata.combining(char))
+    return [token for token in TOKEN.findall(normalized) if token not in STOPWORDS]
+
+
+class LexicalMatch:
+    """
+    Result of a lexical query.
+
+    Attributes:
+        hits (List[Tuple[int, float]]): (chunk position, BM25 score), best first.
+        confidence (float): 0..1, how safely the best hit can be used without a vector search.
+    """
+
+    def __init__(self, hits: List[Tuple[int, float]], confidence: float):
+        self.hits = hits
+        self.confidence = confidence
+
+
+class BM25Index:
+    """
+    In-memory inverted index over the chunks, scored with Okapi BM25.
+
+    Attributes:
+        ids (List[str]): Chunk ids, aligned with the vector store ids.
+        documents (List[str]): Chunk texts, so lexical hits need no vector store lookup.
+        k1 (float): Term frequency saturation.
+        b (float): Length normalization.
+        source_version (str, optional): Version of the document the chunks come from.
+    """
+
+    def __init__(self, ids: List[str], documents: List[str], k1: float = 1.5, b: float = 0.75, source_version: Optional[str] = None):
+        """
+        Builds the postings of every chunk.
+
+        Args:
+            ids (List[str]): Chunk ids.
+            documents (List[str]): Chunk texts.
+            k1 (float): Term frequency saturation.
+            b (float): Length normalization.
+            source_version (str, optional): Version of the document the chunks come from.
+        """
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+        self.source_version = source_version
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.lengths: List[int] = []
+        for position, document in enumerate(self.documents):
+            tokens = tokenize(document)
+            self.lengths.append(len(tokens))
+            for term, frequency in TermCounter(tokens).items():
+                self.postings[term].append((position, frequency))
+        self.postings = dict(self.postings)
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+        # Lucene's IDF variant, always positive even for terms in most chunks
+        count = len(self.documents)
+        self.idf = {term: math.log(1 + (count - len(p) + 0.5) / (len(p) + 0.5)) for term, p in self.postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def scores(self, terms: List[str]) -> Dict[int, float]:
+        """
+        BM25 score of every chunk containing at least one of the terms.
+
+        Args:
+            terms (List[str]): Query tokens (duplicates count once).
+
+        Returns:
+            Dict[int, float]: Chunk position -> score.
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(terms):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for position, frequency in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / (self.average_length or 1.0))
+                scores[position] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def search(self, query: str, top_k: int = 10) -> LexicalMatch:
+        """
+        Ranks the chunks for a query and estimates how decisive the best hit is.
+
+        The confidence is the share of the query's term weight found in the best
+        chunk, times its margin over the runner-up. Terms unknown to the index
+        weigh as much as the rarest known term, so a question whose content words
+        are absent (e.g. not in the document language) never looks confident.
+
+        Args:
+            query (str): Question text, in any language.
+            top_k (int): Hits to return.
+
+        Returns:
+            LexicalMatch: Best hits and their confidence.
+        """
+        terms = set(tokenize(query))
+        scores = self.scores(list(terms))
+        hits = sorted(scores.items(), key=lambda hit: (-hit[1], hit[0]))[:top_k]
+        if not hits:
+            return LexicalMatch([], 0.0)
+
+        unknown_weight = max(self.idf.values())
+        weights = {term: self.idf.get(term, unknown_weight) for term in terms}
+        best = hits[0][0]
+        matched = sum(weight for term, weight in weights.items() if any(p == best for p, _ in self.postings.get(term, ())))
+        coverage = matched / sum(weights.values())
+        margin = 1.0 - hits[1][1] / hits[0][1] if len(hits) > 1 else 1.0
+        return LexicalMatch(hits, coverage * margin)
+
+    def save(self, path: str) -> None:
+        """
+        Persists the chunks and parameters (postings are rebuilt on load, which is fast).
+
+        Args:
+            path (str): JSON file to write.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"k1": self.k1, "b": self.b, "source_version": self.source_version, "ids": self.ids, "documents": self.documents}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """
+        Loads an index written by save().
+
+        Args:
+            path (str): JSON file to read.
+
+        Returns:
+            BM25Index: The rebuilt index.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["ids"], data["documents"], k1=data["k1"], b=data["b"], source_version=data.get("source_version"))
+
+
+_indexes: Dict[str, Tuple[float, BM25Index]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(path: str) -> Optional[BM25Index]:
+    """
+    Returns the process-wide index stored at path, reloading it when the file changes.
+
+    Args:
+        path (str): JSON file written by BM25Index.save().
+
+    Returns:
+        Optional[BM25Index]: The index, or None if it has not been built yet.
+    """
+    try:
+        modified = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _indexes_lock:
+        cached = _indexes.get(path)
+        if cached is None or cached[0] != modified:
+            try:
+                cached = (modified, BM25Index.load(path))
+            except Exception as e:
+                logger.error("❌ Failed to load lexical index %s: %s", path, e)
+                return None
+            _indexes[path] = cached
+        return cached[1]
@@ -1,13 +1,133 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
-# Configure the base logger only if it hasn't been configured already
-logger = logging.getLogger("app_logger")
+# Root of every logger in the application
+ROOT_LOGGER_NAME = "app_logger"
 
-if not logger.handlers:
-    # Set up the logging format and level
-    logging.basicConfig(
-        level=logging.INFO,
-        format="[%(levelname)s] %(message)s"
+# Request id of the request being served, visible to every log call in its task
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[QueueListener] = None
+
+
+def set_request_id(request_id: Optional[str] = None) -> str:
+    """
+    Binds a request id to the current context (generating one if missing).
+
+    Args:
+        request_id (str, optional): An incoming id, e.g. from the X-Request-ID header.
+
+    Returns:
+        str: The request id now bound to the context.
+    """
+    request_id = request_id or uuid.uuid4().hex
+    request_id_var.set(request_id)
+    return request_id
+
+
+def get_request_id() -> str:
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    # Stamps the current request id on the record where the log call happens
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, including the request id
+    and any structured fields passed through `extra=`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: Optional[str] = None, json_format: Optional[bool] = None, use_queue: Optional[bool] = None) -> logging.Logger:
+    """
+    Configures the application logger once. Later calls are no-ops.
+
+    Defaults come from the environment:
+    - LOG_LEVEL: minimum level (INFO by default). Debug calls below it cost
+      only a level check, since messages are formatted lazily.
+    - LOG_FORMAT: 'json' (default) or 'text'.
+    - LOG_QUEUE: '1' to hand records to a background thread through a queue,
+      so request handlers never block on stdout (recommended in production).
+
+    Returns:
+        logging.Logger: The configured root application logger.
+    """
+    global _listener
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    if root.handlers:
+        return root
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if json_format is None:
+        json_format = os.getenv("LOG_FORMAT", "json").lower() == "json"
+    if use_queue is None:
+        use_queue = os.getenv("LOG_QUEUE", "0") == "1"
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        JsonFormatter() if json_format else logging.Formatter("[%(levelname)s] [%(request_id)s] %(name)s: %(message)s")
     )
 
-    logger.setLevel(logging.INFO)
+    if use_queue:
+        # The request id filter must run on the producer side, where the context lives
+        handler = QueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    else:
+        handler = stream_handler
+
+    handler.addFilter(RequestIdFilter())
+    root.addHandler(handler)
+    root.setLevel(level)
+    root.propagate = False
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns a child of the application logger (e.g. 'app_logger.rag_pipeline').
+
+    Args:
+        name (str): Short component name.
+
+    Returns:
+        logging.Logger: The component logger.
+    """
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+# Backwards-compatible module-level logger
+logger = logging.getLogger(ROOT_LOGGER_NAME)
@@ -0,0 +1,212 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Optional
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.settings import get_env
+
+logger = get_logger("loop_monitor")
+
+LOOP_LAG = REGISTRY.histogram(
+    "rag_event_loop_lag_seconds", "Delay between when a monitor tick was due and when the event loop ran it.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+LOOP_STALLS = REGISTRY.counter(
+    "rag_event_loop_stalls_total", "Times the event loop was held longer than the monitor threshold."
+)
+
+
+class LoopStall:
+    """
+    One period during which a callback held the event loop.
+
+    Attributes:
+        duration (float): Seconds the loop was held, as measured by the next tick.
+        stack (str): Stack of the loop thread while it was held, empty without debug capture.
+    """
+
+    def __init__(self, duration: float, stack: str = ""):
+        self.duration = duration
+        self.stack = stack
+
+    def as_dict(self) -> dict:
+        return {"duration_s": round(self.duration, 4), "stack": self.stack}
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop runs a periodic tick.
+
+    A tick scheduled every interval that runs late means some callback kept the
+    loop busy, delaying every other request; the delay goes to LOOP_LAG. With
+    capture_stacks, a watchdog thread also snapshots the stack of the loop thread
+    while a tick is overdue by more than the threshold, which points at the
+    blocking call (a synchronous SDK call, file I/O, CPU-bound work).
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.1,
+        capture_stacks: bool = False,
+        max_stalls: int = 50,
+        record_metrics: bool = True,
+    ):
+        """
+        Args:
+            interval (float): Seconds between ticks.
+            threshold (float): Lag above which the loop counts as blocked.
+            capture_stacks (bool): Run the watchdog thread that captures stacks (debug).
+            max_stalls (int): Recent stalls kept in memory.
+            record_metrics (bool): Report to LOOP_LAG and LOOP_STALLS; off for
+                short-lived monitors such as the test helper's.
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.capture_stacks = capture_stacks
+        self.record_metrics = record_metrics
+        self.stalls: Deque[LoopStall] = deque(maxlen=max_stalls)
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._due = 0.0
+        self._loop_thread: Optional[int] = None
+        self._pending_stack = ""
+
+    async def _tick_forever(self) -> None:
+        while True:
+            self._due = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - self._due, 0.0)
+            if self.record_metrics:
+                LOOP_LAG.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                stall = LoopStall(lag, self._pending_stack)
+                self.stalls.append(stall)
+                if self.record_metrics:
+                    LOOP_STALLS.inc()
+                logger.warning("🐢 Event loop blocked for %.0f ms", lag * 1000, extra={"stack": stall.stack} if stall.stack else {})
+            self._pending_stack = ""
+
+    def _watch(self) -> None:
+        # Runs in its own thread, so it keeps running while the loop is held
+        captured_for = None
+        while not self._stopped.wait(self.interval / 2):
+            due = self._due
+            if due and time.perf_counter() - due > self.threshold and captured_for != due:
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None:
+                    self._pending_stack = "".join(traceback.format_stack(frame))
+                captured_for = due
+
+    def start(self) -> asyncio.Task:
+        """
+        Starts the monitor, once; must be called from the running event loop it watches.
+
+        Returns:
+            asyncio.Task: The tick task.
+        """
+        if self._task is None or self._task.done():
+            self._loop_thread = threading.get_ident()
+            self._stopped.clear()
+            self._task = asyncio.create_task(self._tick_forever())
+            if self.capture_stacks:
+                self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+                self._watchdog.start()
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Lag distribution since the process started, the worst lag seen by
+            this monitor and its recent stalls.
+        """
+        return {
+            "ticks": LOOP_LAG.count(),
+            "max_lag_s": round(self.max_lag, 4),
+            "threshold_s": self.threshold,
+            "stalls": [stall.as_dict() for stall in self.stalls],
+        }
+
+
+_monitor: Optional[LoopLagMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_loop_monitor() -> Optional[LoopLagMonitor]:
+    """
+    Returns the process-wide monitor when LOOP_MONITOR=1, None otherwise.
+
+    LOOP_MONITOR_INTERVAL_MS (50) sets the tick period, LOOP_MONITOR_THRESHOLD_MS
+    (100) the lag reported as a stall, and LOOP_MONITOR_DEBUG=1 captures the
+    stack of each stall.
+
+    Returns:
+        Optional[LoopLagMonitor]: The shared monitor, if enabled.
+    """
+    global _monitor
+    if get_env("LOOP_MONITOR", "0") != "1":
+        return None
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = LoopLagMonitor(
+                interval=float(get_env("LOOP_MONITOR_INTERVAL_MS", "50")) / 1000,
+                threshold=float(get_env("LOOP_MONITOR_THRESHOLD_MS", "100")) / 1000,
+                capture_stacks=get_env("LOOP_MONITOR_DEBUG", "0") == "1",
+            )
+        return _monitor
+
+
+@asynccontextmanager
+async def assert_loop_not_blocked(threshold: float = 0.05, interval: float = 0.005) -> AsyncIterator[LoopLagMonitor]:
+    """
+    Test helper: fails if the enclosed block holds the event loop longer than threshold.
+
+    Example:
+        async with assert_loop_not_blocked():
+            await run.get("translate_question")
+
+    Args:
+        threshold (float): Longest acceptable lag, in seconds.
+        interval (float): Tick period of the monitor.
+
+    Yields:
+        LoopLagMonitor: The monitor, for inspecting the lag.
+
+    Raises:
+        AssertionError: With the duration and stack of the worst stall.
+    """
+    # Test blocks must not show up in the process metrics
+    monitor = LoopLagMonitor(interval=interval, threshold=threshold, capture_stacks=True, record_metrics=False)
+    monitor.start()
+    # Let the first tick be scheduled before the block runs
+    await asyncio.sleep(0)
+    try:
+        yield monitor
+        # A block ending with a blocking call needs one more tick to be measured
+        await asyncio.sleep(interval * 2)
+    finally:
+        await monitor.stop()
+
+    if monitor.stalls:
+        worst = max(monitor.stalls, key=lambda stall: stall.duration)
+        raise AssertionError(f"Event loop blocked for {worst.duration * 1000:.0f} ms (threshold {threshold * 1000:.0f} ms):\n{worst.stack}")
+
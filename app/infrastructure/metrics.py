@@ -0,0 +1,259 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Default latency buckets in seconds, tuned for network-bound pipeline stages
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """
+    Base class for labelled metrics kept in memory and rendered as Prometheus text.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"❌ Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    # Monotonically increasing value per label set
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}")
+        return lines
+
+
+# Costs charged to the current request, see track_costs()
+_cost_ledger: ContextVar[Optional[Dict[str, float]]] = ContextVar("cost_ledger", default=None)
+
+
+class CostCounter(Counter):
+    """
+    Counter whose increments are also charged to the request being tracked.
+
+    Ledger keys are the metric name followed by the label values, e.g.
+    'rag_provider_calls_total.cohere.generate'.
+    """
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        super().inc(amount, **labels)
+        ledger = _cost_ledger.get()
+        if ledger is not None:
+            key = ".".join((self.name,) + self._key(labels))
+            ledger[key] = ledger.get(key, 0) + amount
+
+
+@contextmanager
+def track_costs() -> Iterator[Dict[str, float]]:
+    """
+    Collects the provider calls and billed characters of the enclosed block.
+
+    Tasks started inside the block (pipeline stages) and asyncio.to_thread calls
+    inherit the ledger. Bare loop.run_in_executor calls do not: they need
+    contextvars.copy_context().run, or their costs are missed. A batched DeepL
+    call is charged to the request that opened the batch.
+
+    Yields:
+        Dict[str, float]: The ledger, filled as costs are incurred.
+    """
+    ledger: Dict[str, float] = {}
+    token = _cost_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _cost_ledger.reset(token)
+
+
+class Gauge(Counter):
+    # Point-in-time value per label set, e.g. pool sizes or queue depth
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    # Cumulative buckets plus sum and count per label set
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # Layout: one slot per bucket, then +Inf, sum
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-2]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = _format_labels(self.labelnames, key, f'le="{_format_number(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {_format_number(count)}")
+                inf = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {_format_number(series[-2])}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_number(series[-1])}")
+                lines.append(f"{self.name}_count{labels} {_format_number(series[-2])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metrics exposed on the /metrics route.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """
+        Registers a callback run right before rendering, to refresh gauges whose
+        values are read from other components (e.g. HTTP connection pools).
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"❌ Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Renders every registered metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text, terminated by a newline.
+        """
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception:
+                # A broken collector must never take the whole endpoint down
+                pass
+
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "rag_stage_latency_seconds", "Latency of each RAG pipeline stage.", ("stage",)
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "rag_cache_lookups_total", "Cache lookups per namespace and result (hit or miss).", ("namespace", "result")
+)
+LLM_RETRIES = REGISTRY.counter(
+    "rag_llm_retries_total", "LLM generations retried after a failed validation."
+)
+PROVIDER_CALLS = REGISTRY.register(CostCounter(
+    "rag_provider_calls_total", "Calls made to upstream providers.", ("provider", "operation")
+))
+PROVIDER_ERRORS = REGISTRY.counter(
+    "rag_provider_errors_total", "Failed calls to upstream providers.", ("provider", "operation")
+)
+DEEPL_BILLED_CHARACTERS = REGISTRY.register(CostCounter(
+    "rag_deepl_billed_characters_total", "Characters billed by DeepL.", ("operation",)
+))
+
+
+@contextmanager
+def span(stage: str, histogram: Optional[Histogram] = None) -> Iterator[None]:
+    """
+    Times the enclosed block and records it under the given pipeline stage.
+
+    The duration is recorded even when the block raises, so failing stages
+    still show up in the latency distribution.
+
+    Args:
+        stage (str): Stage label (e.g. 'detect_language', 'generate').
+        histogram (Histogram, optional): Target histogram, STAGE_LATENCY by default.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        (histogram or STAGE_LATENCY).observe(time.perf_counter() - start, stage=stage)
@@ -0,0 +1,107 @@
+import json
+import os
+from functools import lru_cache
+
+# Versioned table shipped next to this module
+PROMPT_TABLES_PATH = os.path.join(os.path.dirname(__file__), "prompt_tables.json")
+
+
+class PromptCatalog:
+    """
+    Precomputed multilingual instruction blocks, validator feedback messages
+    and compiled prompt templates.
+
+    Everything that depends only on the language is resolved once when the
+    catalog is built, so building a prompt is a single str.format call and
+    retry feedback never needs a translation request.
+
+    Attributes:
+        version (int): Version of the table the catalog was built from.
+        default_language (str): Language used when an unknown code is requested.
+    """
+
+    def __init__(self, tables: dict):
+        """
+        Builds the catalog from the raw table structure.
+
+        Args:
+            tables (dict): The parsed content of prompt_tables.json.
+
+        Raises:
+            ValueError: If the default language is missing from the table.
+        """
+        self.version = tables["version"]
+        self.default_language = tables["default_language"]
+        self._instructions = {}
+        self._feedback = {}
+        self._templates = {}
+
+        if self.default_language not in tables["languages"]:
+            raise ValueError(f"❌ Default language '{self.default_language}' missing from prompt tables.")
+
+        for lang, entry in tables["languages"].items():
+            instruction = entry["instructions"]
+            self._instructions[lang] = instruction
+            self._feedback[lang] = dict(entry["feedback"])
+
+            # Bake the instruction block into the template, escaping its braces,
+            # and leave a slot for optional extra instructions
+            escaped = instruction.replace("{", "{{").replace("}", "}}")
+            self._templates[lang] = tables["template"].replace("{instruction}", escaped + "{extra}")
+
+    @property
+    def languages(self) -> list[str]:
+        return list(self._instructions)
+
+    def _resolve(self, language: str) -> str:
+        return language if language in self._instructions else self.default_language
+
+    def instructions(self, language: str) -> str:
+        """Returns the instruction block for a language (default language if unknown)."""
+        return self._instructions[self._resolve(language)]
+
+    def feedback(self, key: str, language: str, **params: str) -> str:
+        """
+        Returns a validator feedback message already written in the target language.
+
+        Args:
+            key (str): Feedback key ('emoji', 'sentence', 'language').
+            language (str): Language the message must be written in.
+            **params: Values for placeholders such as {lang}.
+
+        Returns:
+            str: The localized feedback message.
+        """
+        message = self._feedback[self._resolve(language)][key]
+        return message.format(**params) if params else message
+
+    def render(self, language: str, context: str, question: str, extra_instructions: str = "") -> str:
+        """
+        Renders the compiled prompt template for a language.
+
+        Args:
+            language (str): The target language code.
+            context (str): The context to include in the prompt.
+            question (str): The user's question.
+            extra_instructions (str, optional): Additional instructions appended to the block.
+
+        Returns:
+            str: The fully constructed prompt.
+        """
+        extra = f"\n{extra_instructions.strip()}" if extra_instructions else ""
+        return self._templates[self._resolve(language)].format(extra=extra, context=context, question=question)
+
+
+@lru_cache(maxsize=None)
+def get_prompt_catalog(path: str = PROMPT_TABLES_PATH) -> PromptCatalog:
+    """
+    Loads the prompt tables once per process and returns the shared catalog.
+
+    Args:
+        path (str): Path to the JSON table file.
+
+    Returns:
+        PromptCatalog: The compiled catalog.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return PromptCatalog(json.load(f))
@@ -0,0 +1,238 @@
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.settings import get_env
+
+# The SDKs are imported inside the factories so importing the app stays cheap
+if TYPE_CHECKING:
+    import cohere
+    import deepl
+    import httpx
+    from requests.adapters import HTTPAdapter
+
+logger = get_logger("provider_sessions")
+
+POOL_REQUESTS = REGISTRY.gauge(
+    "rag_provider_pool_requests", "HTTP requests sent through each shared provider pool.", ("provider",)
+)
+POOL_CONNECTIONS = REGISTRY.gauge(
+    "rag_provider_pool_connections_opened", "Connections opened by each shared provider pool.", ("provider",)
+)
+POOL_REUSE = REGISTRY.gauge(
+    "rag_provider_pool_reuse_ratio", "Share of requests served over an already open connection.", ("provider",)
+)
+
+
+class PoolSettings:
+    """
+    Connection pool limits and timeouts for the upstream providers, read from the environment.
+
+    Attributes:
+        cohere_max_connections (int): COHERE_POOL_MAX_CONNECTIONS, open connections cap (default 20).
+        cohere_max_keepalive (int): COHERE_POOL_MAX_KEEPALIVE, idle connections kept (default 10).
+        cohere_keepalive_expiry (float): COHERE_POOL_KEEPALIVE_EXPIRY, idle seconds before closing (default 30).
+        cohere_timeout (float): COHERE_TIMEOUT, read timeout in seconds (default 60).
+        cohere_connect_timeout (float): COHERE_CONNECT_TIMEOUT, connect and pool wait timeout (default 5).
+        deepl_pool_size (int): DEEPL_POOL_MAXSIZE, connections kept per host (default 20).
+        deepl_timeout (float): DEEPL_TIMEOUT, minimum request timeout in seconds (default 10).
+    """
+
+    def __init__(self):
+        self.cohere_max_connections = int(get_env("COHERE_POOL_MAX_CONNECTIONS", "20"))
+        self.cohere_max_keepalive = int(get_env("COHERE_POOL_MAX_KEEPALIVE", "10"))
+        self.cohere_keepalive_expiry = float(get_env("COHERE_POOL_KEEPALIVE_EXPIRY", "30"))
+        self.cohere_timeout = float(get_env("COHERE_TIMEOUT", "60"))
+        self.cohere_connect_timeout = float(get_env("COHERE_CONNECT_TIMEOUT", "5"))
+        self.deepl_pool_size = int(get_env("DEEPL_POOL_MAXSIZE", "20"))
+        self.deepl_timeout = float(get_env("DEEPL_TIMEOUT", "10"))
+
+
+_lock = threading.Lock()
+_cohere_http: Optional["httpx.Client"] = None
+_cohere_client: Optional["cohere.Client"] = None
+_deepl_translator: Optional["deepl.Translator"] = None
+_deepl_adapter: Optional["HTTPAdapter"] = None
+_cohere_stats = {"requests": 0, "connections": 0}
+# The httpx hooks run on every provider worker thread
+_cohere_stats_lock = threading.Lock()
+
+# Retry-After of the last throttled response, per thread: the SDK exceptions drop headers
+_throttle = threading.local()
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        # HTTP-date form; providers send seconds, fall back to backoff
+        return None
+
+
+def _record_retry_after(status_code: int, headers) -> None:
+    if status_code in (429, 503):
+        _throttle.retry_after = _parse_retry_after(headers.get("Retry-After"))
+
+
+def pop_retry_after() -> Optional[float]:
+    """
+    Returns and clears the Retry-After (seconds) of the last throttled response seen by this thread.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None when the provider did not say.
+    """
+    value = getattr(_throttle, "retry_after", None)
+    _throttle.retry_after = None
+    return value
+
+
+def _trace_cohere_connection(event_name: str, info: dict) -> None:
+    # httpcore reports TCP connects only when the pool has no idle connection to reuse
+    if event_name == "connection.connect_tcp.complete":
+        with _cohere_stats_lock:
+            _cohere_stats["connections"] += 1
+
+
+def _on_cohere_request(request: "httpx.Request") -> None:
+    with _cohere_stats_lock:
+        _cohere_stats["requests"] += 1
+    request.extensions["trace"] = _trace_cohere_connection
+
+
+def _on_cohere_response(response: "httpx.Response") -> None:
+    _record_retry_after(response.status_code, response.headers)
+
+
+def get_cohere_client() -> "cohere.Client":
+    """
+    Returns the process-wide Cohere client, backed by one bounded keep-alive pool.
+
+    COHERE_BASE_URL, when set, points the client at another server (e.g. the local stub).
+
+    Returns:
+        cohere.Client: The shared client.
+    """
+    global _cohere_http, _cohere_client
+
+    with _lock:
+        if _cohere_client is None:
+            import cohere
+            import httpx
+
+            settings = PoolSettings()
+            _cohere_http = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=settings.cohere_max_connections,
+                    max_keepalive_connections=settings.cohere_max_keepalive,
+                    keepalive_expiry=settings.cohere_keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(settings.cohere_timeout, connect=settings.cohere_connect_timeout, pool=settings.cohere_connect_timeout),
+                event_hooks={"request": [_on_cohere_request], "response": [_on_cohere_response]},
+            )
+            _cohere_client = cohere.Client(
+                get_env("COHERE_API_KEY"),
+                base_url=get_env("COHERE_BASE_URL") or None,
+                httpx_client=_cohere_http,
+            )
+        return _cohere_client
+
+
+def get_deepl_translator() -> "deepl.Translator":
+    """
+    Returns the process-wide DeepL translator, backed by one bounded keep-alive pool.
+
+    DEEPL_SERVER_URL, when set, points the client at another server (e.g. the local stub).
+
+    Returns:
+        deepl.Translator: The shared translator.
+    """
+    global _deepl_translator, _deepl_adapter
+
+    with _lock:
+        if _deepl_translator is None:
+            import deepl
+            from requests.adapters import HTTPAdapter
+
+            settings = PoolSettings()
+            translator = deepl.Translator(get_env("DEEPL_API_KEY"), server_url=get_env("DEEPL_SERVER_URL") or None)
+
+            # The SDK keeps its requests.Session private; mount a bounded adapter on it
+            # so concurrent callers wait for a pooled connection instead of opening new ones
+            _deepl_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.deepl_pool_size, pool_block=True)
+            session = getattr(getattr(translator, "_client", None), "_session", None)
+            if session is not None:
+                session.mount("https://", _deepl_adapter)
+                session.mount("http://", _deepl_adapter)
+                session.hooks["response"].append(lambda response, **_: _record_retry_after(response.status_code, response.headers))
+            else:
+                logger.warning("DeepL SDK session not found, using its default connection pool")
+            deepl.http_client.min_connection_timeout = settings.deepl_timeout
+            # Retries are owned by the rate limiter, which honors Retry-After
+            deepl.http_client.max_network_retries = 0
+
+            _deepl_translator = translator
+        return _deepl_translator
+
+
+def _deepl_pool_counts() -> tuple:
+    if _deepl_adapter is None:
+        return 0, 0
+    pools = _deepl_adapter.poolmanager.pools
+    requests_sent = connections = 0
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is not None:
+            requests_sent += pool.num_requests
+            connections += pool.num_connections
+    return requests_sent, connections
+
+
+def session_stats() -> dict:
+    """
+    Connection reuse per provider since the shared pools were created.
+
+    Returns:
+        dict: {provider: {"requests", "connections_opened", "reuse_ratio"}}.
+    """
+    with _cohere_stats_lock:
+        cohere_counts = (_cohere_stats["requests"], _cohere_stats["connections"])
+    counts = {
+        "cohere": cohere_counts,
+        "deepl": _deepl_pool_counts(),
+    }
+    stats = {}
+    for provider, (requests_sent, connections) in counts.items():
+        reuse = 1 - connections / requests_sent if requests_sent else 0.0
+        stats[provider] = {
+            "requests": requests_sent,
+            "connections_opened": connections,
+            "reuse_ratio": round(max(reuse, 0.0), 4),
+        }
+    return stats
+
+
+def _collect() -> None:
+    for provider, values in session_stats().items():
+        POOL_REQUESTS.set(values["requests"], provider=provider)
+        POOL_CONNECTIONS.set(values["connections_opened"], provider=provider)
+        POOL_REUSE.set(values["reuse_ratio"], provider=provider)
+
+
+REGISTRY.add_collector(_collect)
+
+
+def close_sessions() -> None:
+    """
+    Closes the shared pools (on shutdown); the next getter call recreates them.
+    """
+    global _cohere_http, _cohere_client, _deepl_translator, _deepl_adapter
+
+    with _lock:
+        if _cohere_http is not None:
+            _cohere_http.close()
+        if _deepl_adapter is not None:
+            _deepl_adapter.close()
+        _cohere_http = _cohere_client = _deepl_translator = _deepl_adapter = None
+        with _cohere_stats_lock:
+            _cohere_stats.update(requests=0, connections=0)
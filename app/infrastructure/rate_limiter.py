@@ -0,0 +1,302 @@
+import asyncio
+import contextvars
+import functools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.provider_sessions import pop_retry_after
+from app.infrastructure.settings import get_env
+
+logger = get_logger("rate_limiter")
+
+QUEUE_DELAY = REGISTRY.histogram(
+    "rag_provider_queue_delay_seconds", "Time a provider call waited for a rate or concurrency slot.", ("provider",)
+)
+THROTTLED = REGISTRY.counter(
+    "rag_provider_throttled_total", "Provider calls rejected with 429 (too many requests).", ("provider",)
+)
+PROVIDER_RETRIES = REGISTRY.counter(
+    "rag_provider_retries_total", "Provider calls retried after a throttle or transient failure.", ("provider", "operation")
+)
+CONCURRENCY_LIMIT = REGISTRY.gauge(
+    "rag_provider_concurrency_limit", "Current adaptive concurrency limit per provider.", ("provider",)
+)
+IN_FLIGHT = REGISTRY.gauge(
+    "rag_provider_in_flight", "Provider calls currently in flight.", ("provider",)
+)
+
+TRANSIENT_STATUS_CODES = (500, 502, 503, 504)
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    # Cohere errors expose status_code, DeepL errors http_status_code
+    return getattr(exc, "status_code", None) or getattr(exc, "http_status_code", None)
+
+
+def is_throttle(exc: Exception) -> bool:
+    """
+    Whether the provider rejected the call for exceeding its rate limit.
+    """
+    return _status_code(exc) == 429 or type(exc).__name__ in ("TooManyRequestsError", "TooManyRequestsException")
+
+
+def is_transient(exc: Exception) -> bool:
+    """
+    Whether the failure is worth retrying (server errors, timeouts, dropped connections).
+    """
+    if _status_code(exc) in TRANSIENT_STATUS_CODES or getattr(exc, "should_retry", False):
+        return True
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    import httpx
+    return isinstance(exc, httpx.TransportError)
+
+
+class ProviderLimiter:
+    """
+    Token bucket plus AIMD adaptive concurrency in front of one upstream provider.
+
+    Every call first waits for a token (steady rate with bursts) and a concurrency
+    slot. Successful calls grow the concurrency limit additively; a 429 halves it
+    and pauses all callers for the Retry-After sent by the provider. Throttled and
+    transient failures are retried with jittered exponential backoff.
+
+    Calls are synchronous, like the provider SDKs, and safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        rate: float = 10.0,
+        burst: int = 20,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_retries: int = 3,
+        base_backoff: float = 0.25,
+        max_backoff: float = 8.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            provider (str): Provider label for metrics (e.g. 'cohere', 'deepl').
+            rate (float): Sustained calls per second; 0 disables the token bucket.
+            burst (int): Bucket capacity, the calls allowed back to back.
+            max_concurrency (int): Upper bound of the adaptive concurrency limit.
+            min_concurrency (int): Lower bound after repeated throttling.
+            max_retries (int): Retries after a throttle or transient failure.
+            base_backoff (float): First backoff in seconds, doubled per attempt.
+            max_backoff (float): Backoff cap in seconds.
+            sleep (Callable): Injected for tests.
+            clock (Callable): Monotonic clock, injected for tests.
+        """
+        self.provider = provider
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_concurrency = max(max_concurrency, 1)
+        self.min_concurrency = max(min(min_concurrency, self.max_concurrency), 1)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._clock = clock
+
+        # Start halfway and let successes find the provider's actual capacity
+        self.limit = float(max(self.max_concurrency // 2, self.min_concurrency))
+        self.in_flight = 0
+        self._tokens = float(self.burst)
+        self._refilled_at = clock()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        CONCURRENCY_LIMIT.set(int(self.limit), provider=provider)
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _wait_time(self, now: float) -> float:
+        # Seconds until this caller could proceed; 0 means go now
+        wait = max(self._paused_until - now, 0.0)
+        if self.rate > 0 and self._tokens < 1:
+            wait = max(wait, (1 - self._tokens) / self.rate)
+        return wait
+
+    def acquire(self) -> float:
+        """
+        Blocks until a token and a concurrency slot are available.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        start = self._clock()
+        with self._cond:
+            while True:
+                now = self._clock()
+                self._refill(now)
+                wait = self._wait_time(now)
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    if self.rate > 0:
+                        self._tokens -= 1
+                    self.in_flight += 1
+                    IN_FLIGHT.set(self.in_flight, provider=self.provider)
+                    break
+                # Slot releases notify; token refills and pauses are waited out
+                self._cond.wait(timeout=wait if wait > 0 else None)
+        waited = self._clock() - start
+        QUEUE_DELAY.observe(waited, provider=self.provider)
+        return waited
+
+    def release(self, succeeded: bool = True, throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Frees the concurrency slot and adapts the limit.
+
+        Args:
+            succeeded (bool): Whether the call succeeded; grows the limit additively.
+            throttled (bool): Whether the call got a 429; halves the limit.
+            retry_after (float, optional): Seconds every caller should pause.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                if retry_after:
+                    self._paused_until = max(self._paused_until, self._clock() + retry_after)
+            elif succeeded:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            IN_FLIGHT.set(self.in_flight, provider=self.provider)
+            CONCURRENCY_LIMIT.set(int(self.limit), provider=self.provider)
+            self._cond.notify_all()
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff for the given retry attempt (0-based).
+        """
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+    def call(self, operation: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Runs fn under the limiter, retrying throttled and transient failures.
+
+        Args:
+            operation (str): Operation label for metrics (e.g. 'embed', 'translate').
+            fn (Callable): The provider call.
+            *args, **kwargs: Forwarded to fn.
+
+        Returns:
+            Any: Whatever fn returns.
+
+        Raises:
+            Exception: The last error of fn, once it is not retryable or retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            pop_retry_after()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttle(e)
+                retry_after = pop_retry_after() if throttled else None
+                self.release(succeeded=False, throttled=throttled, retry_after=retry_after)
+                if throttled:
+                    THROTTLED.inc(provider=self.provider)
+                if not (throttled or is_transient(e)) or attempt >= self.max_retries:
+                    raise
+                delay = retry_after or self.backoff(attempt)
+                logger.warning(
+                    "⏳ %s %s failed (%s), retrying in %.2fs", self.provider, operation,
+                    "throttled" if throttled else type(e).__name__, delay,
+                    extra={"attempt": attempt + 1},
+                )
+                PROVIDER_RETRIES.inc(provider=self.provider, operation=operation)
+                attempt += 1
+                # A Retry-After pause is enforced by acquire(), for this and every other caller
+                if not retry_after:
+                    self._sleep(delay)
+                continue
+            self.release()
+            return result
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """
+    Returns the process-wide limiter of a provider, configured from the environment:
+    <PROVIDER>_RATE_LIMIT (calls/s, 0 = unlimited), <PROVIDER>_RATE_BURST,
+    <PROVIDER>_MAX_CONCURRENCY and <PROVIDER>_MAX_RETRIES.
+
+    Args:
+        provider (str): 'cohere' or 'deepl'.
+
+    Returns:
+        ProviderLimiter: The shared limiter.
+    """
+    with _limiters_lock:
+        if provider not in _limiters:
+            prefix = provider.upper()
+            _limiters[provider] = ProviderLimiter(
+                provider,
+                rate=float(get_env(f"{prefix}_RATE_LIMIT", "10")),
+                burst=int(get_env(f"{prefix}_RATE_BURST", "20")),
+                max_concurrency=int(get_env(f"{prefix}_MAX_CONCURRENCY", "16")),
+                max_retries=int(get_env(f"{prefix}_MAX_RETRIES", "3")),
+            )
+        return _limiters[provider]
+
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_provider_executor(provider: str) -> ThreadPoolExecutor:
+    """
+    Returns the thread pool running the blocking calls of one provider, sized by
+    <PROVIDER>_THREADS (32).
+
+    A call waiting in ProviderLimiter.acquire (for a token, a slot or a
+    Retry-After pause) holds its thread. Under throttling, one pool per provider
+    keeps those waits from filling the default executor that cache compaction,
+    the index stages and the other provider's calls run on.
+
+    Args:
+        provider (str): 'cohere' or 'deepl'.
+
+    Returns:
+        ThreadPoolExecutor: The shared pool.
+    """
+    with _executors_lock:
+        if provider not in _executors:
+            _executors[provider] = ThreadPoolExecutor(
+                max_workers=int(get_env(f"{provider.upper()}_THREADS", "32")),
+                thread_name_prefix=f"{provider}-call",
+            )
+        return _executors[provider]
+
+
+async def run_provider_call(provider: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Runs a blocking provider call in the provider's pool, off the event loop.
+
+    Like asyncio.to_thread, the call runs in a copy of the current context, so
+    it is charged to the request tracked by track_costs.
+
+    Args:
+        provider (str): 'cohere' or 'deepl'.
+        fn (Callable): The blocking call.
+        *args, **kwargs: Forwarded to fn.
+
+    Returns:
+        Any: Whatever fn returns.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_provider_executor(provider), functools.partial(context.run, fn, *args, **kwargs))
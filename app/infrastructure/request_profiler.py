@@ -0,0 +1,231 @@
+import asyncio
+import cProfile
+import glob
+import hmac
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from app.infrastructure.logger import get_logger
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.settings import get_env
+
+logger = get_logger("request_profiler")
+
+PROFILED_REQUESTS = REGISTRY.counter(
+    "rag_profiled_requests_total", "Requests run under the profiler, by trigger (header or sample).", ("trigger",)
+)
+
+PROFILE_HEADER = "X-Profile"
+# Request ids name the files, anything else is replaced
+SAFE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class ProfileSession:
+    """
+    What the route gets while a profiled request runs.
+
+    Attributes:
+        request_id (str): Id the saved files are named after.
+        timings (dict): Pipeline stage timings, filled by the caller (see collect_timings).
+        path (Optional[str]): The saved .prof file, once the request finished.
+    """
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.timings: dict = {}
+        self.path: Optional[str] = None
+
+
+class RequestProfiler:
+    """
+    Opt-in profiling of single /ask requests, with cProfile and tracemalloc.
+
+    A request is profiled when it carries the X-Profile header with the
+    configured token, or when it is drawn by the sampling rate. Its cProfile
+    stats are saved as <request_id>.prof (for pstats or snakeviz) next to a
+    <request_id>.json summary with the stage timings, the top functions and the
+    top allocation sites.
+
+    cProfile sees the event loop thread only: work moved to threads shows up as
+    time spent awaiting, and callbacks of concurrent requests interleaved with
+    this one are included. Only one request is profiled at a time.
+    """
+
+    def __init__(self, directory: str = "profiles", token: str = "", sample_rate: float = 0.0, max_files: int = 50, top: int = 30):
+        """
+        Args:
+            directory (str): Where profiles are saved.
+            token (str): Value of the X-Profile header that triggers profiling; empty disables it.
+            sample_rate (float): Share of requests profiled without the header (0 to 1).
+            max_files (int): Profiles kept; the oldest are deleted.
+            top (int): Functions and allocation sites listed in the summary.
+        """
+        self.directory = directory
+        self.token = token
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self.top = top
+        self._busy = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token) or self.sample_rate > 0
+
+    def authorized(self, header: Optional[str]) -> bool:
+        return bool(self.token) and header is not None and hmac.compare_digest(header, self.token)
+
+    def trigger(self, header: Optional[str]) -> Optional[str]:
+        """
+        Decides whether a request is profiled.
+
+        Args:
+            header (str, optional): Value of the X-Profile header.
+
+        Returns:
+            Optional[str]: 'header' or 'sample', None when the request is not profiled.
+        """
+        if self.authorized(header):
+            return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    @asynccontextmanager
+    async def profile(self, request_id: str, header: Optional[str] = None) -> AsyncIterator[Optional[ProfileSession]]:
+        """
+        Profiles the enclosed block if the request is selected.
+
+        Args:
+            request_id (str): Id of the request, used to name the files.
+            header (str, optional): Value of the X-Profile header.
+
+        Yields:
+            Optional[ProfileSession]: The session, None when the request is not profiled.
+        """
+        trigger = self.trigger(header)
+        if trigger is None or not self._busy.acquire(blocking=False):
+            yield None
+            return
+
+        session = ProfileSession(request_id if SAFE_ID.match(request_id) else f"req-{int(time.time() * 1000)}")
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield session
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            self._busy.release()
+            try:
+                # Writing and summarizing the stats stays off the event loop
+                await asyncio.to_thread(self._save, session, profiler, snapshot, peak, elapsed, trigger)
+                PROFILED_REQUESTS.inc(trigger=trigger)
+            except Exception as e:
+                logger.error("❌ Failed to save request profile: %s", e, extra={"profile_id": session.request_id})
+
+    def _save(self, session: ProfileSession, profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot, peak: int, elapsed: float, trigger: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{session.request_id}.prof")
+        profiler.dump_stats(path)
+
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(self.top)
+        allocations = [
+            {"site": str(stat.traceback[0]), "size_bytes": stat.size, "count": stat.count}
+            for stat in snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]).statistics("lineno")[: self.top]
+        ]
+        summary = {
+            "request_id": session.request_id,
+            "trigger": trigger,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "elapsed_s": round(elapsed, 4),
+            "stage_timings_s": {stage: round(seconds, 4) for stage, seconds in session.timings.items()},
+            "peak_traced_bytes": peak,
+            "top_allocations": allocations,
+            "top_functions": text.getvalue(),
+        }
+        with open(os.path.join(self.directory, f"{session.request_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        session.path = path
+        logger.info("🔬 Request profiled", extra={"profile_id": session.request_id, "elapsed_s": summary["elapsed_s"]})
+        self._prune()
+
+    def _prune(self) -> None:
+        summaries = sorted(glob.glob(os.path.join(self.directory, "*.json")), key=os.path.getmtime)
+        for summary in summaries[: max(len(summaries) - self.max_files, 0)]:
+            for path in (summary, summary[:-5] + ".prof"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def list_profiles(self) -> List[dict]:
+        """
+        Returns:
+            List[dict]: Saved profiles, newest first, without the bulky top lists.
+        """
+        profiles = []
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.json")), key=os.path.getmtime, reverse=True):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    summary = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            profiles.append({key: summary.get(key) for key in ("request_id", "trigger", "created", "elapsed_s", "stage_timings_s", "peak_traced_bytes")})
+        return profiles
+
+    def path(self, request_id: str, extension: str) -> Optional[str]:
+        """
+        Args:
+            request_id (str): Profile id.
+            extension (str): 'json' (summary) or 'prof' (cProfile stats).
+
+        Returns:
+            Optional[str]: The file, None if the id is invalid or nothing was saved under it.
+        """
+        if not SAFE_ID.match(request_id) or extension not in ("json", "prof"):
+            return None
+        path = os.path.join(self.directory, f"{request_id}.{extension}")
+        return path if os.path.exists(path) else None
+
+
+_profiler: Optional[RequestProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_request_profiler() -> RequestProfiler:
+    """
+    Returns the process-wide profiler, configured from the environment:
+    PROFILE_TOKEN (empty, header trigger disabled), PROFILE_SAMPLE_RATE (0),
+    PROFILE_DIR (profiles) and PROFILE_MAX_FILES (50).
+
+    Returns:
+        RequestProfiler: The shared profiler.
+    """
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = RequestProfiler(
+                directory=get_env("PROFILE_DIR", "profiles"),
+                token=get_env("PROFILE_TOKEN", ""),
+                sample_rate=float(get_env("PROFILE_SAMPLE_RATE", "0")),
+                max_files=int(get_env("PROFILE_MAX_FILES", "50")),
+            )
+        return _profiler
@@ -0,0 +1,31 @@
+import os
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=1)
+def load_environment() -> None:
+    """
+    Loads the .env file into the process environment, once per process.
+
+    Variables already set in the environment take precedence over the .env file,
+    so deployments and the load-test stub can override any value.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def get_env(name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Reads a configuration value, making sure the .env file has been loaded first.
+
+    Args:
+        name (str): Environment variable name.
+        default (str, optional): Value returned when the variable is unset.
+
+    Returns:
+        Optional[str]: The configured value or the default.
+    """
+    load_environment()
+    return os.getenv(name, default)
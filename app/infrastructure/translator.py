@@ -1,9 +1,12 @@
-from typing import Literal
+from typing import List, Literal
 from app.interfaces.translator_interface import TranslatorInterface
 from app.utils.language_normalizer import LanguageNormalizer
-from deepl import Translator
-import deepl
-import os
+from app.infrastructure.metrics import DEEPL_BILLED_CHARACTERS, PROVIDER_CALLS, PROVIDER_ERRORS
+from app.infrastructure.logger import get_logger
+from app.infrastructure.provider_sessions import get_deepl_translator
+from app.infrastructure.rate_limiter import get_limiter
+
+logger = get_logger("translator")
 
 
 SUPPORTED_LANGUAGES = ["es", "en", "pt"]
@@ -40,30 +43,57 @@ class DeepLTranslator(TranslatorInterface):
     }
 
     def __init__(self):
-        self.translator = Translator(auth_key=os.getenv("DEEPL_API_KEY"))
+        # Shared across adapters so every DeepL call reuses the same keep-alive pool
+        self.translator = get_deepl_translator()
+
+    def translate_many(self, texts: List[str], target_lang: str) -> List[str]:
+        """
+        Translates several texts to one DeepL target language in a single API call.
+
+        Args:
+            texts (List[str]): Texts to translate (DeepL accepts up to 50 per call).
+            target_lang (str): DeepL target code (e.g. 'ES', 'EN-US').
+
+        Returns:
+            List[str]: The translations, in the same order.
+        """
+        # Single entry point to DeepL so every call, failure and billed character is counted
+        PROVIDER_CALLS.inc(provider="deepl", operation="translate")
+        try:
+            results = get_limiter("deepl").call("translate", self.translator.translate_text, texts, target_lang=target_lang)
+        except Exception:
+            PROVIDER_ERRORS.inc(provider="deepl", operation="translate")
+            raise
+        DEEPL_BILLED_CHARACTERS.inc(sum(r.billed_characters or 0 for r in results), operation="translate")
+        return [r.text for r in results]
+
+    def _translate_text(self, text: str, target_lang: str) -> str:
+        return self.translate_many([text], target_lang)[0]
 
     def translate_to_spanish(self, text: str, source_lang: str) -> str:
+        # Already loaded by get_deepl_translator(), so this import is free
+        import deepl
+
         try:
-            print(f'Source_lang in translate_to_spanish {source_lang}')
             source_lang = LanguageNormalizer.normalize(source_lang)
-            print(f'Source_lang in translate_to_spanish after {source_lang}')
+            logger.debug("translate_to_spanish source_lang=%s", source_lang)
             if source_lang == "es":
                 return text
             
             if source_lang not in self.LANG_MAP:
                 raise ValueError(f"Unsupported source_lang: {source_lang}")
             
-            result = self.translator.translate_text(
-                text,
-                target_lang="ES"
-            )
-            return result.text
+            return self._translate_text(text, "ES")
 
         except deepl.DeepLException as e:
-            print("DeepL error:", str(e))
-            if hasattr(e, 'response') and e.response is not None:
-                print("Status code:", e.response.status_code)
-                print("Response body:", e.response.text)
+            response = getattr(e, "response", None)
+            logger.error(
+                "DeepL error: %s", e,
+                extra={
+                    "status_code": getattr(response, "status_code", None),
+                    "response_body": getattr(response, "text", None),
+                },
+            )
             raise e
 
     def translate_from_spanish(self, text: str, target_lang: Literal["es", "en", "pt"]) -> str:
@@ -71,23 +101,12 @@ class DeepLTranslator(TranslatorInterface):
         target_lang = LanguageNormalizer.normalize(target_lang)
         if target_lang == "es":
             return text
-        result = self.translator.translate_text(
-            text,
-            target_lang=self.LANG_MAP[target_lang]
-        )
-        return result.text
+        return self._translate_text(text, self.LANG_MAP[target_lang])
 
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
-        
-        print(f'Source_lang in translate {source_lang}')
-        
-        
+        logger.debug("translate source_lang=%s target_lang=%s", source_lang, target_lang)
         source_lang = LanguageNormalizer.normalize(source_lang)
         target_lang = LanguageNormalizer.normalize(target_lang)
         if source_lang == target_lang:
             return text
-        result = self.translator.translate_text(
-            text,
-            target_lang=self.LANG_MAP[target_lang]
-        )
-        return result.text
+        return self._translate_text(text, self.LANG_MAP[target_lang])
@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Optional, Protocol
 from abc import abstractmethod
 
 class VectorStore(Protocol):
@@ -10,13 +10,24 @@ class VectorStore(Protocol):
     """
 
     @abstractmethod
-    def save(self, chunks: list[str], embeddings: list[list[float]]) -> None:
+    def save(self, chunks: list[str], embeddings: list[list[float]], source_version: Optional[str] = None) -> None:
         """
-        Stores text chunks and their corresponding embedding vectors in the vector store.
+        Replaces the content of the vector store with these chunks and embedding vectors.
 
         Args:
             chunks (list[str]): List of text segments or documents.
             embeddings (list[list[float]]): Corresponding list of embedding vectors.
+            source_version (str, optional): Version of the document they come from, stored with them.
+        """
+        ...
+
+    @abstractmethod
+    def source_version(self) -> Optional[str]:
+        """
+        Returns the document version stored by the last save.
+
+        Returns:
+            Optional[str]: The version, None if the store is empty or predates versions.
         """
         ...
 
@@ -1,8 +1,21 @@
-from fastapi import Body
-from fastapi import APIRouter
+import asyncio
+from typing import Optional
+
+from fastapi import Body, Header, Query
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 
 from app.presentation.schemas import AskRequest, AskResponse
-from app.domain.rag_pipeline import run_rag_pipeline
+from app.domain.rag_pipeline import CACHE_DIR, get_cached_answer, run_rag_pipeline
+from app.domain.indexing import INDEX_STATE, IndexNotReadyError
+from app.domain.cache_generations import cache_generations
+from app.domain.pipeline_dag import collect_timings
+from app.infrastructure.metrics import REGISTRY
+from app.infrastructure.admission import FAST_PATH, AdmissionRejected, get_admission_controller
+from app.infrastructure.cache.lifecycle import get_cache_compactor
+from app.infrastructure.loop_monitor import get_loop_monitor
+from app.infrastructure.logger import get_request_id
+from app.infrastructure.request_profiler import PROFILE_HEADER, get_request_profiler
 
 # Create an instance of the FastAPI router
 router = APIRouter()
@@ -18,17 +31,126 @@ def home():
     return 'You are in the project home, if you want to ask go to /ask.'
 
 @router.post("/ask", response_model=AskResponse)
-async def ask(request: AskRequest = Body(...)):
+async def ask(request: AskRequest = Body(...), x_profile: Optional[str] = Header(None, alias=PROFILE_HEADER)):
     """
     Endpoint to handle user questions using the RAG pipeline.
 
     Args:
         request (AskRequest): The request body containing user_name and question.
+        x_profile (str, optional): PROFILE_TOKEN, to run this request under the profiler.
 
     Returns:
         AskResponse: The generated answer from the pipeline.
+
+    Raises:
+        HTTPException: 503 with Retry-After while the index is being built and the
+            indexing policy does not allow answering this question yet.
+        HTTPException: 429 or 503 with Retry-After when admission control sheds the request.
     """
-    # Run the main retrieval-augmented generation pipeline
-    answer = await run_rag_pipeline(request.question, request.user_name)
+    # Opt-in: an authorized X-Profile header or the sampling rate profiles this request
+    async with get_request_profiler().profile(get_request_id(), x_profile) as profile:
+        with collect_timings() as timings:
+            if profile is not None:
+                profile.timings = timings
+            return await answer_question(request)
+
+async def answer_question(request: AskRequest) -> AskResponse:
+    # Cached answers need no provider call, so they skip the admission queue; the read is file I/O
+    answer = await asyncio.to_thread(get_cached_answer, request.question, request.user_name)
+    if answer:
+        FAST_PATH.inc()
+        return AskResponse(answer=answer)
+
+    # Run the main retrieval-augmented generation pipeline within the concurrency bound
+    try:
+        async with get_admission_controller().admit():
+            answer = await run_rag_pipeline(request.question, request.user_name, skip_response_cache=True)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except IndexNotReadyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
 
     return AskResponse(answer=answer)
+
+@router.get("/ready")
+def ready():
+    """
+    Readiness probe reporting the vector index build progress.
+
+    Returns:
+        JSONResponse: The index state, with status 200 once it is ready and 503 before.
+    """
+    state = INDEX_STATE.as_dict()
+    return JSONResponse(state, status_code=200 if INDEX_STATE.ready else 503)
+
+@router.get("/cache/stats")
+def cache_stats():
+    """
+    Reports size, hit ratio, evictions and lifecycle policy per cache namespace.
+
+    Returns:
+        dict: Stats per namespace and the time of the last compaction.
+    """
+    return get_cache_compactor(CACHE_DIR, cache_generations).stats()
+
+@router.get("/loop/stats")
+def loop_stats():
+    """
+    Reports the event loop lag and the recent stalls, with their stacks in debug mode.
+
+    Returns:
+        dict: Monitor stats (404 unless LOOP_MONITOR=1).
+    """
+    monitor = get_loop_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Loop monitor disabled, set LOOP_MONITOR=1")
+    return monitor.stats()
+
+def _profiles_access(x_profile: Optional[str]):
+    # Profiles expose stack frames, paths and allocation sites: always behind the token,
+    # even when only sampling is configured
+    profiler = get_request_profiler()
+    if not profiler.token:
+        raise HTTPException(status_code=404, detail="Profile download disabled, set PROFILE_TOKEN")
+    if not profiler.authorized(x_profile):
+        raise HTTPException(status_code=403, detail=f"Missing or invalid {PROFILE_HEADER} header")
+    return profiler
+
+@router.get("/profiles")
+def list_profiles(x_profile: Optional[str] = Header(None, alias=PROFILE_HEADER)):
+    """
+    Lists the saved request profiles, newest first.
+
+    Returns:
+        list: Request id, trigger, date, duration and stage timings of each profile.
+    """
+    return _profiles_access(x_profile).list_profiles()
+
+@router.get("/profiles/{request_id}")
+def get_profile(request_id: str, file_format: str = Query("json", alias="format"), x_profile: Optional[str] = Header(None, alias=PROFILE_HEADER)):
+    """
+    Downloads one profile.
+
+    Args:
+        request_id (str): Id of the profiled request (its X-Request-ID).
+        file_format (str): 'json' for the summary, 'prof' for the cProfile stats file.
+
+    Returns:
+        FileResponse: The file.
+    """
+    path = _profiles_access(x_profile).path(request_id, file_format)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/json" if file_format == "json" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=f"{request_id}.{file_format}")
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Exposes pipeline stage latencies, cache hit/miss counters, retries and
+    provider calls/errors in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: The Prometheus exposition text.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,305 @@
+"""
+End-to-end load test that replays our real question mix against the FastAPI app.
+
+Questions come from the Postman collection and the parametrized questions of
+tests/test_rag_responses.py (three languages, many duplicates). Examples:
+
+    # In-process against the ASGI app, with providers pointed at the local stub
+    COHERE_BASE_URL=http://localhost:8100 DEEPL_SERVER_URL=http://localhost:8100 \\
+        python -m benchmarks.load_test --requests 300 --concurrency 16 --duplicate-ratio 0.5 --cache-mode cold
+
+    # Against a running server, comparing with a previous run
+    python -m benchmarks.load_test --url http://localhost:8000 --compare benchmarks/results/baseline.json
+
+The report (throughput, p50/p95/p99 latency, provider calls, DeepL billed
+characters, prompt tokens and LLM retries per request, cache hit rates per
+namespace) is printed and saved as JSON.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+COLLECTION_PATH = "rag_questions_duplicated_postman_collection.json"
+RESULTS_DIR = os.path.join("benchmarks", "results")
+CACHE_DIR = "./cache"
+
+METRIC_LINE = re.compile(r'^(?P<name>[a-zA-Z_:][\w:]*)(?:\{(?P<labels>[^}]*)\})?\s+(?P<value>\S+)$')
+LABEL_PAIR = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def load_question_pool(collection_path: str = COLLECTION_PATH, include_tests: bool = True) -> List[str]:
+    """
+    Collects the unique questions of the Postman collection and the test suite.
+
+    Args:
+        collection_path (str): Path to the Postman collection.
+        include_tests (bool): Whether to add the questions of tests/test_rag_responses.py.
+
+    Returns:
+        List[str]: Unique questions, in first-seen order.
+    """
+    questions = []
+    with open(collection_path, "r", encoding="utf-8") as f:
+        for item in json.load(f)["item"]:
+            questions.append(json.loads(item["request"]["body"]["raw"])["question"])
+
+    if include_tests:
+        from tests.test_rag_responses import test_questions
+        questions.extend(question for question, _ in test_questions)
+
+    return list(dict.fromkeys(questions))
+
+
+def build_workload(pool: List[str], total: int, duplicate_ratio: float, seed: int) -> List[str]:
+    """
+    Builds a deterministic request sequence with the requested share of duplicates.
+
+    Each request repeats an already-sent question with probability duplicate_ratio,
+    otherwise it takes the next unseen question (reusing the pool once exhausted).
+
+    Args:
+        pool (List[str]): Unique questions to draw from.
+        total (int): Number of requests.
+        duplicate_ratio (float): Probability of repeating a previous question.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        List[str]: The questions to send, in order.
+    """
+    rng = random.Random(seed)
+    sent: List[str] = []
+    unseen = list(pool)
+    rng.shuffle(unseen)
+
+    workload = []
+    for _ in range(total):
+        if sent and (rng.random() < duplicate_ratio or not unseen):
+            question = rng.choice(sent)
+        else:
+            question = unseen.pop()
+            sent.append(question)
+        workload.append(question)
+    return workload
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank percentile over an already sorted list
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), int(round(pct / 100 * len(sorted_values) + 0.5))))
+    return sorted_values[rank - 1]
+
+
+def parse_metrics(text: str) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]:
+    """
+    Parses Prometheus exposition text into {(name, labels): value}.
+    """
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = METRIC_LINE.match(line)
+        if match:
+            labels = tuple(sorted(LABEL_PAIR.findall(match.group("labels") or "")))
+            samples[(match.group("name"), labels)] = float(match.group("value"))
+    return samples
+
+
+def metric_delta(before: dict, after: dict, name: str, group_by: Tuple[str, ...]) -> Dict[str, float]:
+    # Sums the increase of a counter between two scrapes, grouped by some labels
+    totals: Dict[str, float] = defaultdict(float)
+    for (metric, labels), value in after.items():
+        if metric != name:
+            continue
+        label_map = dict(labels)
+        key = ".".join(label_map.get(label, "") for label in group_by)
+        totals[key] += value - before.get((metric, labels), 0.0)
+    return dict(totals)
+
+
+def clear_cache(cache_dir: str = CACHE_DIR) -> None:
+    for file_path in glob.glob(os.path.join(cache_dir, "*.json")):
+        os.remove(file_path)
+    shutil.rmtree(os.path.join(cache_dir, "blobs"), ignore_errors=True)
+
+
+async def run_load(client: httpx.AsyncClient, workload: List[str], concurrency: int, timeout: float) -> List[dict]:
+    """
+    Sends the workload with at most `concurrency` requests in flight.
+
+    Returns:
+        List[dict]: One record per request with latency, status and question.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int, question: str) -> dict:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post("/ask", json={"question": question, "user_name": f"load-{i}"}, timeout=timeout)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            return {"question": question, "status": status, "latency": time.perf_counter() - start}
+
+    return await asyncio.gather(*(one(i, q) for i, q in enumerate(workload)))
+
+
+def summarize(records: List[dict], elapsed: float, before: dict, after: dict) -> dict:
+    """
+    Builds the report: throughput, latency percentiles, provider calls, DeepL
+    billed characters, prompt tokens and LLM retries per request, and cache hit
+    rates per namespace.
+    """
+    latencies = sorted(r["latency"] for r in records)
+    statuses: Dict[str, int] = defaultdict(int)
+    for r in records:
+        statuses[str(r["status"])] += 1
+
+    total = len(records)
+    provider_calls = metric_delta(before, after, "rag_provider_calls_total", ("provider", "operation"))
+    lookups = metric_delta(before, after, "rag_cache_lookups_total", ("namespace", "result"))
+    billed = metric_delta(before, after, "rag_deepl_billed_characters_total", ("operation",))
+    prompt_tokens = sum(metric_delta(before, after, "rag_prompt_tokens_sum", ()).values())
+    retries = sum(metric_delta(before, after, "rag_llm_retries_total", ()).values())
+
+    hit_rates = {}
+    for namespace in sorted({key.split(".")[0] for key in lookups}):
+        hits = lookups.get(f"{namespace}.hit", 0.0)
+        misses = lookups.get(f"{namespace}.miss", 0.0)
+        hit_rates[namespace] = round(hits / (hits + misses), 4) if hits + misses else None
+
+    return {
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 3) if elapsed else 0.0,
+        "status_codes": dict(statuses),
+        "latency_s": {
+            "p50": round(percentile(latencies, 50), 4),
+            "p95": round(percentile(latencies, 95), 4),
+            "p99": round(percentile(latencies, 99), 4),
+            "max": round(latencies[-1], 4) if latencies else 0.0,
+            "mean": round(sum(latencies) / total, 4) if total else 0.0,
+        },
+        "provider_calls_per_request": {key: round(value / total, 3) for key, value in sorted(provider_calls.items())} if total else {},
+        "deepl_billed_characters_per_request": {key: round(value / total, 1) for key, value in sorted(billed.items())} if total else {},
+        "prompt_tokens_per_request": round(prompt_tokens / total, 1) if total else 0.0,
+        "llm_retries_per_request": round(retries / total, 3) if total else 0.0,
+        "cache_hit_rate": hit_rates,
+    }
+
+
+def compare(current: dict, baseline_path: str) -> Dict[str, Optional[float]]:
+    """
+    Relative change (in %) of the headline numbers against a previous result file.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["summary"]
+
+    def change(new: float, old: float) -> Optional[float]:
+        return round((new - old) / old * 100, 2) if old else None
+
+    deltas = {"throughput_rps": change(current["throughput_rps"], baseline["throughput_rps"])}
+    for key in ("p50", "p95", "p99"):
+        deltas[f"latency_{key}"] = change(current["latency_s"][key], baseline["latency_s"][key])
+    return deltas
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    pool = load_question_pool(args.collection, include_tests=not args.no_test_questions)
+    workload = build_workload(pool, args.requests, args.duplicate_ratio, args.seed)
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url)
+        lifespan = None
+    else:
+        from app.app import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest")
+        lifespan = app.router.lifespan_context(app)
+
+    if args.cache_mode == "cold":
+        if args.url:
+            print("⚠️ Cold mode clears the local ./cache, make sure the server shares it.")
+        clear_cache()
+
+    async with client:
+        if lifespan:
+            await lifespan.__aenter__()
+        try:
+            if args.cache_mode == "warm":
+                # Prime every distinct question once, outside the measurement
+                await run_load(client, list(dict.fromkeys(workload)), args.concurrency, args.timeout)
+
+            before = parse_metrics((await client.get("/metrics")).text)
+            start = time.perf_counter()
+            records = await run_load(client, workload, args.concurrency, args.timeout)
+            elapsed = time.perf_counter() - start
+            after = parse_metrics((await client.get("/metrics")).text)
+        finally:
+            if lifespan:
+                await lifespan.__aexit__(None, None, None)
+
+    summary = summarize(records, elapsed, before, after)
+    result = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "target": args.url or "in-process",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "duplicate_ratio": args.duplicate_ratio,
+            "cache_mode": args.cache_mode,
+            "seed": args.seed,
+            "distinct_questions": len(set(workload)),
+        },
+        "summary": summary,
+    }
+    if args.compare:
+        result["change_vs_baseline_pct"] = compare(summary, args.compare)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load_{args.cache_mode}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print(f"💾 Results saved to {output}")
+    return result
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay the question collection against the RAG API.")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process ASGI app)")
+    parser.add_argument("--requests", type=int, default=200, help="Number of requests to send")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum requests in flight")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.5, help="Probability of repeating a previous question")
+    parser.add_argument("--cache-mode", choices=["cold", "warm"], default="cold", help="Clear the cache first, or prime it before measuring")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the workload generator")
+    parser.add_argument("--collection", default=COLLECTION_PATH, help="Postman collection with the questions")
+    parser.add_argument("--no-test-questions", action="store_true", help="Do not add the questions of the test suite")
+    parser.add_argument("--output", help="Where to save the JSON result")
+    parser.add_argument("--compare", help="Previous result file to compare against")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,109 @@
+"""
+Synthetic data generators and backend registries for the microbenchmarks.
+
+Sizes are read from the environment so CI can run a quick matrix while a
+full sweep goes up to a million entries:
+
+    BENCH_SIZES          Entry counts for cache and hashing benchmarks (default 1000,10000).
+    BENCH_DOC_SIZES      Paragraph counts for chunking and file loading (default 1000,10000).
+    BENCH_VECTOR_SIZES   Collection sizes for vector search (default 1000,10000).
+    BENCH_DIM            Embedding dimensions (default 1024, as embed-multilingual-v3.0).
+
+Full sweep example:
+    BENCH_SIZES=1000,10000,100000,1000000 pytest benchmarks/micro
+
+Regression gate (fails when the mean is more than 20% slower than the last saved run):
+    pytest benchmarks/micro --benchmark-autosave
+    pytest benchmarks/micro --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+import json
+import os
+import random
+import string
+from typing import Callable, Dict, List
+
+import pytest
+
+# Benchmark modules import this one, so they are skipped without the plugin
+pytest.importorskip("pytest_benchmark")
+
+
+def sizes_from_env(name: str, default: str = "1000,10000") -> List[int]:
+    return [int(value) for value in os.getenv(name, default).split(",") if value.strip()]
+
+
+CACHE_SIZES = sizes_from_env("BENCH_SIZES")
+DOC_SIZES = sizes_from_env("BENCH_DOC_SIZES")
+VECTOR_SIZES = sizes_from_env("BENCH_VECTOR_SIZES")
+EMBEDDING_DIM = int(os.getenv("BENCH_DIM", "1024"))
+
+WORDS = ["Zara", "Emma", "flor", "mágica", "Luz", "Luna", "bosque", "sombra", "silenciosa", "poder", "historia", "decidió"]
+
+
+def random_sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)) + "."
+
+
+def make_cache_entries(count: int, seed: int = 0) -> Dict[str, str]:
+    # Keys look like stable_hash ids, values like cached answers
+    rng = random.Random(seed)
+    return {
+        "".join(rng.choices(string.hexdigits.lower(), k=64)): random_sentence(rng, rng.randint(8, 30))
+        for _ in range(count)
+    }
+
+
+def make_document(paragraphs: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "\n".join(random_sentence(rng, rng.randint(10, 60)) for _ in range(paragraphs))
+
+
+def make_vectors(count: int, dim: int = EMBEDDING_DIM, seed: int = 0) -> List[List[float]]:
+    rng = random.Random(seed)
+    return [[rng.uniform(-1.0, 1.0) for _ in range(dim)] for _ in range(count)]
+
+
+def write_cache_file(directory: str, filename: str, entries: Dict[str, str]) -> None:
+    with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+
+
+# === Backend registries ===
+# Each factory receives (directory, entries/chunks...) and returns a ready backend.
+# Alternative implementations register here to be benchmarked side by side.
+
+def _json_cache(directory: str):
+    from app.infrastructure.cache.json_cache import JsonCache
+    return JsonCache(directory)
+
+
+CACHE_BACKENDS: Dict[str, Callable] = {
+    "json_cache": _json_cache,
+}
+
+
+def _chroma_store(directory: str, chunks: List[str], vectors: List[List[float]]):
+    from app.adapters.vector_store import ChromaVectorStore
+    store = ChromaVectorStore(path=directory, collection_name="bench")
+    # Bulk insert for setup speed; only search latency is measured
+    batch = store.client.get_max_batch_size()
+    for start in range(0, len(chunks), batch):
+        store.collection.add(
+            documents=chunks[start:start + batch],
+            embeddings=vectors[start:start + batch],
+            ids=[f"doc_{i}" for i in range(start, min(start + batch, len(chunks)))],
+        )
+    return store
+
+
+def _snapshot_store(directory: str, chunks: List[str], vectors: List[List[float]]):
+    from app.adapters.vector_store import SnapshotVectorStore
+    store = SnapshotVectorStore(os.path.join(directory, "index.snapshot"))
+    store.save(chunks, vectors)
+    return store
+
+
+VECTOR_BACKENDS: Dict[str, Callable] = {
+    "chroma": _chroma_store,
+    "snapshot": _snapshot_store,
+}
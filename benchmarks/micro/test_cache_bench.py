@@ -0,0 +1,40 @@
+import itertools
+import pytest
+from bench_data import CACHE_BACKENDS, CACHE_SIZES, make_cache_entries, write_cache_file
+
+FILENAME = "responses.json"
+
+
+@pytest.fixture(params=sorted(CACHE_BACKENDS))
+def backend_name(request) -> str:
+    return request.param
+
+
+@pytest.mark.parametrize("size", CACHE_SIZES)
+def test_cache_get_hit(benchmark, tmp_path, backend_name: str, size: int):
+    """
+    Latency of a cache hit as the namespace grows.
+    """
+    entries = make_cache_entries(size)
+    write_cache_file(str(tmp_path), FILENAME, entries)
+    cache = CACHE_BACKENDS[backend_name](str(tmp_path))
+    keys = itertools.cycle(list(entries)[:100])
+
+    result = benchmark(lambda: cache.get(FILENAME, next(keys)))
+
+    assert result is not None
+    benchmark.extra_info.update({"backend": backend_name, "entries": size})
+
+
+@pytest.mark.parametrize("size", CACHE_SIZES)
+def test_cache_set(benchmark, tmp_path, backend_name: str, size: int):
+    """
+    Latency of storing one new entry into a namespace of the given size.
+    """
+    write_cache_file(str(tmp_path), FILENAME, make_cache_entries(size))
+    cache = CACHE_BACKENDS[backend_name](str(tmp_path))
+    counter = itertools.count()
+
+    benchmark(lambda: cache.set(FILENAME, f"bench-{next(counter)}", "Zara es valiente 🌙."))
+
+    benchmark.extra_info.update({"backend": backend_name, "entries": size})
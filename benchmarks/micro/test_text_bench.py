@@ -0,0 +1,52 @@
+import pytest
+from bench_data import CACHE_SIZES, DOC_SIZES, make_cache_entries, make_document
+
+from app.infrastructure.chunker import chunk_text
+from app.infrastructure.file_loader import load_text_file
+from app.utils.hashing import stable_hash
+
+
+@pytest.mark.parametrize("paragraphs", DOC_SIZES)
+def test_chunk_text(benchmark, paragraphs: int):
+    text = make_document(paragraphs)
+
+    chunks = benchmark(chunk_text, text)
+
+    assert len(chunks) == paragraphs
+    benchmark.extra_info["paragraphs"] = paragraphs
+
+
+@pytest.mark.parametrize("paragraphs", DOC_SIZES)
+def test_load_text_file_txt(benchmark, tmp_path, paragraphs: int):
+    path = tmp_path / "document.txt"
+    path.write_text(make_document(paragraphs), encoding="utf-8")
+
+    benchmark(load_text_file, str(path))
+
+    benchmark.extra_info["paragraphs"] = paragraphs
+
+
+@pytest.mark.parametrize("paragraphs", DOC_SIZES)
+def test_load_text_file_docx(benchmark, tmp_path, paragraphs: int):
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    for paragraph in make_document(paragraphs).split("\n"):
+        document.add_paragraph(paragraph)
+    path = tmp_path / "document.docx"
+    document.save(str(path))
+
+    benchmark(load_text_file, str(path))
+
+    benchmark.extra_info["paragraphs"] = paragraphs
+
+
+@pytest.mark.parametrize("size", CACHE_SIZES)
+def test_stable_hash_batch(benchmark, size: int):
+    """
+    Hashing throughput over a batch of question-sized strings.
+    """
+    texts = list(make_cache_entries(size).values())
+
+    benchmark(lambda: [stable_hash(text) for text in texts])
+
+    benchmark.extra_info["texts"] = size
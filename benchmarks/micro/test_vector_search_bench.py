@@ -0,0 +1,24 @@
+import pytest
+from bench_data import EMBEDDING_DIM, VECTOR_BACKENDS, VECTOR_SIZES, make_document, make_vectors
+
+
+@pytest.fixture(params=sorted(VECTOR_BACKENDS))
+def backend_name(request) -> str:
+    return request.param
+
+
+@pytest.mark.parametrize("size", VECTOR_SIZES)
+@pytest.mark.parametrize("top_k", [1, 5])
+def test_vector_search(benchmark, tmp_path, backend_name: str, size: int, top_k: int):
+    """
+    Search latency as the collection grows, for every registered backend.
+    """
+    chunks = make_document(size).split("\n")
+    vectors = make_vectors(size)
+    store = VECTOR_BACKENDS[backend_name](str(tmp_path), chunks, vectors)
+    query = make_vectors(1, seed=1)[0]
+
+    result = benchmark(store.search, query, top_k)
+
+    assert len(result["documents"][0]) == top_k
+    benchmark.extra_info.update({"backend": backend_name, "entries": size, "dim": EMBEDDING_DIM})
@@ -0,0 +1,122 @@
+"""
+Lexical retrieval benchmark: BM25 latency and hit rate on the test questions.
+
+Builds the BM25 index over the chunks of the indexed document (no provider call)
+and runs every question of tests/test_rag_responses.py through it, reporting:
+
+  * build time and per-query latency (median and p95 over --repeat runs),
+  * top-1 hit rate: the best BM25 chunk is the one the question is about,
+  * context hit rate and tokens: the same with the context the assembler builds
+    from the top-k hits (deduplicated and packed into CONTEXT_TOKEN_BUDGET),
+  * fast-path coverage and precision: how many questions clear the confidence
+    threshold, and how many of those got the right chunk.
+
+    python -m benchmarks.retrieval_bench --confidence 0.5
+
+The process exits with status 1 when a fast-path answer picks the wrong chunk,
+since that context would reach the LLM without any vector search to correct it.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.load_test import RESULTS_DIR, git_revision, percentile
+
+# Text that identifies the chunk each test question is about
+EXPECTED_CHUNKS: Dict[str, str] = {
+    "¿Quién es Zara?": "Zara",
+    "¿Cómo se llama la flor mágica?": "Luz de Luna",
+    "¿Qué decidió hacer Emma?": "Emma",
+    "¿Cuál es el poder de la flor \"Luz de Luna\"?": "Luz de Luna",
+    "¿Quién es \"Sombra Silenciosa\"?": "Sombra Silenciosa",
+    "Who is Zara?": "Zara",
+    "What did Emma decide to do?": "Emma",
+    "What is the name of the magical flower?": "Luz de Luna",
+    "What power does the “Moonlight” flower have?": "Luz de Luna",
+    "Who is the Silent Shadow?": "Sombra Silenciosa",
+    "Quem é Zara?": "Zara",
+    "Qual é o nome da flor mágica?": "Luz de Luna",
+    "O que Emma decidiu fazer?": "Emma",
+    "Quem é a Sombra Silenciosa?": "Sombra Silenciosa",
+    "Qual é o poder da flor \"Luz da Lua\"?": "Luz de Luna",
+}
+
+
+def main(args: argparse.Namespace) -> dict:
+    from app.infrastructure.chunker import chunk_text
+    from app.infrastructure.context_assembler import estimate_tokens, get_context_assembler
+    from app.infrastructure.file_loader import load_text_file
+    from app.infrastructure.lexical_index import BM25Index
+
+    chunks = chunk_text(load_text_file(args.document))
+    start = time.perf_counter()
+    index = BM25Index([f"doc_{i}" for i in range(len(chunks))], chunks)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    assembler = get_context_assembler()
+    questions = []
+    latencies: List[float] = []
+    for question, expected in EXPECTED_CHUNKS.items():
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            match = index.search(question, top_k=args.candidates)
+            latencies.append((time.perf_counter() - start) * 1000)
+        best = index.documents[match.hits[0][0]] if match.hits else ""
+        context = assembler.assemble([index.documents[i] for i, _ in match.hits])
+        questions.append({
+            "question": question,
+            "hit": expected in best,
+            "context_hit": expected in context,
+            "context_tokens": estimate_tokens(context),
+            "confidence": round(match.confidence, 3),
+            "fast_path": match.confidence >= args.confidence,
+        })
+
+    fast = [q for q in questions if q["fast_path"]]
+    latencies.sort()
+    result = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "chunks": len(chunks),
+        "build_ms": round(build_ms, 3),
+        "query_ms_median": round(statistics.median(latencies), 4),
+        "query_ms_p95": round(percentile(latencies, 95), 4),
+        "top1_hit_rate": round(sum(q["hit"] for q in questions) / len(questions), 3),
+        "context_top_k": assembler.top_k,
+        "context_hit_rate": round(sum(q["context_hit"] for q in questions) / len(questions), 3),
+        "context_tokens_mean": round(statistics.mean(q["context_tokens"] for q in questions), 1),
+        "confidence_threshold": args.confidence,
+        "fast_path_coverage": round(len(fast) / len(questions), 3),
+        "fast_path_precision": round(sum(q["hit"] for q in fast) / len(fast), 3) if fast else None,
+        "questions": questions,
+    }
+    result["passed"] = all(q["hit"] for q in fast)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"retrieval_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print(f"💾 Results saved to {output}")
+    if not result["passed"]:
+        print("❌ The lexical fast path picked the wrong chunk for some questions")
+    return result
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure BM25 latency and hit rate on the test questions.")
+    parser.add_argument("--document", default="data/documento.docx", help="Document whose chunks are indexed")
+    parser.add_argument("--confidence", type=float, default=0.5, help="Fast-path confidence threshold")
+    parser.add_argument("--candidates", type=int, default=10, help="Hits retrieved per query")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per question")
+    parser.add_argument("--output", help="Where to save the JSON result")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(parse_args())["passed"] else 1)
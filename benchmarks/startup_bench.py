@@ -0,0 +1,165 @@
+"""
+Cold-start benchmark: how long a fresh worker takes to import the app and answer `/`.
+
+Two measurements, each in a fresh interpreter:
+
+  * `python -X importtime -c "import app.app"`, reporting the total import time,
+    the slowest top-level packages and whether any heavy SDK got imported eagerly.
+  * Time from spawning `uvicorn app.app:app` to the first successful `GET /`.
+
+    python -m benchmarks.startup_bench --runs 5 --target-ms 1500
+
+The process exits with status 1 when the median time-to-first-`/` misses the target
+or a heavy dependency is imported at startup, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import httpx
+
+from benchmarks.load_test import RESULTS_DIR, git_revision
+
+# SDKs that must only be imported by the adapter factories, never by `import app.app`
+HEAVY_MODULES = ("chromadb", "cohere", "deepl", "docx")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parses the `-X importtime` report.
+
+    Args:
+        stderr (str): Standard error of the interpreter run with `-X importtime`.
+
+    Returns:
+        List[Tuple[str, int, int]]: (module, self_us, cumulative_us) per imported module,
+        where the module keeps its tree indentation.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_import(target: str = "app.app") -> dict:
+    """
+    Imports the target module in a fresh interpreter with `-X importtime`.
+
+    Args:
+        target (str): Module to import.
+
+    Returns:
+        dict: Total import time, the slowest top-level imports and the heavy modules loaded.
+    """
+    probe = f"import sys, {target}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], capture_output=True, text=True, check=True)
+    rows = parse_importtime(proc.stderr)
+
+    # Top-level entries are the ones with a single space of indentation
+    top_level = [(module.strip(), cumulative) for module, _, cumulative in rows if not module.startswith("  ")]
+    total_us = next((cumulative for module, cumulative in top_level if module == target), sum(c for _, c in top_level))
+    heaviest = sorted(((m.strip(), c) for m, _, c in rows), key=lambda item: item[1], reverse=True)
+
+    return {
+        "import_ms": round(total_us / 1000, 1),
+        "slowest_imports_ms": {module: round(us / 1000, 1) for module, us in heaviest[:10]},
+        "heavy_modules_loaded": [m for m in proc.stdout.strip().split(",") if m],
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(timeout: float = 30.0) -> float:
+    """
+    Spawns a uvicorn worker and polls `/` until it answers.
+
+    Args:
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        float: Milliseconds from spawning the process to the first 200 on `/`.
+
+    Raises:
+        RuntimeError: If the server does not answer within the timeout.
+    """
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.app:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if client.get("/").status_code == 200:
+                        return (time.perf_counter() - start) * 1000
+                except httpx.TransportError:
+                    pass
+                if proc.poll() is not None:
+                    raise RuntimeError(f"❌ Server exited with code {proc.returncode} before answering")
+                time.sleep(0.01)
+        raise RuntimeError(f"❌ Server did not answer / within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main(args: argparse.Namespace) -> dict:
+    imports = [measure_import() for _ in range(args.runs)]
+    first_response = [measure_first_response(args.timeout) for _ in range(args.runs)]
+
+    median_first = statistics.median(first_response)
+    heavy = sorted({m for run in imports for m in run["heavy_modules_loaded"]})
+    result = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": args.runs,
+        "import_ms_median": statistics.median(run["import_ms"] for run in imports),
+        "first_response_ms_median": round(median_first, 1),
+        "first_response_ms_max": round(max(first_response), 1),
+        "target_ms": args.target_ms,
+        "slowest_imports_ms": imports[-1]["slowest_imports_ms"],
+        "heavy_modules_loaded": heavy,
+        "passed": median_first <= args.target_ms and not heavy,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"startup_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print(f"💾 Results saved to {output}")
+    if heavy:
+        print(f"❌ Heavy modules imported at startup: {', '.join(heavy)}")
+    if median_first > args.target_ms:
+        print(f"❌ Median time to first / response {median_first:.0f} ms exceeds the {args.target_ms:.0f} ms target")
+    return result
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure import time and time-to-first-response of the RAG API.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes measured per metric")
+    parser.add_argument("--target-ms", type=float, default=1500.0, help="Budget for the median time to first / response")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for the server to answer")
+    parser.add_argument("--output", help="Where to save the JSON result")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(parse_args())["passed"] else 1)
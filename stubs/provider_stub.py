@@ -0,0 +1,282 @@
+"""
+Local stand-in for the Cohere and DeepL HTTP APIs, for offline load testing.
+
+Run it with:
+    uvicorn stubs.provider_stub:app --port 8100
+
+and point the adapters at it:
+    COHERE_BASE_URL=http://localhost:8100
+    DEEPL_SERVER_URL=http://localhost:8100
+
+Responses are deterministic (hash-based embeddings, templated answers,
+identity translations), so throughput and tail latency measurements only
+depend on the configured latency and fault injection:
+
+    STUB_LATENCY          Default latency spec for every endpoint.
+    STUB_COHERE_LATENCY   Override for Cohere endpoints.
+    STUB_DEEPL_LATENCY    Override for DeepL endpoints.
+    STUB_TOKEN_DELAY_MS   Delay between streamed tokens (default 0).
+    STUB_ERROR_RATE       Probability of a 500 response (default 0).
+    STUB_THROTTLE_RATE    Probability of a 429 response (default 0).
+    STUB_RETRY_AFTER      Retry-After seconds sent with 429s (default 1).
+    STUB_SEED             Seed of the latency and fault generator (default 0).
+
+Latency specs: 'none', 'fixed:<ms>', 'uniform:<min_ms>:<max_ms>' or
+'lognormal:<median_ms>:<sigma>'. The configuration can also be changed at
+runtime with POST /_stub/config, and call counts are available at GET /_stub/stats.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import uuid
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+EMBEDDING_DIMENSIONS = 1024
+
+# Small stopword lists are enough to tell the three supported languages apart
+STOPWORDS = {
+    "ES": {"el", "la", "los", "las", "es", "una", "un", "del", "y", "qué", "quién", "cómo", "cuál", "por", "con", "respondé", "debe", "pregunta"},
+    "PT": {"o", "os", "é", "uma", "um", "do", "da", "e", "não", "quem", "qual", "com", "em", "responda", "deve", "resposta"},
+    "EN": {"the", "is", "of", "and", "to", "in", "what", "who", "an", "with", "did", "does", "how", "which", "respond", "must"},
+}
+MARKER_CHARS = {"ES": "ñ¿¡", "PT": "ãõç"}
+
+ANSWER_TEMPLATES = {
+    "ES": "En la historia, la pregunta «{topic}» se responde con el contexto recuperado 🌙.",
+    "PT": "Na história, a pergunta «{topic}» é respondida com o contexto recuperado 🌿.",
+    "EN": "In the story, the question “{topic}” is answered by the retrieved context 📖.",
+}
+
+
+class StubConfig:
+    """
+    Latency distribution and fault injection settings of the stub.
+    """
+
+    def __init__(self):
+        self.latency = {
+            "cohere": os.getenv("STUB_COHERE_LATENCY", os.getenv("STUB_LATENCY", "none")),
+            "deepl": os.getenv("STUB_DEEPL_LATENCY", os.getenv("STUB_LATENCY", "none")),
+        }
+        self.token_delay_ms = float(os.getenv("STUB_TOKEN_DELAY_MS", "0"))
+        self.error_rate = float(os.getenv("STUB_ERROR_RATE", "0"))
+        self.throttle_rate = float(os.getenv("STUB_THROTTLE_RATE", "0"))
+        self.retry_after = int(os.getenv("STUB_RETRY_AFTER", "1"))
+        self.rng = random.Random(int(os.getenv("STUB_SEED", "0")))
+        self._lock = threading.Lock()
+
+    def update(self, values: dict) -> None:
+        for provider in ("cohere", "deepl"):
+            if f"{provider}_latency" in values:
+                self.latency[provider] = values[f"{provider}_latency"]
+        if "latency" in values:
+            self.latency = {"cohere": values["latency"], "deepl": values["latency"]}
+        for key in ("token_delay_ms", "error_rate", "throttle_rate", "retry_after"):
+            if key in values:
+                setattr(self, key, type(getattr(self, key))(values[key]))
+        if "seed" in values:
+            self.rng = random.Random(int(values["seed"]))
+
+    def as_dict(self) -> dict:
+        return {
+            "cohere_latency": self.latency["cohere"],
+            "deepl_latency": self.latency["deepl"],
+            "token_delay_ms": self.token_delay_ms,
+            "error_rate": self.error_rate,
+            "throttle_rate": self.throttle_rate,
+            "retry_after": self.retry_after,
+        }
+
+    def sample_latency(self, provider: str) -> float:
+        """
+        Draws a latency in seconds from the provider's distribution.
+
+        Raises:
+            ValueError: If the latency spec cannot be parsed.
+        """
+        kind, *params = self.latency[provider].split(":")
+        with self._lock:
+            if kind == "none":
+                return 0.0
+            if kind == "fixed":
+                return float(params[0]) / 1000
+            if kind == "uniform":
+                return self.rng.uniform(float(params[0]), float(params[1])) / 1000
+            if kind == "lognormal":
+                return self.rng.lognormvariate(math.log(float(params[0])), float(params[1])) / 1000
+        raise ValueError(f"❌ Unknown latency spec: {self.latency[provider]}")
+
+    def sample_fault(self) -> Optional[int]:
+        # Returns the status code to inject, if any
+        with self._lock:
+            roll = self.rng.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+
+config = StubConfig()
+stats: Dict[str, int] = {}
+app = FastAPI(title="Provider stub (Cohere + DeepL)")
+
+
+def detect_language(text: str) -> str:
+    """
+    Guesses ES, PT or EN from stopwords and marker characters.
+
+    Args:
+        text (str): The text to classify.
+
+    Returns:
+        str: A DeepL-style uppercase language code, EN when undecided.
+    """
+    lowered = text.lower()
+    words = re.findall(r"[\wáéíóúâêôãõçñü]+", lowered)
+    scores = {lang: sum(word in stopwords for word in words) for lang, stopwords in STOPWORDS.items()}
+    for lang, chars in MARKER_CHARS.items():
+        scores[lang] += 2 * sum(lowered.count(c) for c in chars)
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else "EN"
+
+
+def hash_embedding(text: str, dimensions: int = EMBEDDING_DIMENSIONS) -> List[float]:
+    # Deterministic unit vector seeded by the text, so equal texts are identical neighbours
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def templated_answer(prompt: str) -> str:
+    """
+    Builds a one-sentence answer with an emoji in the language of the prompt instructions.
+    """
+    lines = [line.strip() for line in prompt.strip().splitlines() if line.strip()]
+    lang = detect_language(lines[0]) if lines else "EN"
+    question = next((line.split(":", 1)[1] for line in reversed(lines) if line.startswith("Pregunta:")), "")
+    topic = question.strip().strip("¿?\"“”'«» ").replace(".", "") or "?"
+    return ANSWER_TEMPLATES[lang].format(topic=topic)
+
+
+async def simulate(provider: str, endpoint: str) -> Optional[JSONResponse]:
+    """
+    Applies the configured latency and fault injection to one call.
+
+    Returns:
+        Optional[JSONResponse]: An error response to return instead of the payload.
+    """
+    await asyncio.sleep(config.sample_latency(provider))
+    status = config.sample_fault()
+    key = f"{provider}.{endpoint}.{status or 200}"
+    stats[key] = stats.get(key, 0) + 1
+
+    if status == 429:
+        return JSONResponse({"message": "Too many requests (stub)"}, status_code=429, headers={"Retry-After": str(config.retry_after)})
+    if status == 500:
+        return JSONResponse({"message": "Internal server error (stub)"}, status_code=500)
+    return None
+
+
+# === Cohere ===
+@app.post("/v1/embed")
+async def cohere_embed(request: Request):
+    body = await request.json()
+    if error := await simulate("cohere", "embed"):
+        return error
+    texts = body.get("texts") or []
+    return {
+        "response_type": "embeddings_floats",
+        "id": uuid.uuid4().hex,
+        "embeddings": [hash_embedding(text) for text in texts],
+        "texts": texts,
+        "meta": {"api_version": {"version": "1"}, "billed_units": {"input_tokens": sum(len(t.split()) for t in texts)}},
+    }
+
+
+@app.post("/v1/tokenize")
+async def cohere_tokenize(request: Request):
+    body = await request.json()
+    if error := await simulate("cohere", "tokenize"):
+        return error
+    token_strings = body.get("text", "").split()
+    tokens = [int.from_bytes(hashlib.sha256(t.encode("utf-8")).digest()[:2], "big") for t in token_strings]
+    return {"tokens": tokens, "token_strings": token_strings, "meta": {"api_version": {"version": "1"}}}
+
+
+@app.post("/v1/generate")
+async def cohere_generate(request: Request):
+    body = await request.json()
+    if error := await simulate("cohere", "generate"):
+        return error
+
+    generation_id = uuid.uuid4().hex
+    text = templated_answer(body.get("prompt", ""))
+    generation = {"id": generation_id, "text": text, "finish_reason": "COMPLETE"}
+    response = {"id": uuid.uuid4().hex, "prompt": body.get("prompt"), "generations": [generation]}
+
+    if not body.get("stream"):
+        response["meta"] = {"api_version": {"version": "1"}}
+        return response
+
+    async def events():
+        # Newline-delimited JSON events, one token per word like the real stream
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            token = word if i == 0 else f" {word}"
+            yield json.dumps({"event_type": "text-generation", "text": token, "is_finished": False}) + "\n"
+            if config.token_delay_ms:
+                await asyncio.sleep(config.token_delay_ms / 1000)
+        yield json.dumps({"event_type": "stream-end", "is_finished": True, "finish_reason": "COMPLETE", "response": response}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/stream+json")
+
+
+# === DeepL ===
+@app.post("/v2/translate")
+async def deepl_translate(request: Request):
+    if request.headers.get("content-type", "").startswith("application/json"):
+        body = await request.json()
+    else:
+        form = await request.form()
+        body = {"text": form.getlist("text"), "target_lang": form.get("target_lang")}
+    if error := await simulate("deepl", "translate"):
+        return error
+
+    texts = body.get("text") or []
+    if isinstance(texts, str):
+        texts = [texts]
+    return {
+        "translations": [
+            {"detected_source_language": detect_language(text), "text": text, "billed_characters": len(text)}
+            for text in texts
+        ]
+    }
+
+
+# === Stub administration ===
+@app.get("/_stub/stats")
+def stub_stats():
+    return {"calls": dict(stats), "config": config.as_dict()}
+
+
+@app.post("/_stub/config")
+async def stub_config(request: Request):
+    config.update(await request.json())
+    return config.as_dict()
+
+
+@app.post("/_stub/reset")
+def stub_reset():
+    stats.clear()
+    return {"calls": {}}
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.admission import REJECTED, AdmissionController, AdmissionRejected
+
+
+@pytest.mark.asyncio
+async def test_requests_beyond_queue_depth_are_rejected_immediately():
+    controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=1)
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.admit():
+            await release.wait()
+
+    running = asyncio.create_task(hold())
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire()
+
+    assert rejected.value.status_code == 429 and rejected.value.reason == "queue_full"
+    release.set()
+    await asyncio.gather(running, queued)
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_is_rejected_with_503():
+    controller = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+    before = REJECTED.value(reason="queue_timeout")
+    await controller.acquire()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire()
+
+    assert rejected.value.status_code == 503
+    assert REJECTED.value(reason="queue_timeout") == before + 1
+    controller.release()
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_slots_are_handed_over_in_fifo_order_and_not_leaked_on_cancel():
+    controller = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=1)
+    order = []
+    await controller.acquire()
+
+    async def waiter(name):
+        async with controller.admit():
+            order.append(name)
+
+    first = asyncio.create_task(waiter("first"))
+    abandoned = asyncio.create_task(waiter("abandoned"))
+    second = asyncio.create_task(waiter("second"))
+    await asyncio.sleep(0.01)
+    abandoned.cancel()
+    controller.release()
+    await asyncio.gather(first, second)
+
+    assert order == ["first", "second"] and abandoned.cancelled()
+    assert controller.in_flight == 0 and not controller._waiters
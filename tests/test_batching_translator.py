@@ -0,0 +1,92 @@
+import asyncio
+import gc
+import threading
+
+import pytest
+
+from app.infrastructure.batching_translator import BatchingTranslator
+
+
+class RecordingTranslator:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def translate_many(self, texts, target_lang):
+        with self.lock:
+            self.calls.append((list(texts), target_lang))
+        if self.fail:
+            raise RuntimeError("DeepL down")
+        return [f"[{target_lang}] {t}" for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_texts_share_one_call_per_language_pair():
+    deepl = RecordingTranslator()
+    batcher = BatchingTranslator(deepl, window=0.02)
+
+    results = await asyncio.gather(
+        batcher.translate_to_spanish("Who is Zara?", "en"),
+        batcher.translate_to_spanish("Quem é Zara?", "pt"),
+        batcher.translate_to_spanish("Who is Emma?", "en"),
+        batcher.translate_from_spanish("Zara es valiente.", "en"),
+        batcher.translate_to_spanish("¿Quién es Zara?", "es"),
+    )
+
+    assert results == [
+        "[ES] Who is Zara?", "[ES] Quem é Zara?", "[ES] Who is Emma?", "[EN-US] Zara es valiente.", "¿Quién es Zara?",
+    ]
+    assert sorted(deepl.calls) == sorted([
+        (["Who is Zara?", "Who is Emma?"], "ES"),
+        (["Quem é Zara?"], "ES"),
+        (["Zara es valiente."], "EN-US"),
+    ])
+
+
+@pytest.mark.asyncio
+async def test_duplicates_are_sent_once_and_full_batches_flush_immediately():
+    deepl = RecordingTranslator()
+    batcher = BatchingTranslator(deepl, window=10, max_batch=2)
+
+    results = await asyncio.wait_for(asyncio.gather(
+        batcher.translate_to_spanish("Who is Zara?", "en"),
+        batcher.translate_to_spanish("Who is Zara?", "en"),
+        batcher.translate_to_spanish("Who is Emma?", "en"),
+    ), timeout=1)
+
+    assert results == ["[ES] Who is Zara?", "[ES] Who is Zara?", "[ES] Who is Emma?"]
+    assert deepl.calls == [(["Who is Zara?", "Who is Emma?"], "ES")]
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_caller_of_the_batch():
+    batcher = BatchingTranslator(RecordingTranslator(fail=True), window=0.01)
+
+    results = await asyncio.gather(
+        batcher.translate_to_spanish("Who is Zara?", "en"),
+        batcher.translate_to_spanish("Who is Emma?", "en"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_in_flight_batches_are_referenced_until_done():
+    release = threading.Event()
+
+    class SlowTranslator(RecordingTranslator):
+        def translate_many(self, texts, target_lang):
+            release.wait(timeout=2)
+            return super().translate_many(texts, target_lang)
+
+    batcher = BatchingTranslator(SlowTranslator(), window=0.001)
+    pending = asyncio.ensure_future(batcher.translate_to_spanish("Who is Zara?", "en"))
+    await asyncio.sleep(0.02)
+
+    assert len(batcher._sending) == 1
+    gc.collect()
+    release.set()
+    assert await pending == "[ES] Who is Zara?"
+    assert not batcher._sending
@@ -0,0 +1,93 @@
+import json
+import os
+import time
+
+from app.adapters.cache_manager import CacheManager
+from app.infrastructure.cache.blob_store import BlobStore
+from app.infrastructure.cache.json_cache import JsonCache
+from app.infrastructure.cache.lifecycle import CacheCompactor
+
+INSTRUCTION = "Responde únicamente con información del contexto, en una sola oración y con un emoji. " * 5
+CHUNK = "Zara era una niña valiente que vivía en un pueblo junto al bosque de los susurros. " * 20
+
+
+def blob_files(directory):
+    return [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
+
+
+def test_identical_bodies_are_stored_once_and_large_ones_compressed(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"), compress_min_bytes=1024)
+
+    ref = store.put(CHUNK)
+    assert store.put(CHUNK) == ref
+    assert store.put("corto") != ref
+
+    files = blob_files(tmp_path / "blobs")
+    assert len(files) == 2
+    compressed = next(path for path in files if ref in path)
+    assert not compressed.endswith(".txt") and os.path.getsize(compressed) < len(CHUNK.encode("utf-8")) / 4
+    assert store.get(ref) == CHUNK
+
+
+def test_encode_keeps_short_segments_inline(tmp_path):
+    store = BlobStore(str(tmp_path), min_bytes=256)
+    prompt = f"\n{INSTRUCTION}\n\nContexto: {CHUNK}\n\nPregunta: ¿Quién es Zara?\n"
+
+    encoded = store.encode(prompt)
+
+    assert [isinstance(part, dict) for part in encoded["parts"]] == [True, True, False]
+    assert store.decode(encoded) == prompt
+    assert store.encode("¿Quién es Zara?") == "¿Quién es Zara?"
+    assert store.decode("¿Quién es Zara?") == "¿Quién es Zara?"
+
+
+def test_prompts_sharing_a_context_share_its_blobs(tmp_path):
+    cache = CacheManager(JsonCache(str(tmp_path)), {"prompts": "gen-1"})
+    for i, question in enumerate(["¿Quién es Zara?", "¿Dónde vive Zara?", "¿Cómo es Zara?"]):
+        cache.store_prompt(f"q{i}", f"\n{INSTRUCTION}\n\nContexto: {CHUNK}\n\nPregunta: {question}\n")
+
+    assert len(blob_files(tmp_path / "blobs")) == 2
+    assert os.path.getsize(tmp_path / "prompts.json") < len(CHUNK)
+    assert cache.get_prompt("q1") == f"\n{INSTRUCTION}\n\nContexto: {CHUNK}\n\nPregunta: ¿Dónde vive Zara?\n"
+
+
+def test_missing_blob_is_a_miss(tmp_path):
+    cache = CacheManager(JsonCache(str(tmp_path)), blobs=BlobStore(str(tmp_path / "blobs"), memory_entries=0))
+    cache.store_translated_context("q1", CHUNK)
+
+    for path in blob_files(tmp_path / "blobs"):
+        os.remove(path)
+
+    assert cache.get_translated_context("q1") is None
+
+
+def test_compaction_collects_unreferenced_blobs(tmp_path):
+    old = CacheManager(JsonCache(str(tmp_path)), {"translated_contexts": "gen-1"})
+    old.store_translated_context("q1", CHUNK)
+    new = CacheManager(JsonCache(str(tmp_path)), {"translated_contexts": "gen-2"})
+    new.store_translated_context("q2", INSTRUCTION)
+
+    # Only blobs older than the grace period can be collected
+    past = time.time() - 7200
+    for path in blob_files(tmp_path / "blobs"):
+        os.utime(path, (past, past))
+    CacheCompactor(str(tmp_path), interval=0, generations=lambda: new.generations).run_once()
+
+    entries = json.loads((tmp_path / "translated_contexts.json").read_text(encoding="utf-8"))
+    assert set(entries) == {"q2"}
+    assert len(blob_files(tmp_path / "blobs")) == 1
+    assert new.get_translated_context("q2") == INSTRUCTION
+
+
+def test_a_reused_old_blob_survives_a_compaction_that_missed_its_new_reference(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    digest = store.put(CHUNK)
+    past = time.time() - 7200
+    for path in blob_files(tmp_path / "blobs"):
+        os.utime(path, (past, past))
+
+    # The compaction read the references before the new entry was written
+    referenced_before = set()
+    assert store.put(CHUNK) == digest
+    assert store.collect(referenced_before) == 0
+    assert store.get(digest) == CHUNK
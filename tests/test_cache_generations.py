@@ -0,0 +1,55 @@
+import json
+
+from app.adapters.cache_manager import CacheManager
+from app.domain import cache_generations as generations_module
+from app.domain.cache_generations import cache_generations, index_version
+from app.infrastructure.cache.json_cache import JsonCache
+from app.infrastructure.cache.lifecycle import CacheCompactor
+
+
+def test_stale_generations_are_misses_and_are_collected_lazily(tmp_path):
+    old = CacheManager(JsonCache(str(tmp_path)), {"responses": "gen-1", "translated_questions": "t-1"})
+    old.store_response("q1", "Zara es valiente 🌙.")
+    old.store_translated_question("q1", "¿Quién es Zara?")
+
+    new = CacheManager(JsonCache(str(tmp_path)), {"responses": "gen-2", "translated_questions": "t-1"})
+    assert new.get_response("q1") is None
+    assert new.get_translated_question("q1") == "¿Quién es Zara?"
+    # Nothing is flushed until the compaction job runs
+    assert old.get_response("q1") == "Zara es valiente 🌙."
+
+    new.store_response("q2", "Emma decide compartir ✨.")
+    results = CacheCompactor(str(tmp_path), interval=0, generations=lambda: new.generations).run_once()
+
+    assert results["responses"]["stale"] == 1 and results["responses"]["entries"] == 1
+    assert results["translated_questions"]["stale"] == 0
+    assert set(json.loads((tmp_path / "responses.json").read_text(encoding="utf-8"))) == {"q2"}
+
+
+def test_unstamped_entries_are_stale_once_generations_are_used(tmp_path):
+    (tmp_path / "prompts.json").write_text(json.dumps({"q1": "prompt"}), encoding="utf-8")
+
+    assert CacheManager(JsonCache(str(tmp_path))).get_prompt("q1") == "prompt"
+    assert CacheManager(JsonCache(str(tmp_path)), {"prompts": "gen-1"}).get_prompt("q1") is None
+
+
+def test_document_change_only_invalidates_dependent_namespaces(monkeypatch):
+    monkeypatch.setattr(generations_module, "index_version", lambda: "doc-v1")
+    before = cache_generations()
+    monkeypatch.setattr(generations_module, "index_version", lambda: "doc-v2")
+    after = cache_generations()
+
+    assert before["translated_questions"] == after["translated_questions"]
+    for namespace in ("translated_contexts", "prompts", "responses"):
+        assert before[namespace] != after[namespace]
+
+
+def test_index_version_follows_document_content(tmp_path):
+    document = tmp_path / "doc.txt"
+    document.write_text("Zara descubre un artefacto.", encoding="utf-8")
+    first = index_version(str(document))
+
+    assert index_version(str(document)) == first
+    document.write_text("Emma recibe un día extra.", encoding="utf-8")
+    assert index_version(str(document)) != first
+    assert index_version(str(tmp_path / "missing.docx")).startswith("missing:")
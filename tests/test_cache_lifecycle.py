@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from app.infrastructure.cache.json_cache import JsonCache
+from app.infrastructure.cache.lifecycle import CacheCompactor
+from app.infrastructure.cache.policy import CachePolicy, get_cache_policy
+
+
+@pytest.fixture(autouse=True)
+def fresh_policies():
+    get_cache_policy.cache_clear()
+    yield
+    get_cache_policy.cache_clear()
+
+
+def test_bare_values_of_older_files_are_still_served(tmp_path):
+    (tmp_path / "responses.json").write_text(json.dumps({"q1": "Zara es valiente."}), encoding="utf-8")
+    cache = JsonCache(str(tmp_path))
+
+    assert cache.get("responses.json", "q1") == "Zara es valiente."
+    cache.set("responses.json", "q2", "Emma decide compartir.")
+    assert cache.get("responses.json", "q1") == "Zara es valiente."
+    assert cache.get("responses.json", "q2") == "Emma decide compartir."
+
+
+def test_writes_reuse_the_parsed_file_until_another_writer_changes_it(tmp_path, monkeypatch):
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: loads.append(1) or real_load(f))
+    cache = JsonCache(str(tmp_path))
+
+    for i in range(5):
+        cache.set("responses.json", f"q{i}", f"respuesta {i}")
+    assert cache.get("responses.json", "q0") == "respuesta 0" and loads == []
+
+    # Another process rewrites the file: the next write parses it again and keeps its entries
+    data = json.loads((tmp_path / "responses.json").read_text(encoding="utf-8"))
+    data["external"] = "Emma decide compartir."
+    (tmp_path / "responses.json").write_text(json.dumps(data), encoding="utf-8")
+    cache.set("responses.json", "q5", "respuesta 5")
+
+    assert len(loads) == 1
+    assert cache.get("responses.json", "external") == "Emma decide compartir."
+    assert cache.get("responses.json", "q4") == "respuesta 4" and len(loads) == 1
+
+
+def test_expired_entries_are_misses_before_and_after_compaction(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_PROMPTS_TTL_SECONDS", "60")
+    cache = JsonCache(str(tmp_path))
+    cache.set("prompts.json", "old", "prompt")
+    data = json.loads((tmp_path / "prompts.json").read_text(encoding="utf-8"))
+    data["old"]["created"] -= 120
+    (tmp_path / "prompts.json").write_text(json.dumps(data), encoding="utf-8")
+    cache.set("prompts.json", "new", "prompt")
+
+    assert cache.get("prompts.json", "old") is None
+    result = cache.compact("prompts.json")
+
+    assert result["expired"] == 1 and result["entries"] == 1
+    assert cache.get("prompts.json", "new") == "prompt"
+
+
+def test_compaction_evicts_least_recently_accessed_first(tmp_path):
+    cache = JsonCache(str(tmp_path))
+    for key in ("a", "b", "c", "d"):
+        cache.set("responses.json", key, f"respuesta {key}")
+    # 'a' is the oldest write but was just read, so 'b' and 'c' go first
+    assert cache.get("responses.json", "a")
+
+    result = cache.compact("responses.json", CachePolicy(max_entries=2))
+
+    assert result == {"entries": 2, "bytes": (tmp_path / "responses.json").stat().st_size, "stale": 0, "expired": 0, "evicted": 2}
+    assert [cache.get("responses.json", k) is not None for k in "abcd"] == [True, False, False, True]
+
+
+def test_byte_cap_and_stats_per_namespace(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_TRANSLATED_CONTEXTS_MAX_BYTES", "400")
+    cache = JsonCache(str(tmp_path))
+    for i in range(10):
+        cache.set("translated_contexts.json", f"q{i}", "Una flor mágica conocida como Luz de Luna.")
+    cache.set("responses.json", "q0", "ok")
+    compactor = CacheCompactor(str(tmp_path), interval=0)
+
+    results = compactor.run_once()
+    stats = compactor.stats()
+
+    assert results["translated_contexts"]["bytes"] <= 400 and results["translated_contexts"]["evicted"] > 0
+    assert results["responses"]["evicted"] == 0
+    contexts = stats["namespaces"]["translated_contexts"]
+    assert contexts["entries"] == results["translated_contexts"]["entries"]
+    assert contexts["evictions"]["capacity"] >= results["translated_contexts"]["evicted"]
+    assert contexts["policy"]["max_bytes"] == 400 and stats["last_compaction"] is not None
+
+
+def test_policy_falls_back_to_global_defaults(monkeypatch):
+    monkeypatch.setenv("CACHE_MAX_ENTRIES", "50")
+    monkeypatch.setenv("CACHE_RESPONSES_MAX_ENTRIES", "5")
+
+    assert get_cache_policy("responses").max_entries == 5
+    assert get_cache_policy("prompts").max_entries == 50
+    assert CachePolicy(ttl_seconds=10).expired(created=0, now=11)
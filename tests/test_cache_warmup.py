@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+
+from app.adapters.langdetect_adapter import LangDetectAdapter
+from app.domain import cache_warmup, indexing, rag_pipeline
+from app.infrastructure.metrics import DEEPL_BILLED_CHARACTERS, PROVIDER_CALLS
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    cached = {"¿Quién es Zara?"}
+    calls = []
+
+    async def run_rag_pipeline(question, user_name, skip_response_cache=False):
+        calls.append(question)
+        if question == "boom":
+            raise RuntimeError("provider down")
+        PROVIDER_CALLS.inc(provider="cohere", operation="generate")
+        await asyncio.to_thread(DEEPL_BILLED_CHARACTERS.inc, len(question), operation="translate")
+        cached.add(question)
+        return "ok"
+
+    async def ensure_index(policy=None):
+        return True
+
+    monkeypatch.setattr(rag_pipeline, "run_rag_pipeline", run_rag_pipeline)
+    monkeypatch.setattr(rag_pipeline, "get_cached_answer", lambda q, u: "hit" if q in cached else None)
+    monkeypatch.setattr(indexing, "ensure_index", ensure_index)
+    return calls
+
+
+def test_load_questions_reads_jsonl_and_postman(tmp_path):
+    jsonl = tmp_path / "questions.jsonl"
+    jsonl.write_text('{"question": "¿Quién es Zara?"}\n"Who is Emma?"\n\n{"question": "¿Quién es Zara?"}\n', encoding="utf-8")
+
+    assert cache_warmup.load_questions(str(jsonl)) == ["¿Quién es Zara?", "Who is Emma?"]
+    assert len(cache_warmup.load_questions()) > 0
+
+
+@pytest.mark.asyncio
+async def test_warm_up_reports_status_and_cost_per_question(tmp_path, fake_pipeline):
+    report = tmp_path / "report.jsonl"
+
+    summary = await cache_warmup.warm_up(["¿Quién es Zara?", "Who is Emma?", "boom"], concurrency=2, report_path=str(report))
+
+    records = {r["question"]: r for r in map(json.loads, report.read_text(encoding="utf-8").splitlines())}
+    assert records["¿Quién es Zara?"]["status"] == "cached"
+    assert records["¿Quién es Zara?"]["provider_calls"] == {}
+    assert records["Who is Emma?"]["status"] == "warmed"
+    assert records["Who is Emma?"]["provider_calls"] == {"cohere.generate": 1}
+    assert records["Who is Emma?"]["deepl_billed_characters"] == {"translate": len("Who is Emma?")}
+    assert records["boom"]["status"] == "error" and "provider down" in records["boom"]["error"]
+    assert summary["statuses"] == {"cached": 1, "warmed": 1, "error": 1}
+    assert summary["provider_calls"] == {"cohere.generate": 1}
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_done_questions_and_retries_errors(tmp_path, fake_pipeline):
+    report = tmp_path / "report.jsonl"
+    await cache_warmup.warm_up(["Who is Emma?", "boom"], report_path=str(report))
+    fake_pipeline.clear()
+
+    dry = await cache_warmup.warm_up(["Who is Emma?", "boom", "Who is Leo?"], report_path=str(report), resume=True, dry_run=True)
+    assert dry == {"questions": 3, "skipped": 1, "cached": 0, "to_run": 2, "dry_run": True}
+    assert fake_pipeline == []
+
+    summary = await cache_warmup.warm_up(["Who is Emma?", "boom", "Who is Leo?"], report_path=str(report), resume=True)
+    assert sorted(fake_pipeline) == ["Who is Leo?", "boom"]
+    assert summary["skipped"] == 1
+    assert len(report.read_text(encoding="utf-8").splitlines()) == 4
+
+
+@pytest.mark.asyncio
+async def test_language_detection_characters_are_charged_to_the_question(monkeypatch):
+    class Detection:
+        billed_characters = 12
+        detected_source_lang = "EN-US"
+
+    class FakeDeepL:
+        def translate_text(self, text, target_lang):
+            return Detection()
+
+    detector = LangDetectAdapter.__new__(LangDetectAdapter)
+    detector.translator = FakeDeepL()
+
+    async def run_rag_pipeline(question, user_name, skip_response_cache=False):
+        assert await detector.detect(question) == "en"
+        return "ok"
+
+    monkeypatch.setattr(rag_pipeline, "run_rag_pipeline", run_rag_pipeline)
+    monkeypatch.setattr(rag_pipeline, "get_cached_answer", lambda q, u: None)
+
+    record = await cache_warmup.warm_question("Who is Emma?")
+
+    assert record["status"] == "warmed"
+    assert record["deepl_billed_characters"] == {"detect": 12}
+    assert record["provider_calls"] == {"deepl.detect": 1}
@@ -0,0 +1,48 @@
+import pytest
+
+from app.adapters.default_prompt_builder import DefaultPromptBuilder
+from app.infrastructure.context_assembler import ContextAssembler, estimate_tokens, pack_chunks, truncate_to_tokens
+
+ZARA = "Zara era una niña valiente que vivía en un pueblo junto al bosque de los susurros. Cada noche escuchaba a los búhos."
+ZARA_AGAIN = "Zara era una niña valiente que vivía en un pueblo junto al bosque de los susurros. Cada noche escuchaba a los búhos!"
+EMMA = "Emma decidió compartir la flor Luz de Luna con todo el pueblo para curar a los enfermos."
+SHADOW = "La Sombra Silenciosa vigilaba el bosque desde las ramas más altas sin hacer ruido."
+
+
+def test_estimate_counts_words_and_punctuation():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("¿Quién es Zara?") == 5
+    # Long words count as several subword tokens
+    assert estimate_tokens("extraordinariamente") == 4
+
+
+def test_near_duplicates_are_dropped_and_order_kept():
+    context = ContextAssembler(top_k=4, budget=0).assemble([ZARA, ZARA_AGAIN, EMMA, SHADOW])
+
+    assert context.split("\n\n") == [ZARA, EMMA, SHADOW]
+
+
+def test_candidates_are_packed_into_the_budget_best_first():
+    budget = estimate_tokens(ZARA) + estimate_tokens(EMMA)
+
+    assert pack_chunks([ZARA, EMMA, SHADOW], budget) == [ZARA, EMMA]
+    # A chunk that does not fit is skipped, a shorter one further down still can
+    assert pack_chunks([ZARA, EMMA, SHADOW], budget - 1) == [ZARA, SHADOW]
+    assert ContextAssembler(top_k=1, budget=0).assemble([ZARA, EMMA]) == ZARA
+
+
+def test_an_oversized_first_chunk_is_cut_at_a_sentence():
+    assert pack_chunks([ZARA, EMMA], 20) == ["Zara era una niña valiente que vivía en un pueblo junto al bosque de los susurros."]
+    assert truncate_to_tokens(ZARA, 3) == "Zara era una"
+
+
+@pytest.mark.asyncio
+async def test_prompt_builder_enforces_the_budget_on_the_context():
+    unlimited = await DefaultPromptBuilder(budget=0).build_prompt("\n\n".join([ZARA, EMMA]), "¿Quién es Zara?", "es")
+    budget = estimate_tokens(unlimited) - estimate_tokens(EMMA)
+
+    prompt = await DefaultPromptBuilder(budget=budget).build_prompt("\n\n".join([ZARA, EMMA]), "¿Quién es Zara?", "es")
+
+    assert ZARA in prompt and EMMA not in prompt
+    assert "¿Quién es Zara?" in prompt
+    assert estimate_tokens(prompt) <= budget
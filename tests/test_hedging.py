@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from types import SimpleNamespace
+
+from app.adapters import llm_client
+from app.infrastructure.hedging import HEDGES_SENT, HedgingPolicy, LatencyTracker, cancellable, hedged_call
+
+
+def _warm_policy(budget_pct: float = 100.0) -> HedgingPolicy:
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.observe(0.02)
+    return HedgingPolicy(enabled=True, budget_pct=budget_pct, min_samples=20, min_delay=0.01, tracker=tracker)
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_beaten_by_the_hedge_and_cancelled():
+    policy = _warm_policy()
+    calls, cancelled = [], threading.Event()
+
+    def attempt(cancel: threading.Event) -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            # Stuck upstream: stops only when told the hedge won
+            if cancel.wait(timeout=2):
+                cancelled.set()
+            return "primary"
+        return "hedge"
+
+    start = time.perf_counter()
+    result = await hedged_call(attempt, policy, operation="test-hedge")
+
+    assert result == "hedge" and time.perf_counter() - start < 1
+    assert await asyncio.to_thread(cancelled.wait, 1)
+    assert HEDGES_SENT.value(operation="test-hedge") == 1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_samples_or_budget():
+    calls = []
+
+    def attempt(cancel: threading.Event) -> str:
+        calls.append(1)
+        time.sleep(0.05)
+        return "ok"
+
+    cold = HedgingPolicy(enabled=True, min_samples=20)
+    assert await hedged_call(attempt, cold) == "ok"
+
+    broke = _warm_policy(budget_pct=0)
+    assert await hedged_call(attempt, broke) == "ok"
+
+    assert len(calls) == 2 and len(cold.tracker) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_falls_back_to_the_hedge_result():
+    policy = _warm_policy()
+    calls = []
+
+    def attempt(cancel: threading.Event) -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.05)
+            raise RuntimeError("upstream reset")
+        time.sleep(0.1)
+        return "hedge"
+
+    assert await hedged_call(attempt, policy) == "hedge"
+
+
+@pytest.mark.asyncio
+async def test_a_stalled_losing_stream_frees_its_attempt_without_waiting_for_a_token():
+    policy = _warm_policy()
+    calls, primary_returned, unstall, closed = [], threading.Event(), threading.Event(), threading.Event()
+
+    class StalledStream:
+        def __iter__(self):
+            yield "Zara"
+            # No more tokens until the read would time out
+            unstall.wait(timeout=5)
+            yield "late"
+
+        def close(self):
+            closed.set()
+
+    def attempt(cancel: threading.Event) -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            tokens = list(cancellable(StalledStream(), cancel, poll=0.01))
+            primary_returned.set()
+            return " ".join(tokens)
+        return "hedge"
+
+    assert await hedged_call(attempt, policy) == "hedge"
+    # The attempt (and with it the limiter slot) is released while the stream is still stalled
+    assert await asyncio.to_thread(primary_returned.wait, 1)
+    assert not closed.is_set()
+
+    unstall.set()
+    assert await asyncio.to_thread(closed.wait, 1)
+
+
+@pytest.mark.asyncio
+async def test_only_attempts_that_ran_to_the_end_are_timed():
+    policy = HedgingPolicy(enabled=True, min_samples=20)
+
+    def attempt(cancel: threading.Event) -> tuple:
+        return "Zara", "prompt leak"
+
+    def completed(result: tuple) -> bool:
+        return result[1] is None
+
+    assert await hedged_call(attempt, policy, completed=completed) == ("Zara", "prompt leak")
+    assert len(policy.tracker) == 0
+
+    assert await hedged_call(lambda cancel: ("Zara", None), policy, completed=completed) == ("Zara", None)
+    assert len(policy.tracker) == 1
+
+
+@pytest.mark.asyncio
+async def test_a_hedge_cancelled_before_it_starts_never_calls_the_provider(monkeypatch):
+    policy = _warm_policy()
+    calls = []
+
+    class FakeDetector:
+        async def detect(self, text):
+            return "es"
+
+    class FakeCohere:
+        def generate(self, **kwargs):
+            calls.append(1)
+            time.sleep(0.05)
+            return SimpleNamespace(generations=[SimpleNamespace(text="Zara es valiente.")])
+
+    started = []
+
+    async def queued_run(provider, fn, *args):
+        # The hedge waits for a pool thread until the primary has already answered
+        started.append(1)
+        if len(started) > 1:
+            await asyncio.sleep(0.2)
+        return await asyncio.to_thread(fn, *args)
+
+    monkeypatch.setattr(llm_client, "get_hedging_policy", lambda: policy)
+    monkeypatch.setattr(llm_client, "run_provider_call", queued_run)
+    client = llm_client.CohereChatClient.__new__(llm_client.CohereChatClient)
+    client.client, client.detector = FakeCohere(), FakeDetector()
+
+    assert (await client.generate("¿Quién es Zara?"))["text"] == "Zara es valiente."
+    await asyncio.sleep(0.3)
+
+    assert len(started) == 2 and len(calls) == 1
+
+
+def test_cancellable_reraises_stream_errors_and_closes_on_early_exit():
+    closed = threading.Event()
+
+    class Stream:
+        def __iter__(self):
+            yield from ("a", "b", "c")
+
+        def close(self):
+            closed.set()
+
+    for token in cancellable(Stream(), threading.Event()):
+        if token == "a":
+            break
+    assert closed.wait(1)
+
+    def broken():
+        yield "a"
+        raise RuntimeError("upstream reset")
+
+    with pytest.raises(RuntimeError, match="upstream reset"):
+        list(cancellable(broken(), threading.Event()))
+
+
+def test_tracker_percentile():
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 101):
+        tracker.observe(ms / 1000)
+
+    assert tracker.percentile(50) == pytest.approx(0.051)
+    assert tracker.percentile(95) == pytest.approx(0.095)
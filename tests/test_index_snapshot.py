@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from app.adapters.vector_store import ChromaVectorStore, SnapshotVectorStore
+from app.infrastructure.index_snapshot import Snapshot, SnapshotError, export_snapshot, import_snapshot, write_snapshot
+
+
+def make_corpus(count: int = 40, dim: int = 16, seed: int = 0):
+    rng = random.Random(seed)
+    chunks = [f"Fragmento {i}: Zara y la flor mágica ✨" for i in range(count)]
+    vectors = [[rng.uniform(-1.0, 1.0) for _ in range(dim)] for _ in range(count)]
+    return chunks, vectors
+
+
+def test_snapshot_round_trips_chunks_vectors_and_metadata(tmp_path):
+    chunks, vectors = make_corpus()
+    path = str(tmp_path / "index.snapshot")
+    metadatas = [{"page": i} for i in range(len(chunks))]
+
+    write_snapshot(path, [f"id{i}" for i in range(len(chunks))], chunks, vectors, metadatas, space="cosine")
+    snapshot = Snapshot(path)
+
+    assert (snapshot.count, snapshot.dim, snapshot.space) == (40, 16, "cosine")
+    assert snapshot.document(7) == chunks[7] and snapshot.ids[7] == "id7" and snapshot.metadatas[7] == {"page": 7}
+    assert snapshot.vectors[3].tolist() == pytest.approx(vectors[3], abs=1e-6)
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "broken.snapshot"
+    path.write_bytes(b"not a snapshot" * 10)
+
+    with pytest.raises(SnapshotError):
+        Snapshot(str(path))
+
+
+def test_snapshot_search_matches_chroma(tmp_path):
+    chunks, vectors = make_corpus()
+    chroma = ChromaVectorStore(path=str(tmp_path / "chroma"), collection_name="test")
+    chroma.save(chunks, vectors)
+    query = make_corpus(1, seed=1)[1][0]
+
+    assert export_snapshot(str(tmp_path / "index.snapshot"), str(tmp_path / "chroma"), "test") == 40
+    snapshot_store = SnapshotVectorStore(str(tmp_path / "index.snapshot"))
+
+    expected = chroma.search(query, top_k=5)
+    result = snapshot_store.search(query, top_k=5)
+    assert result["ids"] == expected["ids"] and result["documents"] == expected["documents"]
+    assert result["distances"][0] == pytest.approx(expected["distances"][0], rel=1e-4)
+
+
+def test_snapshot_imports_back_into_chroma(tmp_path):
+    chunks, vectors = make_corpus(10)
+    store = SnapshotVectorStore(str(tmp_path / "index.snapshot"))
+    assert store.count() == 0
+
+    store.save(chunks, vectors)
+    assert import_snapshot(store.path, str(tmp_path / "chroma")) == 10
+
+    chroma = ChromaVectorStore(path=str(tmp_path / "chroma"))
+    assert chroma.count() == 10
+    assert chroma.search(vectors[4], top_k=1)["documents"] == [[chunks[4]]]
+
+
+def test_document_version_travels_with_the_index(tmp_path):
+    chunks, vectors = make_corpus(10)
+    chroma = ChromaVectorStore(path=str(tmp_path / "chroma"), collection_name="test")
+    assert chroma.source_version() is None
+
+    chroma.save(chunks, vectors, "v1")
+    # A rebuild replaces the collection instead of adding to it
+    chroma.save(chunks[:4], vectors[:4], "v2")
+    assert chroma.count() == 4 and chroma.source_version() == "v2"
+
+    export_snapshot(str(tmp_path / "index.snapshot"), str(tmp_path / "chroma"), "test")
+    assert SnapshotVectorStore(str(tmp_path / "index.snapshot")).source_version() == "v2"
+
+    import_snapshot(str(tmp_path / "index.snapshot"), str(tmp_path / "chroma"))
+    chroma = ChromaVectorStore(path=str(tmp_path / "chroma"), collection_name="test")
+    assert chroma.count() == 4 and chroma.source_version() == "v2"
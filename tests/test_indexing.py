@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+from app.domain import cache_generations as generations_module
+from app.domain.cache_generations import cache_generations, index_version
+from app.domain.indexing import IndexNotReadyError, IndexState, build_index, document_version, ensure_index, start_indexing
+
+
+class FakeStore:
+    def __init__(self):
+        self.saved = []
+        self.version = None
+
+    def count(self) -> int:
+        return len(self.saved)
+
+    def source_version(self):
+        return self.version
+
+    def save(self, chunks, embeddings, source_version=None):
+        self.saved = list(zip(chunks, embeddings))
+        self.version = source_version
+
+
+class SlowEmbedder:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def get_embeddings(self, texts):
+        self.calls += 1
+        time.sleep(self.delay)
+        return [[float(len(t))] for t in texts]
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_text("\n".join(f"Párrafo {i} sobre Zara." for i in range(5)), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_build_reports_progress_and_skips_existing_index(document):
+    state, store, embedder = IndexState(), FakeStore(), SlowEmbedder()
+
+    await build_index(state, document, lambda: store, lambda: embedder, batch_size=2)
+    await build_index(state, document, lambda: store, lambda: embedder, batch_size=2)
+
+    assert state.as_dict()["status"] == "ready" and state.as_dict()["progress"] == 1.0
+    assert len(store.saved) == 5 and embedder.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_document_edit_moves_the_index_and_the_generation_together(document, monkeypatch):
+    state, store, embedder = IndexState(), FakeStore(), SlowEmbedder()
+    monkeypatch.setattr(generations_module, "INDEX_STATE", state)
+    monkeypatch.setattr(generations_module, "DOCUMENT_PATH", document)
+
+    await build_index(state, document, lambda: store, lambda: embedder)
+    first_version, first_generations = store.source_version(), cache_generations()
+    assert first_version == state.version == document_version(document) == index_version()
+
+    with open(document, "a", encoding="utf-8") as f:
+        f.write("\nEmma recibe un día extra.")
+    # Until re-indexed, entries keep the generation of the content actually served
+    assert index_version() == first_version and cache_generations() == first_generations
+
+    restarted = IndexState()
+    monkeypatch.setattr(generations_module, "INDEX_STATE", restarted)
+    await build_index(restarted, document, lambda: store, lambda: embedder)
+
+    assert store.source_version() == restarted.version == document_version(document) != first_version
+    assert len(store.saved) == 6 and store.saved[-1][0].startswith("Emma")
+    assert cache_generations()["responses"] != first_generations["responses"]
+    assert cache_generations()["translated_questions"] == first_generations["translated_questions"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_wait_for_a_single_build(document):
+    state, store, embedder = IndexState(), FakeStore(), SlowEmbedder(delay=0.05)
+    start_indexing(state, document_path=document, vector_store_factory=lambda: store, embedder_factory=lambda: embedder)
+
+    results = await asyncio.gather(*(ensure_index("wait", state) for _ in range(5)))
+
+    assert results == [True] * 5
+    assert embedder.calls == 1 and len(store.saved) == 5
+
+
+@pytest.mark.asyncio
+async def test_cache_only_and_reject_policies_while_indexing(document):
+    state = IndexState()
+    task = start_indexing(state, document_path=document, vector_store_factory=FakeStore, embedder_factory=lambda: SlowEmbedder(0.1))
+
+    assert await ensure_index("cache_only", state) is False
+    with pytest.raises(IndexNotReadyError):
+        await ensure_index("reject", state)
+
+    await task
+    assert await ensure_index("reject", state) is True
+
+
+@pytest.mark.asyncio
+async def test_failed_build_is_reported_and_retried(document):
+    state = IndexState()
+
+    def broken_store():
+        raise OSError("disk full")
+
+    with pytest.raises(RuntimeError):
+        await start_indexing(state, document_path=document, vector_store_factory=broken_store)
+    assert state.status == "failed" and "disk full" in state.error
+
+    await start_indexing(state, document_path=document, vector_store_factory=FakeStore, embedder_factory=SlowEmbedder)
+    assert state.ready
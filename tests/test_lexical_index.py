@@ -0,0 +1,85 @@
+import pytest
+
+from app.adapters.vector_store import HybridVectorStore
+from app.infrastructure.lexical_index import BM25Index, get_lexical_index, tokenize
+
+CHUNKS = [
+    "Un intrépido explorador, Zara, descubre un antiguo artefacto en la galaxia.",
+    "Una flor mágica conocida como \"Luz de Luna\" florece solo durante la noche.",
+    "Emma, una joven huérfana, descubre una puerta mágica en el pueblo.",
+    "Conocido como \"Sombra Silenciosa\", nuestro héroe es un maestro del sigilo.",
+]
+
+
+@pytest.fixture
+def index() -> BM25Index:
+    return BM25Index([f"doc_{i}" for i in range(len(CHUNKS))], CHUNKS)
+
+
+class FakeVectorStore:
+    def __init__(self, ranking):
+        self.ranking = ranking
+        self.saved = None
+        self.version = None
+
+    def save(self, chunks, embeddings, source_version=None):
+        self.saved = chunks
+        self.version = source_version
+
+    def source_version(self):
+        return self.version
+
+    def search(self, query_vector, top_k):
+        ids = [f"doc_{i}" for i in self.ranking[:top_k]]
+        return {
+            "ids": [ids],
+            "documents": [[CHUNKS[i] for i in self.ranking[:top_k]]],
+            "metadatas": [[None] * len(ids)],
+            "distances": [[0.1 * (rank + 1) for rank in range(len(ids))]],
+        }
+
+    def count(self):
+        return len(CHUNKS)
+
+
+def test_tokenize_strips_accents_punctuation_and_stopwords():
+    assert tokenize("¿Cuál es el poder de la flor \"Luz de Luna\"?") == ["poder", "flor", "luz", "luna"]
+    assert tokenize("Who is MÁGICA?") == ["magica"]
+
+
+def test_quoted_names_are_confident_in_any_language(index):
+    for question in ("¿Quién es Zara?", "Who is Zara?", "Quem é Zara?"):
+        match = index.search(question)
+        assert match.hits[0][0] == 0 and match.confidence == pytest.approx(1.0)
+
+    assert index.search("Quem é a Sombra Silenciosa?").hits[0][0] == 3
+
+
+def test_unknown_or_ambiguous_terms_are_not_confident(index):
+    assert index.search("What is the name of the magical flower?").confidence == 0.0
+    # "mágica" appears in two chunks: the best one wins but with a small margin
+    assert index.search("¿Qué es mágica?").confidence < 0.5
+
+
+def test_hybrid_fusion_promotes_chunks_found_by_both_sides(tmp_path, index):
+    index.save(str(tmp_path / "lexical.json"))
+    store = HybridVectorStore(FakeVectorStore([2, 1, 0, 3]), str(tmp_path / "lexical.json"), candidates=4)
+
+    result = store.search([0.0], top_k=2, query_text="flor Luz de Luna")
+
+    assert result["ids"][0][0] == "doc_1"
+    assert result["documents"][0][0] == CHUNKS[1] and result["distances"][0][0] == pytest.approx(0.2)
+    assert store.search([0.0], top_k=1)["ids"] == [["doc_2"]]
+
+
+def test_save_builds_the_lexical_index_and_reloads_it(tmp_path):
+    path = str(tmp_path / "lexical.json")
+    vectors = FakeVectorStore([0])
+    store = HybridVectorStore(vectors, path)
+    assert store.needs_lexical_index and store.lexical_search("Zara") is None
+
+    store.save(CHUNKS, [[0.0]] * len(CHUNKS))
+
+    assert vectors.saved == CHUNKS and not store.needs_lexical_index
+    assert get_lexical_index(path).documents == CHUNKS
+    assert HybridVectorStore(vectors, path).lexical_search("Sombra Silenciosa").hits[0][0] == 3
@@ -0,0 +1,42 @@
+import json
+import logging
+from app.infrastructure.logger import JsonFormatter, RequestIdFilter, get_logger, set_request_id
+
+
+class _CountingStr:
+    # Records how many times the logging machinery turned it into text
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self) -> str:
+        self.calls += 1
+        return "large prompt"
+
+
+def test_json_records_carry_request_id_and_extra_fields():
+    """
+    Each record must be a single JSON object with the bound request id
+    and the structured fields passed through `extra=`.
+    """
+    set_request_id("req-123")
+    record = logging.makeLogRecord({
+        "name": "app_logger.test", "levelname": "INFO", "levelno": logging.INFO,
+        "msg": "Cache %s", "args": ("hit",), "cache_file": "responses.json",
+    })
+    RequestIdFilter().filter(record)
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["request_id"] == "req-123"
+    assert payload["message"] == "Cache hit"
+    assert payload["cache_file"] == "responses.json"
+
+
+def test_disabled_debug_calls_never_format_their_arguments():
+    logger = get_logger("test_lazy")
+    logger.setLevel(logging.INFO)
+    prompt = _CountingStr()
+
+    logger.debug("Prompt: %s", prompt)
+
+    assert prompt.calls == 0
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+from app.domain.pipeline_dag import PipelineRun, Stage
+from app.infrastructure.batching_translator import BatchingTranslator
+from app.infrastructure.loop_monitor import LOOP_LAG, LOOP_STALLS, LoopLagMonitor, assert_loop_not_blocked
+
+
+class SlowTranslator:
+    # A synchronous SDK call, like DeepLTranslator.translate_many
+    def translate_many(self, texts, target_lang):
+        time.sleep(0.15)
+        return [f"[{target_lang}] {t}" for t in texts]
+
+
+def read_cache_synchronously():
+    time.sleep(0.15)
+    return "¿Quién es Zara?"
+
+
+@pytest.mark.asyncio
+async def test_helper_fails_with_the_stack_of_a_blocking_stage():
+    async def translate_question(run):
+        return read_cache_synchronously()
+
+    run = PipelineRun([Stage("translate_question", translate_question)])
+    with pytest.raises(AssertionError) as error:
+        async with assert_loop_not_blocked(threshold=0.05):
+            await run.get("translate_question")
+
+    assert "read_cache_synchronously" in str(error.value)
+
+
+@pytest.mark.asyncio
+async def test_helper_passes_when_blocking_work_runs_in_a_thread():
+    async def translate_question(run):
+        return await asyncio.to_thread(read_cache_synchronously)
+
+    run = PipelineRun([Stage("translate_question", translate_question)])
+    async with assert_loop_not_blocked(threshold=0.05):
+        assert await run.get("translate_question") == "¿Quién es Zara?"
+
+
+@pytest.mark.asyncio
+async def test_batched_translation_keeps_the_loop_free():
+    batcher = BatchingTranslator(SlowTranslator(), window=0.01)
+    async with assert_loop_not_blocked(threshold=0.05):
+        assert await batcher.translate_from_spanish("Zara es valiente", "en") == "[EN-US] Zara es valiente"
+
+
+@pytest.mark.asyncio
+async def test_monitor_counts_stalls():
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+    before = LOOP_STALLS.value()
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+
+    # A loaded machine may add stalls of its own, the 100 ms one must be among them
+    assert LOOP_STALLS.value() >= before + 1
+    assert any(stall.duration >= 0.08 for stall in monitor.stalls)
+    assert monitor.max_lag >= 0.05
+    assert monitor.stats()["stalls"][0]["stack"] == ""
+
+
+@pytest.mark.asyncio
+async def test_helper_keeps_out_of_the_process_metrics():
+    stalls, ticks = LOOP_STALLS.value(), LOOP_LAG.count()
+    with pytest.raises(AssertionError):
+        async with assert_loop_not_blocked(threshold=0.05):
+            time.sleep(0.1)
+
+    assert (LOOP_STALLS.value(), LOOP_LAG.count()) == (stalls, ticks)
@@ -0,0 +1,37 @@
+import pytest
+from app.infrastructure.metrics import MetricsRegistry, span
+
+
+def test_render_prometheus_text_for_counters_and_histograms():
+    """
+    The exposition text must contain cumulative buckets, sum and count per stage,
+    and one line per counter label set.
+    """
+    registry = MetricsRegistry()
+    latency = registry.histogram("stage_seconds", "Stage latency.", ("stage",), buckets=(0.1, 1.0))
+    lookups = registry.counter("lookups_total", "Lookups.", ("namespace", "result"))
+
+    latency.observe(0.05, stage="generate")
+    latency.observe(0.5, stage="generate")
+    lookups.inc(namespace="responses", result="hit")
+    lookups.inc(namespace="responses", result="hit")
+
+    text = registry.render()
+
+    assert '# TYPE stage_seconds histogram' in text
+    assert 'stage_seconds_bucket{stage="generate",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="generate",le="1"} 2' in text
+    assert 'stage_seconds_bucket{stage="generate",le="+Inf"} 2' in text
+    assert 'stage_seconds_count{stage="generate"} 2' in text
+    assert 'lookups_total{namespace="responses",result="hit"} 2' in text
+
+
+def test_span_records_duration_even_when_stage_fails():
+    registry = MetricsRegistry()
+    latency = registry.histogram("stage_seconds", "Stage latency.", ("stage",))
+
+    with pytest.raises(RuntimeError):
+        with span("translate_question", histogram=latency):
+            raise RuntimeError("DeepL down")
+
+    assert latency.count(stage="translate_question") == 1
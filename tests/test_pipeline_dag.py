@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+
+from app.domain.pipeline_dag import PipelineRun, Stage
+from app.infrastructure.metrics import Histogram
+
+
+def _histogram() -> Histogram:
+    return Histogram("test_dag_latency_seconds", "Test stage latency.", ("stage",))
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_overlap_and_run_once():
+    calls = []
+
+    def sleeper(name, result):
+        async def fn(run):
+            calls.append(name)
+            await asyncio.sleep(0.1)
+            return result
+        return fn
+
+    async def combine(run):
+        a, b = await run.gather("a", "b")
+        return a + b
+
+    run = PipelineRun(
+        [Stage("a", sleeper("a", 1)), Stage("b", sleeper("b", 2)), Stage("sum", combine, deps=("a", "b"))],
+        histogram=_histogram(),
+    )
+    start = time.perf_counter()
+    total, a = await run.gather("sum", "a")
+
+    assert (total, a) == (3, 1)
+    assert sorted(calls) == ["a", "b"]
+    assert time.perf_counter() - start < 0.18
+    # The combining stage spent its time waiting, not working
+    assert run.timings["sum"] < 0.05 and run.timings["a"] >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_stages_nobody_asks_for_never_run():
+    ran = []
+
+    async def expensive(run):
+        ran.append("expensive")
+
+    async def cached(run):
+        return "from cache"
+
+    run = PipelineRun([Stage("expensive", expensive), Stage("cached", cached)], histogram=_histogram())
+
+    assert await run.get("cached") == "from cache"
+    assert ran == []
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_and_cancel_prefetched_stages():
+    cancelled = asyncio.Event()
+
+    async def slow(run):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def broken(run):
+        raise RuntimeError("provider down")
+
+    run = PipelineRun([Stage("slow", slow), Stage("broken", broken)], histogram=_histogram())
+    run.start("slow")
+    try:
+        with pytest.raises(RuntimeError):
+            await run.get("broken")
+    finally:
+        run.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), 1)
@@ -0,0 +1,36 @@
+import pytest
+from app.infrastructure.prompt_catalog import get_prompt_catalog
+from app.domain.validation_rules import ValidationRules
+
+
+def test_render_matches_legacy_prompt_layout():
+    """
+    The compiled template must produce exactly the prompt the builder used to
+    assemble by hand, so cached prompts stay valid.
+    """
+    catalog = get_prompt_catalog()
+    instruction = catalog.instructions("pt")
+
+    prompt = catalog.render("pt", context="Zara vive {no} bosque.", question="Quem é Zara?", extra_instructions=" Extra.\n")
+
+    assert prompt == f"\n{instruction}\nExtra.\n\nContexto: Zara vive {{no}} bosque.\n\nPregunta: Quem é Zara?\n"
+
+
+def test_unknown_language_falls_back_to_english():
+    catalog = get_prompt_catalog()
+
+    assert catalog.render("fr", context="c", question="q") == catalog.render("en", context="c", question="q")
+
+
+@pytest.mark.parametrize("lang", ["es", "en", "pt"])
+def test_feedback_is_precompiled_for_every_language(lang: str):
+    """
+    Retry feedback must be available in every supported language without translation.
+    """
+    validator = ValidationRules(expected_lang=lang, feedback_lang=lang)
+
+    valid, errors = validator.validate_with_feedback({"text": "Sin emoji.\nDos líneas.", "lang": "xx"})
+
+    assert not valid
+    assert len(errors) == 3
+    assert errors[2] == get_prompt_catalog().feedback("language", lang, lang=lang.upper())
@@ -0,0 +1,62 @@
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+
+from app.infrastructure import provider_sessions
+from app.infrastructure.provider_sessions import close_sessions, get_cohere_client, get_deepl_translator, session_stats
+from stubs.provider_stub import app as stub_app
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(stub_app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join()
+
+
+@pytest.fixture
+def pooled_env(monkeypatch, stub_url):
+    monkeypatch.setenv("COHERE_API_KEY", "stub-key")
+    monkeypatch.setenv("DEEPL_API_KEY", "stub-key")
+    monkeypatch.setenv("COHERE_BASE_URL", stub_url)
+    monkeypatch.setenv("DEEPL_SERVER_URL", stub_url)
+    close_sessions()
+    yield
+    close_sessions()
+
+
+def test_clients_are_shared_and_reuse_connections(pooled_env):
+    """
+    Sequential calls through the shared clients must ride on one keep-alive connection.
+    """
+    assert get_cohere_client() is get_cohere_client()
+    assert get_deepl_translator() is get_deepl_translator()
+
+    for _ in range(5):
+        get_cohere_client().embed(texts=["Zara"], model="embed-multilingual-v3.0", input_type="search_query")
+        get_deepl_translator().translate_text("Who is Zara?", target_lang="ES")
+
+    stats = session_stats()
+    assert stats["cohere"]["requests"] == 5 and stats["cohere"]["connections_opened"] == 1
+    assert stats["deepl"]["requests"] == 5 and stats["deepl"]["connections_opened"] == 1
+    assert stats["deepl"]["reuse_ratio"] == 0.8
+
+
+def test_deepl_pool_is_bounded(pooled_env, monkeypatch):
+    monkeypatch.setenv("DEEPL_POOL_MAXSIZE", "3")
+
+    get_deepl_translator()
+
+    adapter = provider_sessions._deepl_adapter
+    assert adapter._pool_maxsize == 3 and adapter._pool_block is True
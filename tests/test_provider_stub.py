@@ -0,0 +1,50 @@
+import cohere
+from fastapi.testclient import TestClient
+from stubs.provider_stub import app, config, hash_embedding, detect_language
+
+
+def _cohere_client() -> cohere.Client:
+    # TestClient is an httpx.Client, so the real SDK talks to the stub in-process
+    return cohere.Client("stub-key", base_url="http://testserver", httpx_client=TestClient(app))
+
+
+def test_cohere_sdk_parses_stub_embed_generate_and_tokenize():
+    """
+    The stub payloads must be accepted by the pinned Cohere SDK, and embeddings
+    must be deterministic so repeated runs retrieve the same chunks.
+    """
+    client = _cohere_client()
+
+    embeddings = client.embed(texts=["Zara", "Zara"], model="embed-multilingual-v3.0", input_type="search_query").embeddings
+    generated = client.generate(model="command-r-plus", prompt="Respond in one sentence.\nPregunta: Who is Zara?").generations[0].text
+    tokens = client.tokenize(text="ping", model="embed-multilingual-v3.0").tokens
+
+    assert embeddings[0] == embeddings[1] == hash_embedding("Zara")
+    assert "Who is Zara" in generated and generated.count(".") == 1
+    assert len(tokens) == 1
+
+
+def test_cohere_stream_yields_tokens_then_stream_end():
+    client = _cohere_client()
+
+    events = list(client.generate_stream(model="command-r-plus", prompt="Respondé en una sola oración.\nPregunta: ¿Quién es Zara?"))
+    text = "".join(e.text for e in events if e.event_type == "text-generation")
+
+    assert events[-1].event_type == "stream-end"
+    assert text.startswith("En la historia") and "🌙" in text
+
+
+def test_deepl_translate_is_identity_with_detected_language_and_throttling():
+    client = TestClient(app)
+
+    ok = client.post("/v2/translate", json={"text": ["Qual é o nome da flor mágica?"], "target_lang": "ES"}).json()
+
+    config.update({"throttle_rate": 1.0})
+    try:
+        throttled = client.post("/v2/translate", json={"text": ["Who is Zara?"], "target_lang": "ES"})
+    finally:
+        config.update({"throttle_rate": 0.0})
+
+    assert ok["translations"][0] == {"detected_source_language": "PT", "text": "Qual é o nome da flor mágica?", "billed_characters": 29}
+    assert throttled.status_code == 429 and throttled.headers["Retry-After"] == "1"
+    assert detect_language("¿Quién es Zara?") == "ES" and detect_language("Who is Zara?") == "EN"
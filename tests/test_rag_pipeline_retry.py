@@ -0,0 +1,92 @@
+import pytest
+
+from app.domain import rag_pipeline
+from app.infrastructure.metrics import CACHE_LOOKUPS
+from app.presentation import routes
+from app.presentation.schemas import AskRequest
+
+CONTEXT = "Zara era una niña valiente que vivía junto al bosque de los susurros."
+
+
+class FakeDetector:
+    async def detect(self, text):
+        return "en" if "brave" in text else "es"
+
+
+class FakeTranslator:
+    async def translate_to_spanish(self, text, lang):
+        return text
+
+    async def translate_from_spanish(self, text, lang):
+        return text
+
+
+class FakeEmbedder:
+    def get_embeddings(self, texts):
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+
+class FakeVectorStore:
+    lexical = None
+
+    def lexical_search(self, question, top_k):
+        return None
+
+    def search(self, vector, top_k, text=None):
+        return {"documents": [[CONTEXT]]}
+
+
+class FakeLLM:
+    # First answer is in the wrong language, which no local repair can fix
+    answers = [
+        {"text": "Zara is a brave girl 🦉.", "lang": "en"},
+        {"text": "Zara es una niña valiente 🦉.", "lang": "es"},
+    ]
+
+    def __init__(self):
+        self.prompts = []
+
+    async def generate_streaming(self, prompt, abort_check=None):
+        self.prompts.append(prompt)
+        return dict(self.answers[len(self.prompts) - 1])
+
+
+@pytest.fixture
+def fake_providers(tmp_path, monkeypatch):
+    llm = FakeLLM()
+
+    async def ensure_index(policy=None):
+        return True
+
+    monkeypatch.setattr(rag_pipeline, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(rag_pipeline, "cache_generations", lambda: {})
+    monkeypatch.setattr(rag_pipeline, "get_indexing_policy", lambda: "wait")
+    monkeypatch.setattr(rag_pipeline, "ensure_index", ensure_index)
+    monkeypatch.setattr(rag_pipeline, "get_batching_translator", FakeTranslator)
+    monkeypatch.setattr(rag_pipeline, "LangDetectAdapter", FakeDetector)
+    monkeypatch.setattr(rag_pipeline, "CohereEmbedder", FakeEmbedder)
+    monkeypatch.setattr(rag_pipeline, "get_vector_store", FakeVectorStore)
+    monkeypatch.setattr(rag_pipeline, "CohereChatClient", lambda: llm)
+    return llm
+
+
+@pytest.mark.asyncio
+async def test_an_invalid_answer_is_retried_with_the_context_and_feedback(fake_providers):
+    before = rag_pipeline.LLM_RETRIES.value()
+
+    answer = await rag_pipeline.run_rag_pipeline("¿Quién es Zara?", "Tester")
+
+    assert answer.endswith("respuesta: Zara es una niña valiente 🦉.")
+    assert rag_pipeline.LLM_RETRIES.value() == before + 1
+    retry_prompt = fake_providers.prompts[1]
+    assert CONTEXT in retry_prompt and retry_prompt != fake_providers.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_a_response_cache_miss_on_ask_is_looked_up_once(fake_providers):
+    before = CACHE_LOOKUPS.value(namespace="responses", result="miss")
+
+    response = await routes.answer_question(AskRequest(user_name="Tester", question="¿Quién es Zara?"))
+
+    assert response.answer.endswith("respuesta: Zara es una niña valiente 🦉.")
+    assert CACHE_LOOKUPS.value(namespace="responses", result="miss") == before + 1
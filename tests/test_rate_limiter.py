@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.provider_sessions import _record_retry_after
+from app.infrastructure.metrics import CostCounter, track_costs
+from app.infrastructure.rate_limiter import THROTTLED, ProviderLimiter, run_provider_call
+
+
+class FakeApiError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"status_code: {status_code}")
+        self.status_code = status_code
+
+
+def test_throttle_honors_retry_after_and_halves_the_limit():
+    limiter = ProviderLimiter("test-throttle", rate=0, max_concurrency=8)
+    calls = []
+
+    def flaky():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            # What the shared session hooks record when the provider answers 429
+            _record_retry_after(429, {"Retry-After": "0.1"})
+            raise FakeApiError(429)
+        return "ok"
+
+    assert limiter.call("embed", flaky) == "ok"
+
+    assert calls[1] - calls[0] >= 0.09
+    assert THROTTLED.value(provider="test-throttle") == 1
+    # Halved from 4 on the 429, then one additive step on the success
+    assert 2 < limiter.limit < 3
+
+
+def test_success_grows_the_limit_up_to_the_maximum():
+    limiter = ProviderLimiter("test-aimd", rate=0, max_concurrency=4)
+
+    for _ in range(50):
+        limiter.call("embed", lambda: None)
+
+    assert limiter.limit == 4
+
+
+def test_non_retryable_errors_propagate_without_retry():
+    limiter = ProviderLimiter("test-fatal", rate=0, sleep=lambda _: None)
+    calls = []
+
+    def unauthorized():
+        calls.append(1)
+        raise FakeApiError(401)
+
+    with pytest.raises(FakeApiError):
+        limiter.call("embed", unauthorized)
+    assert len(calls) == 1 and limiter.in_flight == 0
+
+
+def test_transient_errors_are_retried_up_to_max_retries():
+    sleeps = []
+    limiter = ProviderLimiter("test-transient", rate=0, max_retries=2, sleep=sleeps.append)
+
+    def unavailable():
+        raise FakeApiError(502)
+
+    with pytest.raises(FakeApiError):
+        limiter.call("generate", unavailable)
+    assert len(sleeps) == 2 and all(0 <= s <= 0.5 for s in sleeps)
+
+
+def test_concurrency_and_rate_are_bounded():
+    limiter = ProviderLimiter("test-bounds", rate=50, burst=1, max_concurrency=4)
+    peak, active, lock = [0], [0], threading.Lock()
+
+    def work():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.call, args=("translate", work)) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak[0] <= 4
+    # One token up front, then 50 per second for the other nine calls
+    assert time.monotonic() - start >= 0.17
+
+
+@pytest.mark.asyncio
+async def test_calls_waiting_out_a_pause_leave_the_default_executor_free():
+    limiter = ProviderLimiter("test-pool", rate=0, max_concurrency=1)
+    limiter._paused_until = time.monotonic() + 0.5
+    calls = CostCounter("test_pool_calls_total", "Test calls.")
+
+    def call():
+        calls.inc()
+        return threading.current_thread().name
+
+    with track_costs() as ledger:
+        waiting = [asyncio.ensure_future(run_provider_call("test-pool", limiter.call, "op", call)) for _ in range(40)]
+        # Other blocking work is not stuck behind the paused provider calls
+        assert await asyncio.wait_for(asyncio.to_thread(lambda: "free"), 0.3) == "free"
+        names = await asyncio.gather(*waiting)
+
+    assert all(name.startswith("test-pool-call") for name in names)
+    assert ledger == {"test_pool_calls_total": 40}
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.pipeline_dag import PipelineRun, Stage, collect_timings
+from app.infrastructure.request_profiler import RequestProfiler
+from app.presentation import routes
+
+
+async def run_pipeline():
+    async def retrieve(run):
+        await asyncio.sleep(0.01)
+        return sum(i * i for i in range(10000))
+
+    return await PipelineRun([Stage("vector_search", retrieve)]).get("vector_search")
+
+
+@pytest.mark.asyncio
+async def test_authorized_request_is_saved_with_its_stage_timings(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), token="secret")
+
+    async with profiler.profile("req-1", "secret") as session:
+        with collect_timings() as timings:
+            session.timings = timings
+            await run_pipeline()
+
+    summary = json.loads((tmp_path / "req-1.json").read_text(encoding="utf-8"))
+    assert summary["trigger"] == "header"
+    assert set(summary["stage_timings_s"]) == {"vector_search"}
+    assert "run_pipeline" in summary["top_functions"]
+    assert (tmp_path / "req-1.prof").exists()
+    assert [p["request_id"] for p in profiler.list_profiles()] == ["req-1"]
+
+
+@pytest.mark.asyncio
+async def test_requests_without_the_token_or_sample_are_not_profiled(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), token="secret")
+
+    async with profiler.profile("req-1", "wrong") as session:
+        await run_pipeline()
+    async with RequestProfiler(str(tmp_path), sample_rate=1.0).profile("../../etc/passwd") as sampled:
+        await run_pipeline()
+
+    assert session is None
+    assert sampled.request_id.startswith("req-") and "/" not in sampled.request_id
+    assert profiler.path("../../etc/passwd", "json") is None
+
+
+@pytest.mark.asyncio
+async def test_oldest_profiles_are_pruned(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), sample_rate=1.0, max_files=2)
+    for i in range(3):
+        async with profiler.profile(f"req-{i}"):
+            await run_pipeline()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["req-1.json", "req-1.prof", "req-2.json", "req-2.prof"]
+
+
+def test_profile_routes_require_the_token(tmp_path, monkeypatch):
+    profiler = RequestProfiler(str(tmp_path), token="secret")
+    monkeypatch.setattr(routes, "get_request_profiler", lambda: profiler)
+    (tmp_path / "req-1.json").write_text(json.dumps({"request_id": "req-1", "elapsed_s": 0.5}), encoding="utf-8")
+    (tmp_path / "req-1.prof").write_bytes(b"stats")
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+
+    assert client.get("/profiles").status_code == 403
+    assert client.get("/profiles", headers={"X-Profile": "secret"}).json()[0]["request_id"] == "req-1"
+    assert client.get("/profiles/req-1?format=prof", headers={"X-Profile": "secret"}).content == b"stats"
+    assert client.get("/profiles/req-2", headers={"X-Profile": "secret"}).status_code == 404
+
+    monkeypatch.setattr(routes, "get_request_profiler", lambda: RequestProfiler(str(tmp_path)))
+    assert client.get("/profiles").status_code == 404
+
+
+def test_sampling_alone_does_not_open_the_profile_routes(tmp_path, monkeypatch):
+    monkeypatch.setattr(routes, "get_request_profiler", lambda: RequestProfiler(str(tmp_path), sample_rate=0.5))
+    (tmp_path / "req-1.json").write_text(json.dumps({"request_id": "req-1", "elapsed_s": 0.5}), encoding="utf-8")
+    (tmp_path / "req-1.prof").write_bytes(b"stats")
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+
+    assert client.get("/profiles").status_code == 404
+    assert client.get("/profiles/req-1?format=prof").status_code == 404
+    assert client.get("/profiles/req-1?format=prof", headers={"X-Profile": ""}).status_code == 404
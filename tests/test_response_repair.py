@@ -0,0 +1,73 @@
+import pytest
+from app.domain.validation_rules import ValidationRules
+from app.domain.response_repair import LLM_RETRIES_SAVED, REPAIRS_ATTEMPTED, REPAIRS_SUCCEEDED, ResponseRepairer
+from app.infrastructure.metrics import REGISTRY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text,expected", [
+    ("Zara es una joven\nvaliente del bosque 🌙.", "Zara es una joven valiente del bosque 🌙."),
+    ("Zara es una joven valiente 🌙. Vive en el bosque.", "Zara es una joven valiente 🌙."),
+    ("Zara es una joven valiente.", "Zara es una joven valiente 🌟."),
+])
+async def test_repair_fixes_mechanical_failures_without_llm(text: str, expected: str):
+    """
+    Wrapped lines, a second sentence and a missing emoji must be fixed locally,
+    and each fix must be counted as a saved LLM retry.
+    """
+    repaired_before, saved_before = REPAIRS_SUCCEEDED.value(), LLM_RETRIES_SAVED.value()
+    repairer = ResponseRepairer()
+    validator = ValidationRules(expected_lang="es")
+
+    repaired = await repairer.repair({"text": text, "lang": "es"}, validator)
+
+    assert repaired == {"text": expected, "lang": "es"}
+    assert REPAIRS_SUCCEEDED.value() == repaired_before + 1 and LLM_RETRIES_SAVED.value() == saved_before + 1
+
+
+@pytest.mark.asyncio
+async def test_repair_detects_language_once_for_aborted_streams():
+    """
+    Aborted streams carry no language, so the repairer detects it on the fixed text.
+    """
+    calls = []
+
+    async def detect(text: str) -> str:
+        calls.append(text)
+        return "en"
+
+    repairer = ResponseRepairer()
+    validator = ValidationRules(expected_lang="en")
+    response = {"text": "Zara is a brave girl 🌙.\nShe", "lang": None, "aborted": True}
+
+    repaired = await repairer.repair(response, validator, detect=detect)
+
+    assert repaired == {"text": "Zara is a brave girl 🌙.", "lang": "en"}
+    assert calls == ["Zara is a brave girl 🌙."]
+
+
+@pytest.mark.asyncio
+async def test_repair_gives_up_on_wrong_language():
+    """
+    No local step can translate an answer, so the LLM retry must still happen.
+    """
+    attempted_before, repaired_before = REPAIRS_ATTEMPTED.value(), REPAIRS_SUCCEEDED.value()
+    repairer = ResponseRepairer()
+    validator = ValidationRules(expected_lang="pt")
+
+    repaired = await repairer.repair({"text": "Zara es valiente 🌙.", "lang": "es"}, validator, retry_pending=False)
+
+    assert repaired is None
+    assert REPAIRS_ATTEMPTED.value() == attempted_before + 1 and REPAIRS_SUCCEEDED.value() == repaired_before
+
+
+@pytest.mark.asyncio
+async def test_repair_counters_are_exposed_in_metrics():
+    await ResponseRepairer().repair({"text": "Zara es una joven valiente.", "lang": "es"}, ValidationRules(expected_lang="es"))
+
+    text = REGISTRY.render()
+
+    assert "# TYPE rag_repair_attempted_total counter" in text
+    assert "rag_repair_repaired_total " in text
+    assert 'rag_repair_steps_total{step="append_emoji"}' in text
+    assert "rag_repair_llm_retries_saved_total " in text
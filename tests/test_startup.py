@@ -0,0 +1,25 @@
+import subprocess
+import sys
+
+from benchmarks.startup_bench import HEAVY_MODULES, parse_importtime
+
+
+def test_importing_the_app_does_not_load_provider_sdks():
+    """
+    chromadb, cohere, deepl and docx must stay behind the adapter factories so
+    workers that only serve cached answers start fast.
+    """
+    probe = f"import sys, app.app; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+
+    assert proc.stdout.strip() == ""
+
+
+def test_parse_importtime_keeps_tree_and_timings():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _json\n"
+        "import time:       900 |       1020 | json\n"
+    )
+
+    assert parse_importtime(stderr) == [("   _json", 120, 120), (" json", 900, 1020)]
@@ -0,0 +1,32 @@
+import pytest
+from app.domain.validation_rules import ValidationRules, SentenceValidator
+
+
+@pytest.mark.parametrize("partial", [
+    "Zara es una joven valiente 🌙.\nElla",
+    "Zara es una joven. Ella vive en el bosque.",
+])
+def test_check_partial_aborts_on_definite_sentence_violation(partial: str):
+    """
+    A second period or an inner newline can never disappear from the stream,
+    so the partial check must report the sentence rule right away.
+    """
+    validator = ValidationRules(expected_lang="es")
+
+    assert validator.check_partial(partial) == SentenceValidator().error_message()
+
+
+@pytest.mark.parametrize("partial", [
+    "",
+    "Zara es una joven",
+    "Zara es una joven valiente.",
+    "Zara es una joven valiente 🌙.\n",
+])
+def test_check_partial_keeps_streaming_when_not_definitely_invalid(partial: str):
+    """
+    Missing emojis, a single period and trailing whitespace may still end up valid,
+    so the stream must not be aborted for them.
+    """
+    validator = ValidationRules(expected_lang="es")
+
+    assert validator.check_partial(partial) is None, f"❌ Stream aborted too early for: {partial!r}"